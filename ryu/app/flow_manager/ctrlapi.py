@@ -24,7 +24,7 @@ import logging
 
 from ryu.base import app_manager
 from ryu.lib import ofctl_v1_3
-from ryu.topology.api import get_all_switch, get_all_link, get_all_host
+from ryu.topology.api import get_topology
 from flowtracker import Tracker
 
 
@@ -42,7 +42,8 @@ class CtrlApi:
         # dpset will be removed eventually
         self.dpset = self.app.dpset
         self.ofctl = ofctl_v1_3
-        self.waiters = {}
+        # The replies to the requests are collected by Datapath.request().
+        self.waiters = None
         self.rpc_clients = []
         self.tracker = Tracker()
 
@@ -85,10 +86,6 @@ class CtrlApi:
     def get_tracker(self):
         return self.tracker
 
-    def get_waiters(self):
-        """Returns list of waiters"""
-        return self.waiters
-
     def get_actions(self, parser, action_set):
         """TBD"""
         actions = []
@@ -273,18 +270,15 @@ class CtrlApi:
 
     def get_topology_data(self):
         """Get Topology Data"""
-        switch_list = get_all_switch(self.app)
-        switches = [switch.to_dict() for switch in switch_list]
-        links_list = get_all_link(self.app)
-        links = [link.to_dict() for link in links_list]
-        host_list = get_all_host(self.app)
+        # the snapshot is shared until the topology changes
+        topology = get_topology(self.app)
+        switches = [switch.to_dict() for switch in topology.switches]
+        links = [link.to_dict() for link in topology.links]
 
         # To remove hosts that are not removed by controller
-        ports = []
-        for switch in switch_list:
-            ports += switch.ports
-        port_macs = [p.hw_addr for p in ports]
-        n_host_list = [h for h in host_list if h.port.hw_addr in port_macs]
+        port_macs = set(p.hw_addr for switch in topology.switches
+                        for p in switch.ports)
+        n_host_list = [h for h in topology.hosts if h.port.hw_addr in port_macs]
 
         hosts = [h.to_dict() for h in n_host_list]
         return {"switches": switches, "links": links, "hosts": hosts}
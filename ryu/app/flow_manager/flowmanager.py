@@ -90,47 +90,6 @@ class FlowManager(app_manager.RyuApp):
 
     ##### Event Handlers #######################################
 
-    @set_ev_cls(
-        [  # ofp_event.EventOFPStatsReply,
-            ofp_event.EventOFPDescStatsReply,
-            ofp_event.EventOFPFlowStatsReply,
-            ofp_event.EventOFPAggregateStatsReply,
-            ofp_event.EventOFPTableStatsReply,
-            # ofp_event.EventOFPTableFeaturesStatsReply,
-            ofp_event.EventOFPPortStatsReply,
-            # ofp_event.EventOFPQueueStatsReply,
-            # ofp_event.EventOFPQueueDescStatsReply,
-            ofp_event.EventOFPMeterStatsReply,
-            ofp_event.EventOFPMeterFeaturesStatsReply,
-            ofp_event.EventOFPMeterConfigStatsReply,
-            ofp_event.EventOFPGroupStatsReply,
-            # ofp_event.EventOFPGroupFeaturesStatsReply,
-            ofp_event.EventOFPGroupDescStatsReply,
-            ofp_event.EventOFPPortDescStatsReply,
-        ],
-        MAIN_DISPATCHER,
-    )
-    def stats_reply_handler(self, event):
-        """Handles Reply Events"""
-        msg = event.msg
-        data_path = msg.datapath
-
-        if data_path.id not in self.ctrl_api.get_waiters():
-            return
-        if msg.xid not in self.ctrl_api.get_waiters()[data_path.id]:
-            return
-        lock, msgs = self.ctrl_api.get_waiters()[data_path.id][msg.xid]
-        msgs.append(msg)
-
-        flags = data_path.ofproto.OFPMPF_REPLY_MORE
-
-        if msg.flags & flags:
-            return
-        del self.ctrl_api.get_waiters()[data_path.id][msg.xid]
-        lock.set()
-
-        # self.messages.append(msg)
-
     @set_ev_cls(ofp_event.EventOFPFlowRemoved, MAIN_DISPATCHER)
     def flow_removed_handler(self, event):
         """Handles Flow Removal
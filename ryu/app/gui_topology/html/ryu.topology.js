@@ -11,11 +11,19 @@ var CONF = {
     }
 };
 
+var version = null; // version of the topology shown
+var pending = []; // changes notified before the topology is initialized
+
 var ws = new WebSocket("ws://" + location.host + "/v1.0/topology/ws");
 ws.onmessage = function(event) {
     var data = JSON.parse(event.data);
 
-    var result = rpc[data.method](data.params);
+    var result = "";
+    if (data.method == "event_topology") {
+        reset_topology(data.params[0]);
+    } else if (data.method in rpc) {
+        apply_change(data.method, data.params);
+    }
 
     var ret = {"id": data.id, "jsonrpc": "2.0", "result": result};
     this.send(JSON.stringify(ret));
@@ -265,12 +273,35 @@ var rpc = {
     },
 }
 
+// params: [switch, link or host, version of the change]
+function apply_change(method, params) {
+    if (version === null) {
+        pending.push([method, params]);
+        return;
+    }
+    if (params[1] <= version) return;
+    version = params[1];
+    rpc[method]([params[0]]);
+}
+
+function reset_topology(topology) {
+    topo.nodes = [];
+    topo.links = [];
+    topo.initialize({switches: topology.switches, links: topology.links});
+    version = topology.version;
+    elem.update();
+}
+
 function initialize_topology() {
-    d3.json("/v1.0/topology/switches", function(error, switches) {
-        d3.json("/v1.0/topology/links", function(error, links) {
-            topo.initialize({switches: switches, links: links});
-            elem.update();
-        });
+    d3.json("/v1.0/topology", function(error, topology) {
+        if (version === null) {
+            reset_topology(topology);
+        }
+        var changes = pending;
+        pending = [];
+        for (var i = 0; i < changes.length; i++) {
+            apply_change(changes[i][0], changes[i][1]);
+        }
     });
 }
 
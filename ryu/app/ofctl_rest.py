@@ -18,11 +18,11 @@ import json
 import ast
 
 from ryu.base import app_manager
-from ryu.controller import ofp_event
 from ryu.controller import dpset
-from ryu.controller.handler import MAIN_DISPATCHER
-from ryu.controller.handler import set_ev_cls
+from ryu.exception import OFPRequestError
 from ryu.exception import RyuException
+from ryu.lib import hub
+from ryu.lib import ofctl_utils
 from ryu.ofproto import ofproto_v1_0
 from ryu.ofproto import ofproto_v1_2
 from ryu.ofproto import ofproto_v1_3
@@ -68,9 +68,32 @@ supported_ofctl = {
 # get flows stats of the switch
 # GET /stats/flow/<dpid>
 #
+# get the stats of several switches at once
+# (<stat> is one of desc, flow, aggregateflow, table, port, queue,
+#  meter, group, portdesc or role.  dpid can be given more than once
+#  to select switches, all switches are queried by default.  The
+#  stats of the switches which replied within timeout seconds are
+#  returned together with the status of each switch.)
+# GET /stats/<stat>/all[?dpid=<dpid>&...][&timeout=<seconds>]
+#
+# get flows or aggregate flow stats of several switches filtered by
+# the fields
+# POST /stats/flow/all[?dpid=<dpid>&...][&timeout=<seconds>]
+# POST /stats/aggregateflow/all[?dpid=<dpid>&...][&timeout=<seconds>]
+#
 # get flows stats of the switch filtered by the fields
 # POST /stats/flow/<dpid>
 #
+# get flows stats of the switch as a chunked response, sending the flow
+# entries as they arrive from the switch (OpenFlow 1.3 or later.  If
+# the request fails on the way, the entries are truncated and the
+# error message is returned as "error" next to them.)
+# GET /stats/flowstream/<dpid>
+#
+# get flows stats of the switch filtered by the fields as a chunked
+# response (OpenFlow 1.3 or later)
+# POST /stats/flowstream/<dpid>
+#
 # get aggregate flows stats of the switch
 # GET /stats/aggregateflow/<dpid>
 #
@@ -182,6 +205,17 @@ supported_ofctl = {
 #
 # send a experimeter message
 # POST /stats/experimenter/<dpid>
+#
+# add, modify or delete many flow, meter and group entries at once
+# (The body is a JSON array or newline delimited JSON objects, each
+#  of which is the body of /stats/flowentry, /stats/meterentry or
+#  /stats/groupentry, including dpid, with "entry" set to "flow"
+#  (default), "meter" or "group" and "cmd" set to the command ("add"
+#  by default).  A barrier request is sent after every <barrier>
+#  entries of a switch.  bundle=true applies the entries of each
+#  switch as a bundle (OpenFlow 1.4 or later).  The response reports
+#  the errors of the entries, identified by their index in the body.)
+# POST /stats/bulk[?barrier=<barrier>][&bundle=true]
 
 
 class CommandNotFoundError(RyuException):
@@ -192,6 +226,107 @@ class PortNotFoundError(RyuException):
     message = 'No such port info: %(port_no)s'
 
 
+# Size of the chunks of streamed responses.
+STREAM_CHUNK_SIZE = 65536
+
+# Default deadline in seconds of the requests sent to several switches.
+FANOUT_TIMEOUT = 2.0
+
+# The stats /stats/<stat>/all can query, and the lib/ofctl_* function
+# and whether it takes the request body as filter for each.
+fanout_stats = {
+    'desc': ('get_desc_stats', False),
+    'flow': ('get_flow_stats', True),
+    'aggregateflow': ('get_aggregate_flow_stats', True),
+    'table': ('get_table_stats', False),
+    'port': ('get_port_stats', False),
+    'queue': ('get_queue_stats', False),
+    'meter': ('get_meter_stats', False),
+    'group': ('get_group_stats', False),
+    'portdesc': ('get_port_desc', False),
+    'role': ('get_role', False),
+}
+
+# The entries /stats/bulk accepts, and the lib/ofctl_* function building
+# the message and the names of the commands for each.
+bulk_entries = {
+    'flow': ('to_flow_mod', {
+        'add': 'OFPFC_ADD',
+        'modify': 'OFPFC_MODIFY',
+        'modify_strict': 'OFPFC_MODIFY_STRICT',
+        'delete': 'OFPFC_DELETE',
+        'delete_strict': 'OFPFC_DELETE_STRICT',
+    }),
+    'meter': ('to_meter_mod', {
+        'add': 'OFPMC_ADD',
+        'modify': 'OFPMC_MODIFY',
+        'delete': 'OFPMC_DELETE',
+    }),
+    'group': ('to_group_mod', {
+        'add': 'OFPGC_ADD',
+        'modify': 'OFPGC_MODIFY',
+        'delete': 'OFPGC_DELETE',
+    }),
+}
+
+# Status of each switch in the response of /stats/<stat>/all
+FANOUT_OK = 'ok'
+FANOUT_TIMEOUT_EXPIRED = 'timeout'
+FANOUT_NOT_FOUND = 'not_found'
+FANOUT_UNSUPPORTED = 'unsupported'
+FANOUT_ERROR = 'error'
+
+
+def json_list_stream(dpid, entries):
+    """
+    Generate the JSON encoding of {dpid: list(entries)} piece by piece.
+    An error while iterating entries truncates the list, and the
+    message of the error is added as {"error": message}, since the
+    status of the response has been sent already.
+    """
+    chunk = ['{%s: [' % json.dumps(str(dpid))]
+    size = 0
+    sep = ''
+    error = None
+    try:
+        for entry in entries:
+            data = sep + json.dumps(entry)
+            sep = ', '
+            chunk.append(data)
+            size += len(data)
+            if size >= STREAM_CHUNK_SIZE:
+                yield ''.join(chunk).encode('utf-8')
+                chunk = []
+                size = 0
+    except RyuException as e:
+        LOG.error('Stats of datapath %s truncated: %s', dpid, e)
+        error = str(e)
+    chunk.append(']')
+    if error is not None:
+        chunk.append(', "error": %s' % json.dumps(error))
+    chunk.append('}')
+    yield ''.join(chunk).encode('utf-8')
+
+
+def json_objects(body):
+    """
+    Parse body, either a JSON array of objects, a JSON object or
+    newline delimited JSON objects, into a list of dicts.
+    """
+    text = body.decode('utf-8')
+    try:
+        objs = json.loads(text)
+    except ValueError:
+        objs = [json.loads(line) for line in text.splitlines()
+                if line.strip()]
+    if isinstance(objs, dict):
+        objs = [objs]
+    if not isinstance(objs, list) or \
+            not all(isinstance(obj, dict) for obj in objs):
+        raise ValueError('Not JSON objects')
+    return objs
+
+
 def stats_method(method):
     def wrapper(self, req, dpid, *args, **kwargs):
         # Get datapath instance from DPSet
@@ -215,6 +350,8 @@ def stats_method(method):
         # Invoke StatsController method
         try:
             ret = method(self, req, dp, ofctl, *args, **kwargs)
+            if isinstance(ret, Response):
+                return ret
             return Response(content_type='application/json',
                             body=json.dumps(ret))
         except ValueError:
@@ -303,6 +440,66 @@ class StatsController(ControllerBase):
         body = json.dumps(dps)
         return Response(content_type='application/json', body=body)
 
+    def get_stats_all(self, req, stat, **_kwargs):
+        """
+        Send the stats request to the switches concurrently and wait
+        for the replies until a single deadline.
+        """
+        func_name, filtered = fanout_stats[stat]
+
+        try:
+            timeout = float(req.GET.get('timeout', FANOUT_TIMEOUT))
+            dpids = [int(str(dpid), 0) for dpid in req.GET.getall('dpid')]
+            flow = req.json if filtered and req.body else {}
+        except ValueError:
+            LOG.exception('Invalid syntax: %s', req.url)
+            return Response(status=400)
+        if not dpids:
+            dpids = list(self.dpset.dps.keys())
+
+        stats = {}
+        status = {}
+        pending = set()
+        done = hub.Event()
+
+        def _get_stats(dp, func):
+            try:
+                if filtered:
+                    ret = func(dp, self.waiters, flow)
+                else:
+                    ret = func(dp, self.waiters)
+                stats.update(ret)
+                status[str(dp.id)] = FANOUT_OK
+            except Exception as e:
+                LOG.error('Stats of datapath %s failed: %s', dp.id, e)
+                status[str(dp.id)] = FANOUT_ERROR
+            finally:
+                pending.discard(dp.id)
+                if not pending:
+                    done.set()
+
+        for dpid in dpids:
+            dp = self.dpset.get(dpid)
+            if dp is None:
+                status[str(dpid)] = FANOUT_NOT_FOUND
+                continue
+            ofctl = supported_ofctl.get(dp.ofproto.OFP_VERSION)
+            func = getattr(ofctl, func_name, None)
+            if func is None:
+                status[str(dpid)] = FANOUT_UNSUPPORTED
+                continue
+            pending.add(dpid)
+            hub.spawn(_get_stats, dp, func)
+
+        if pending:
+            done.wait(timeout=timeout)
+        # Late replies are still collected by the spawned threads, but
+        # are no longer reported.
+        for dpid in pending:
+            status[str(dpid)] = FANOUT_TIMEOUT_EXPIRED
+        body = json.dumps({'stats': stats, 'status': status})
+        return Response(content_type='application/json', body=body)
+
     @stats_method
     def get_desc_stats(self, req, dp, ofctl, **kwargs):
         return ofctl.get_desc_stats(dp, self.waiters)
@@ -317,6 +514,13 @@ class StatsController(ControllerBase):
         flow = req.json if req.body else {}
         return ofctl.get_flow_stats(dp, self.waiters, flow)
 
+    @stats_method
+    def get_flow_stats_stream(self, req, dp, ofctl, **kwargs):
+        flow = req.json if req.body else {}
+        entries = ofctl.get_flow_stats_stream(dp, flow)
+        return Response(content_type='application/json',
+                        app_iter=json_list_stream(dp.id, entries))
+
     @stats_method
     def get_aggregate_flow_stats(self, req, dp, ofctl, **kwargs):
         flow = req.json if req.body else {}
@@ -420,6 +624,80 @@ class StatsController(ControllerBase):
     def get_role(self, req, dp, ofctl, **kwargs):
         return ofctl.get_role(dp, self.waiters)
 
+    def mod_entries_bulk(self, req, **_kwargs):
+        """
+        Send the flow, meter and group mods in the request body to each
+        switch concurrently, pipelined with barrier requests.
+        """
+        try:
+            entries = json_objects(req.body)
+            barrier = int(req.GET.get(
+                'barrier', ofctl_utils.BULK_BARRIER_INTERVAL))
+            if barrier < 1:
+                raise ValueError('barrier must be positive: %d' % barrier)
+        except ValueError:
+            LOG.exception('Invalid syntax: %s', req.body)
+            return Response(status=400)
+        bundle = req.GET.get('bundle', 'false').lower() == 'true'
+
+        errors = []
+        msgs_per_dp = {}
+        for index, entry in enumerate(entries):
+            try:
+                dp, msg = self._to_mod_msg(entry, bundle)
+            except Exception as e:
+                errors.append({'index': index, 'dpid': entry.get('dpid'),
+                               'error': str(e)})
+                continue
+            msgs_per_dp.setdefault(dp, []).append((index, msg))
+
+        def _send(dp, msgs):
+            results = ofctl_utils.send_bulk(
+                dp, [msg for _index, msg in msgs], barrier, bundle, logger=LOG)
+            for (index, _msg), exc in zip(msgs, results):
+                if exc is None:
+                    continue
+                error = {'index': index, 'dpid': dp.id, 'error': str(exc)}
+                if isinstance(exc, OFPRequestError):
+                    error['type'] = exc.error_msg.type
+                    error['code'] = exc.error_msg.code
+                errors.append(error)
+
+        hub.joinall([hub.spawn(_send, dp, msgs)
+                     for dp, msgs in msgs_per_dp.items()])
+
+        errors.sort(key=lambda error: error['index'])
+        body = json.dumps({'total': len(entries),
+                           'succeeded': len(entries) - len(errors),
+                           'errors': errors})
+        return Response(content_type='application/json', body=body)
+
+    def _to_mod_msg(self, entry, bundle):
+        dpid = entry.get('dpid')
+        if dpid is None:
+            raise ValueError('Cannot get dpid from entry')
+        dp = self.dpset.get(int(str(dpid), 0))
+        if dp is None:
+            raise ValueError('No such Datapath: %s' % dpid)
+        if bundle and dp.ofproto.OFP_VERSION < ofproto_v1_4.OFP_VERSION:
+            raise ValueError('Bundle is unsupported in OpenFlow version: %s'
+                             % dp.ofproto.OFP_VERSION)
+        ofctl = supported_ofctl.get(dp.ofproto.OFP_VERSION)
+
+        kind = entry.get('entry', 'flow')
+        if kind not in bulk_entries:
+            raise ValueError('No such entry: %s' % kind)
+        func_name, cmd_convert = bulk_entries[kind]
+        cmd = entry.get('cmd', 'add')
+        if cmd not in cmd_convert:
+            raise CommandNotFoundError(cmd=cmd)
+        func = getattr(ofctl, func_name, None)
+        if func is None:
+            raise ValueError('Unsupported entry in OpenFlow version: %s'
+                             % dp.ofproto.OFP_VERSION)
+
+        return dp, func(dp, entry, getattr(dp.ofproto, cmd_convert[cmd]))
+
     @command_method
     def mod_flow_entry(self, req, dp, ofctl, flow, cmd, **kwargs):
         cmd_convert = {
@@ -514,7 +792,9 @@ class RestStatsApi(app_manager.RyuApp):
         super(RestStatsApi, self).__init__(*args, **kwargs)
         self.dpset = kwargs['dpset']
         wsgi = kwargs['wsgi']
-        self.waiters = {}
+        # The replies to the requests are collected by Datapath.request().
+        # See ofctl_utils.send_stats_request().
+        self.waiters = None
         self.data = {}
         self.data['dpset'] = self.dpset
         self.data['waiters'] = self.waiters
@@ -527,6 +807,12 @@ class RestStatsApi(app_manager.RyuApp):
                        controller=StatsController, action='get_dpids',
                        conditions=dict(method=['GET']))
 
+        for stat in fanout_stats:
+            uri = path + '/' + stat + '/all'
+            mapper.connect('stats', uri,
+                           controller=StatsController, action='get_stats_all',
+                           stat=stat, conditions=dict(method=['GET', 'POST']))
+
         uri = path + '/desc/{dpid}'
         mapper.connect('stats', uri,
                        controller=StatsController, action='get_desc_stats',
@@ -542,6 +828,12 @@ class RestStatsApi(app_manager.RyuApp):
                        controller=StatsController, action='get_flow_stats',
                        conditions=dict(method=['GET', 'POST']))
 
+        uri = path + '/flowstream/{dpid}'
+        mapper.connect('stats', uri,
+                       controller=StatsController,
+                       action='get_flow_stats_stream',
+                       conditions=dict(method=['GET', 'POST']))
+
         uri = path + '/aggregateflow/{dpid}'
         mapper.connect('stats', uri,
                        controller=StatsController,
@@ -718,61 +1010,7 @@ class RestStatsApi(app_manager.RyuApp):
                        controller=StatsController, action='set_role',
                        conditions=dict(method=['POST']))
 
-    @set_ev_cls([ofp_event.EventOFPStatsReply,
-                 ofp_event.EventOFPDescStatsReply,
-                 ofp_event.EventOFPFlowStatsReply,
-                 ofp_event.EventOFPAggregateStatsReply,
-                 ofp_event.EventOFPTableStatsReply,
-                 ofp_event.EventOFPTableFeaturesStatsReply,
-                 ofp_event.EventOFPPortStatsReply,
-                 ofp_event.EventOFPQueueStatsReply,
-                 ofp_event.EventOFPQueueDescStatsReply,
-                 ofp_event.EventOFPMeterStatsReply,
-                 ofp_event.EventOFPMeterFeaturesStatsReply,
-                 ofp_event.EventOFPMeterConfigStatsReply,
-                 ofp_event.EventOFPGroupStatsReply,
-                 ofp_event.EventOFPGroupFeaturesStatsReply,
-                 ofp_event.EventOFPGroupDescStatsReply,
-                 ofp_event.EventOFPPortDescStatsReply
-                 ], MAIN_DISPATCHER)
-    def stats_reply_handler(self, ev):
-        msg = ev.msg
-        dp = msg.datapath
-
-        if dp.id not in self.waiters:
-            return
-        if msg.xid not in self.waiters[dp.id]:
-            return
-        lock, msgs = self.waiters[dp.id][msg.xid]
-        msgs.append(msg)
-
-        flags = 0
-        if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            flags = dp.ofproto.OFPSF_REPLY_MORE
-        elif dp.ofproto.OFP_VERSION == ofproto_v1_2.OFP_VERSION:
-            flags = dp.ofproto.OFPSF_REPLY_MORE
-        elif dp.ofproto.OFP_VERSION >= ofproto_v1_3.OFP_VERSION:
-            flags = dp.ofproto.OFPMPF_REPLY_MORE
-
-        if msg.flags & flags:
-            return
-        del self.waiters[dp.id][msg.xid]
-        lock.set()
-
-    @set_ev_cls([ofp_event.EventOFPSwitchFeatures,
-                 ofp_event.EventOFPQueueGetConfigReply,
-                 ofp_event.EventOFPRoleReply,
-                 ], MAIN_DISPATCHER)
-    def features_reply_handler(self, ev):
-        msg = ev.msg
-        dp = msg.datapath
-
-        if dp.id not in self.waiters:
-            return
-        if msg.xid not in self.waiters[dp.id]:
-            return
-        lock, msgs = self.waiters[dp.id][msg.xid]
-        msgs.append(msg)
-
-        del self.waiters[dp.id][msg.xid]
-        lock.set()
+        uri = path + '/bulk'
+        mapper.connect('stats', uri,
+                       controller=StatsController, action='mod_entries_bulk',
+                       conditions=dict(method=['POST']))
@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from ryu.app.wsgi import ControllerBase
+from ryu.app.wsgi import Response
+from ryu.app.wsgi import route
+from ryu.app.wsgi import WSGIApplication
+from ryu.base import app_manager
+from ryu.lib import handler_stats
+
+# REST API for the statistics of event handlers
+#
+# Recording is enabled when this application is loaded.
+#
+# get the statistics of all applications
+# GET /v1.0/handler_stats
+#
+# get the statistics in the Prometheus text format
+# GET /v1.0/handler_stats/metrics
+#
+# enable or disable recording
+# PUT /v1.0/handler_stats/enable
+# PUT /v1.0/handler_stats/disable
+
+
+class HandlerStatsAPI(app_manager.RyuApp):
+    _CONTEXTS = {
+        'wsgi': WSGIApplication
+    }
+
+    def __init__(self, *args, **kwargs):
+        super(HandlerStatsAPI, self).__init__(*args, **kwargs)
+        handler_stats.enable()
+
+        wsgi = kwargs['wsgi']
+        wsgi.register(HandlerStatsController)
+
+
+class HandlerStatsController(ControllerBase):
+    @staticmethod
+    def _apps():
+        return list(app_manager.SERVICE_BRICKS.values())
+
+    @route('handler_stats', '/v1.0/handler_stats',
+           methods=['GET'])
+    def get_stats(self, req, **kwargs):
+        body = json.dumps(handler_stats.get_stats(self._apps()))
+        return Response(content_type='application/json', body=body)
+
+    @route('handler_stats', '/v1.0/handler_stats/metrics',
+           methods=['GET'])
+    def get_metrics(self, req, **kwargs):
+        body = handler_stats.to_prometheus(self._apps())
+        return Response(content_type='text/plain', body=body)
+
+    @route('handler_stats', '/v1.0/handler_stats/enable',
+           methods=['PUT'])
+    def enable(self, req, **kwargs):
+        handler_stats.enable()
+        return Response(status=200)
+
+    @route('handler_stats', '/v1.0/handler_stats/disable',
+           methods=['PUT'])
+    def disable(self, req, **kwargs):
+        handler_stats.disable()
+        return Response(status=200)
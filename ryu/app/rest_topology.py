@@ -22,6 +22,7 @@ from ryu.app.wsgi import WSGIApplication
 from ryu.base import app_manager
 from ryu.lib import dpid as dpid_lib
 from ryu.topology.api import get_switch, get_link, get_host
+from ryu.topology.api import get_topology, get_topology_changes
 
 # REST API for switch configuration
 #
@@ -43,8 +44,25 @@ from ryu.topology.api import get_switch, get_link, get_host
 # get the hosts of a switch
 # GET /v1.0/topology/hosts/<dpid>
 #
+# get all the switches, links and hosts with the version of the topology
+# GET /v1.0/topology
+#
+# get the changes of the topology after the version
+# GET /v1.0/topology/changes/<version>
+#
 # where
 # <dpid>: datapath id in 16 hex
+# <version>: version of the topology in decimal
+#
+# The changes are returned with the latest version, e.g.
+# {"version": 3,
+#  "changes": [{"version": 2, "event": "event_link_add", "data": {...}},
+#              {"version": 3, "event": "event_host_add", "data": {...}}]}
+# where "event" is one of event_switch_enter, event_switch_leave,
+# event_port_add, event_port_delete, event_port_modify, event_link_add,
+# event_link_delete, event_host_add, event_host_move, event_host_update
+# and event_host_delete.  If the changes after <version> are no longer
+# kept, 404 is returned and the client should get /v1.0/topology again.
 
 
 class TopologyAPI(app_manager.RyuApp):
@@ -94,6 +112,27 @@ class TopologyController(ControllerBase):
     def get_hosts(self, req, **kwargs):
         return self._hosts(req, **kwargs)
 
+    @route('topology', '/v1.0/topology',
+           methods=['GET'])
+    def get_topology(self, req, **kwargs):
+        topology = get_topology(self.topology_api_app)
+        body = json.dumps(topology.to_dict())
+        return Response(content_type='application/json', body=body)
+
+    @route('topology', '/v1.0/topology/changes/{version}',
+           methods=['GET'], requirements={'version': r'\d+'})
+    def get_topology_changes(self, req, **kwargs):
+        version = int(kwargs['version'])
+        changes = get_topology_changes(self.topology_api_app, version)
+        if changes is None:
+            return Response(status=404)
+        if changes:
+            version = changes[-1].version
+        body = json.dumps({'version': version,
+                           'changes': [change.to_dict()
+                                       for change in changes]})
+        return Response(content_type='application/json', body=body)
+
     def _switches(self, req, **kwargs):
         dpid = None
         if 'dpid' in kwargs:
@@ -25,17 +25,24 @@ $ wscat -c ws://localhost:8080/v1.0/topology/ws
 3. Join switches (use your favorite method):
 $ sudo mn --controller=remote --topo linear,2
 
-4. Topology change is notified:
-< {"params": [{"ports": [{"hw_addr": "56:c7:08:12:bb:36", "name": "s1-eth1", "port_no": "00000001", "dpid": "0000000000000001"}, {"hw_addr": "de:b9:49:24:74:3f", "name": "s1-eth2", "port_no": "00000002", "dpid": "0000000000000001"}], "dpid": "0000000000000001"}], "jsonrpc": "2.0", "method": "event_switch_enter", "id": 1}
+4. Topology change is notified with the version of the topology:
+< {"params": [{"ports": [{"hw_addr": "56:c7:08:12:bb:36", "name": "s1-eth1", "port_no": "00000001", "dpid": "0000000000000001"}, {"hw_addr": "de:b9:49:24:74:3f", "name": "s1-eth2", "port_no": "00000002", "dpid": "0000000000000001"}], "dpid": "0000000000000001"}, 1], "jsonrpc": "2.0", "method": "event_switch_enter", "id": 1}
 > {"id": 1, "jsonrpc": "2.0", "result": ""}
 
-< {"params": [{"ports": [{"hw_addr": "56:c7:08:12:bb:36", "name": "s1-eth1", "port_no": "00000001", "dpid": "0000000000000001"}, {"hw_addr": "de:b9:49:24:74:3f", "name": "s1-eth2", "port_no": "00000002", "dpid": "0000000000000001"}], "dpid": "0000000000000001"}], "jsonrpc": "2.0", "method": "event_switch_leave", "id": 2}
+< {"params": [{"ports": [{"hw_addr": "56:c7:08:12:bb:36", "name": "s1-eth1", "port_no": "00000001", "dpid": "0000000000000001"}, {"hw_addr": "de:b9:49:24:74:3f", "name": "s1-eth2", "port_no": "00000002", "dpid": "0000000000000001"}], "dpid": "0000000000000001"}, 2], "jsonrpc": "2.0", "method": "event_switch_leave", "id": 2}
 > {"id": 2, "jsonrpc": "2.0", "result": ""}
 ...
+
+The methods are the events of GET /v1.0/topology/changes/<version> of
+ryu.app.rest_topology.  A client can get the topology of a version by
+GET /v1.0/topology and apply the changes of the later versions.
+If this application falls behind the changes kept by
+ryu.topology.switches, the whole topology is notified instead:
+< {"params": [{"version": 10020, "switches": [...], "links": [...], "hosts": [...]}], "jsonrpc": "2.0", "method": "event_topology", "id": 3}
 """  # noqa
 
 from socket import error as SocketError
-from tinyrpc.exc import InvalidReplyError
+from tinyrpc.exc import RPCError
 
 
 from ryu.app.wsgi import (
@@ -46,6 +53,7 @@ from ryu.app.wsgi import (
 )
 from ryu.base import app_manager
 from ryu.topology import event, switches
+from ryu.topology.api import get_topology, get_topology_changes
 from ryu.controller.handler import set_ev_cls
 
 
@@ -59,47 +67,44 @@ class WebSocketTopology(app_manager.RyuApp):
         super(WebSocketTopology, self).__init__(*args, **kwargs)
 
         self.rpc_clients = []
+        self.version = 0  # version of the topology notified last
 
         wsgi = kwargs['wsgi']
         wsgi.register(WebSocketTopologyController, {'app': self})
 
-    @set_ev_cls(event.EventSwitchEnter)
-    def _event_switch_enter_handler(self, ev):
-        msg = ev.switch.to_dict()
-        self._rpc_broadcall('event_switch_enter', msg)
-
-    @set_ev_cls(event.EventSwitchLeave)
-    def _event_switch_leave_handler(self, ev):
-        msg = ev.switch.to_dict()
-        self._rpc_broadcall('event_switch_leave', msg)
-
-    @set_ev_cls(event.EventLinkAdd)
-    def _event_link_add_handler(self, ev):
-        msg = ev.link.to_dict()
-        self._rpc_broadcall('event_link_add', msg)
-
-    @set_ev_cls(event.EventLinkDelete)
-    def _event_link_delete_handler(self, ev):
-        msg = ev.link.to_dict()
-        self._rpc_broadcall('event_link_delete', msg)
-
-    @set_ev_cls(event.EventHostAdd)
-    def _event_host_add_handler(self, ev):
-        msg = ev.host.to_dict()
-        self._rpc_broadcall('event_host_add', msg)
-
-    def _rpc_broadcall(self, func_name, msg):
+    @set_ev_cls([event.EventSwitchEnter, event.EventSwitchLeave,
+                 event.EventPortAdd, event.EventPortDelete,
+                 event.EventPortModify,
+                 event.EventLinkAdd, event.EventLinkDelete,
+                 event.EventHostAdd, event.EventHostMove,
+                 event.EventHostDelete, event.EventHostUpdate])
+    def _event_topology_handler(self, ev):
+        # the events only tell that the topology is changed. the
+        # changes since the version notified last are read from the
+        # switches app in order.
+        changes = get_topology_changes(self, self.version)
+        if changes is None:
+            topology = get_topology(self)
+            self.version = topology.version
+            self._rpc_broadcall('event_topology', topology.to_dict())
+            return
+
+        for change in changes:
+            self.version = change.version
+            self._rpc_broadcall(change.event, change.data, change.version)
+
+    def _rpc_broadcall(self, func_name, *params):
         disconnected_clients = []
         for rpc_client in self.rpc_clients:
             # NOTE: Although broadcasting is desired,
             #       RPCClient#get_proxy(one_way=True) does not work well
             rpc_server = rpc_client.get_proxy()
             try:
-                getattr(rpc_server, func_name)(msg)
+                getattr(rpc_server, func_name)(*params)
             except SocketError:
                 self.logger.debug('WebSocket disconnected: %s', rpc_client.ws)
                 disconnected_clients.append(rpc_client)
-            except InvalidReplyError as e:
+            except RPCError as e:
                 self.logger.error(e)
 
         for client in disconnected_clients:
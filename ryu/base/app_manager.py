@@ -23,6 +23,7 @@ The central management of Ryu applications.
 
 """
 
+import collections
 import inspect
 import itertools
 import logging
@@ -36,7 +37,9 @@ from ryu.app import wsgi
 from ryu.controller.handler import register_instance, get_dependent_services
 from ryu.controller.controller import Datapath
 from ryu.controller import event
+from ryu.controller import ofp_event
 from ryu.controller.event import EventRequestBase, EventReplyBase
+from ryu.lib import handler_stats
 from ryu.lib import hub
 from ryu.ofproto import ofproto_protocol
 
@@ -44,6 +47,17 @@ LOG = logging.getLogger('ryu.base.app_manager')
 
 SERVICE_BRICKS = {}
 
+# Policies applied when an event subject to overflow handling
+# (cf. RyuApp.PACKET_IN_OVERFLOW_POLICY) finds its lane full.
+EVENT_OVERFLOW_BLOCK = 'block'
+EVENT_OVERFLOW_DROP_NEWEST = 'drop-newest'
+EVENT_OVERFLOW_DROP_OLDEST = 'drop-oldest'
+EVENT_OVERFLOW_SAMPLE = 'sample'
+EVENT_OVERFLOW_POLICIES = (EVENT_OVERFLOW_BLOCK,
+                           EVENT_OVERFLOW_DROP_NEWEST,
+                           EVENT_OVERFLOW_DROP_OLDEST,
+                           EVENT_OVERFLOW_SAMPLE)
+
 
 def lookup_service_brick(name):
     return SERVICE_BRICKS.get(name)
@@ -88,6 +102,110 @@ def require_app(app_name, api_style=False):
     LOG.debug('require_app: %s is required by %s', app_name, m.__name__)
 
 
+class EventQueue(object):
+    """
+    The queue of events waiting to be handled by a RyuApp.
+
+    Events whose class is in priority_events go to the priority lane,
+    the others go to the normal lane.  get() returns the oldest event
+    of the priority lane, if any, before the normal lane is looked at.
+    Each lane holds at most its own maxsize events.
+
+    A sender of an event finding its lane full waits for room, unless
+    the event class is in overflow_events and overflow_policy is not
+    'block':
+
+    ============= ==========================================================
+    Policy        Description
+    ============= ==========================================================
+    block         Wait for room. (Default)
+    drop-newest   Discard the new event.
+    drop-oldest   Discard the oldest queued event among overflow_events and
+                  queue the new event.
+    sample        Like 'drop-oldest' for one of every sample_rate events
+                  overflowing, like 'drop-newest' for the others.
+    ============= ==========================================================
+    """
+
+    def __init__(self, maxsize, priority_maxsize=None,
+                 priority_events=None, overflow_events=None,
+                 overflow_policy=EVENT_OVERFLOW_BLOCK, sample_rate=10):
+        assert overflow_policy in EVENT_OVERFLOW_POLICIES
+        assert sample_rate > 0
+        super(EventQueue, self).__init__()
+        self.maxsize = maxsize
+        self.priority_maxsize = priority_maxsize or maxsize
+        self.priority_events = frozenset(priority_events or [])
+        self.overflow_events = frozenset(overflow_events or [])
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.high_water = 0
+        self._overflow_count = 0
+        self._lanes = (collections.deque(), collections.deque())
+        self._sems = (hub.BoundedSemaphore(self.priority_maxsize),
+                      hub.BoundedSemaphore(self.maxsize))
+        # Counts the queued events to wake up get().
+        self._ready = hub.Semaphore(0)
+
+    def qsize(self):
+        return len(self._lanes[0]) + len(self._lanes[1])
+
+    def empty(self):
+        return not (self._lanes[0] or self._lanes[1])
+
+    def put(self, item):
+        """
+        Queue item, a tuple of (event, state).
+        Returns False if an event was discarded due to the overflow
+        policy, otherwise True.
+        """
+        ev_cls = item[0].__class__
+        lane = 0 if ev_cls in self.priority_events else 1
+        sem = self._sems[lane]
+        if (ev_cls in self.overflow_events and
+                self.overflow_policy != EVENT_OVERFLOW_BLOCK):
+            if not sem.acquire(blocking=False):
+                return self._overflow(self._lanes[lane], item)
+        else:
+            sem.acquire()
+        self._lanes[lane].append(item)
+        self._ready.release()
+        size = self.qsize()
+        if size > self.high_water:
+            self.high_water = size
+        return True
+
+    def _overflow(self, q, item):
+        self.dropped += 1
+        policy = self.overflow_policy
+        if policy == EVENT_OVERFLOW_SAMPLE:
+            self._overflow_count += 1
+            if self._overflow_count % self.sample_rate:
+                return False
+        elif policy != EVENT_OVERFLOW_DROP_OLDEST:
+            return False
+
+        # Replace the oldest event which is allowed to be discarded.
+        for i, (ev, _state) in enumerate(q):
+            if ev.__class__ in self.overflow_events:
+                del q[i]
+                q.append(item)
+                break
+        return False
+
+    def get(self):
+        """
+        Wait for an event and return it as a tuple of (event, state).
+        """
+        self._ready.acquire()
+        for lane, q in enumerate(self._lanes):
+            if q:
+                item = q.popleft()
+                self._sems[lane].release()
+                return item
+
+
 class RyuApp(object):
     """
     The base class for Ryu applications.
@@ -143,6 +261,40 @@ class RyuApp(object):
     the intersection of their OFP_VERSIONS is used.
     """
 
+    EVENT_QUEUE_SIZE = 128
+    """
+    The maximum number of events queued for this RyuApp in the normal
+    lane of its event queue.  A sender waits for room, or the event is
+    handled according to PACKET_IN_OVERFLOW_POLICY.
+    """
+
+    PRIORITY_EVENT_QUEUE_SIZE = 128
+    """
+    The maximum number of events queued for this RyuApp in the priority
+    lane of its event queue.
+    """
+
+    PRIORITY_EVENTS = [ofp_event.EventOFPStateChange,
+                       ofp_event.EventOFPPortStatus,
+                       ofp_event.EventOFPFlowRemoved]
+    """
+    A list of event classes which are handled ahead of the other events
+    queued for this RyuApp.
+    """
+
+    PACKET_IN_OVERFLOW_POLICY = EVENT_OVERFLOW_BLOCK
+    """
+    What to do with a EventOFPPacketIn when the event queue is full.
+    One of 'block', 'drop-newest', 'drop-oldest' and 'sample'.
+    See EventQueue for the details.
+    """
+
+    PACKET_IN_SAMPLE_RATE = 10
+    """
+    One of every PACKET_IN_SAMPLE_RATE overflowing EventOFPPacketIn is
+    queued when PACKET_IN_OVERFLOW_POLICY is 'sample'.
+    """
+
     @classmethod
     def context_iteritems(cls):
         """
@@ -154,11 +306,23 @@ class RyuApp(object):
         super(RyuApp, self).__init__()
         self.name = self.__class__.__name__
         self.event_handlers = {}        # ev_cls -> handlers:list
+        # (ev_cls, state) -> handlers:tuple
+        # Built on demand by get_handlers() and discarded whenever
+        # the registered handlers change.
+        self._dispatch_index = {}
+        # (handler name, ev_cls name) -> HandlerStats
+        # Only filled while handler_stats is enabled.
+        self.handler_stats = {}
         self.observers = {}     # ev_cls -> observer-name -> states:set
         self.threads = []
         self.main_thread = None
-        self.events = hub.Queue(128)
-        self._events_sem = hub.BoundedSemaphore(self.events.maxsize)
+        self.events = EventQueue(
+            self.EVENT_QUEUE_SIZE,
+            priority_maxsize=self.PRIORITY_EVENT_QUEUE_SIZE,
+            priority_events=self.PRIORITY_EVENTS,
+            overflow_events=[ofp_event.EventOFPPacketIn],
+            overflow_policy=self.PACKET_IN_OVERFLOW_POLICY,
+            sample_rate=self.PACKET_IN_SAMPLE_RATE)
         if hasattr(self.__class__, 'LOGGER_NAME'):
             self.logger = logging.getLogger(self.__class__.LOGGER_NAME)
         else:
@@ -196,12 +360,14 @@ class RyuApp(object):
         assert callable(handler)
         self.event_handlers.setdefault(ev_cls, [])
         self.event_handlers[ev_cls].append(handler)
+        self._dispatch_index.clear()
 
     def unregister_handler(self, ev_cls, handler):
         assert callable(handler)
         self.event_handlers[ev_cls].remove(handler)
         if not self.event_handlers[ev_cls]:
             del self.event_handlers[ev_cls]
+        self._dispatch_index.clear()
 
     def register_observer(self, ev_cls, name, states=None):
         states = states or set()
@@ -237,9 +403,13 @@ class RyuApp(object):
                       The default is None.
         """
         ev_cls = ev.__class__
-        handlers = self.event_handlers.get(ev_cls, [])
         if state is None:
-            return handlers
+            return self.event_handlers.get(ev_cls, [])
+
+        try:
+            return self._dispatch_index[(ev_cls, state)]
+        except KeyError:
+            pass
 
         def test(h):
             if not hasattr(h, 'callers') or ev_cls not in h.callers:
@@ -252,7 +422,9 @@ class RyuApp(object):
                 return True
             return state in states
 
-        return filter(test, handlers)
+        handlers = tuple(filter(test, self.event_handlers.get(ev_cls, [])))
+        self._dispatch_index[(ev_cls, state)] = handlers
+        return handlers
 
     def get_observers(self, ev, state):
         observers = []
@@ -281,11 +453,14 @@ class RyuApp(object):
     def _event_loop(self):
         while self.is_active or not self.events.empty():
             ev, state = self.events.get()
-            self._events_sem.release()
             if ev == self._event_stop:
                 continue
             handlers = self.get_handlers(ev, state)
+            record_stats = handler_stats.is_enabled()
             for handler in handlers:
+                error = False
+                if record_stats:
+                    start = handler_stats.timer()
                 try:
                     handler(ev)
                 except hub.TaskExit:
@@ -293,13 +468,24 @@ class RyuApp(object):
                     # Propagate upwards, so we leave the event loop.
                     raise
                 except:
+                    error = True
                     LOG.exception('%s: Exception occurred during handler processing. '
                                   'Backtrace from offending handler '
                                   '[%s] servicing event [%s] follows.',
                                   self.name, handler.__name__, ev.__class__.__name__)
+                if record_stats:
+                    self._record_handler_stats(
+                        handler, ev, handler_stats.timer() - start, error)
+
+    def _record_handler_stats(self, handler, ev, elapsed, error):
+        key = (handler.__name__, ev.__class__.__name__)
+        stats = self.handler_stats.get(key)
+        if stats is None:
+            stats = handler_stats.HandlerStats(*key)
+            self.handler_stats[key] = stats
+        stats.record(elapsed, error)
 
     def _send_event(self, ev, state):
-        self._events_sem.acquire()
         self.events.put((ev, state))
 
     def send_event(self, name, ev, state=None):
@@ -23,6 +23,7 @@ The main component of OpenFlow controller.
 """
 
 import contextlib
+import itertools
 import logging
 import random
 from socket import IPPROTO_TCP
@@ -30,8 +31,12 @@ from socket import TCP_NODELAY
 from socket import SHUT_WR
 from socket import timeout as SocketTimeout
 import ssl
+import struct
+import time
+import weakref
 
 from ryu import cfg
+from ryu import exception
 from ryu.lib import hub
 from ryu.lib.hub import StreamServer
 
@@ -54,6 +59,53 @@ LOG = logging.getLogger('ryu.controller.controller')
 DEFAULT_OFP_HOST = '0.0.0.0'
 DEFAULT_OFP_SW_CON_INTERVAL = 1
 
+DEFAULT_SEND_QUEUE_SIZE = 16
+DEFAULT_SEND_PRIORITY_QUEUE_SIZE = 4
+
+# Lanes of the per-datapath send queue.  Lower values are sent first.
+SEND_LANE_PRIORITY = 0
+SEND_LANE_NORMAL = 1
+
+# OFPSF_REPLY_MORE (OpenFlow 1.0 and 1.2) and OFPMPF_REPLY_MORE
+# (OpenFlow 1.3 or later) have the same value.
+_REPLY_MORE = 1 << 0
+
+# xid of the OpenFlow header
+_HEADER_XID = struct.Struct('!I')
+_HEADER_XID_OFFSET = 4
+
+# Interval in seconds to fail the requests which timed out without
+# anyone waiting for them.  See Datapath.request().
+_REQUEST_EXPIRE_INTERVAL = 1.0
+
+_REPLY_TYPES = {}
+
+
+def _reply_types(ofproto):
+    """
+    Returns the set of the types of messages sent by a switch in reply
+    to a request, for the given ofproto module.
+    """
+    types = _REPLY_TYPES.get(ofproto)
+    if types is None:
+        types = frozenset(v for k, v in vars(ofproto).items()
+                          if k.startswith('OFPT_') and k.endswith('_REPLY'))
+        # Bundle control replies share the type of the requests.
+        if hasattr(ofproto, 'OFPT_BUNDLE_CONTROL'):
+            types |= frozenset([ofproto.OFPT_BUNDLE_CONTROL])
+        _REPLY_TYPES[ofproto] = types
+    return types
+
+
+def _multipart_reply_type(ofproto):
+    return getattr(ofproto, 'OFPT_MULTIPART_REPLY', None) or \
+        getattr(ofproto, 'OFPT_STATS_REPLY')
+
+
+# Size of the per-connection receive buffer.  The length field of the
+# OpenFlow header is 16 bits, so a complete message always fits.
+RECV_BUF_SIZE = 0x20000
+
 CONF = cfg.CONF
 CONF.register_cli_opts([
     cfg.StrOpt('ofp-listen-host', default=DEFAULT_OFP_HOST,
@@ -86,7 +138,27 @@ CONF.register_opts([
     cfg.IntOpt('maximum-unreplied-echo-requests',
                default=0,
                min=0,
-               help='Maximum number of unreplied echo requests before datapath is disconnected.')
+               help='Maximum number of unreplied echo requests before datapath is disconnected.'),
+    cfg.IntOpt('max-send-batch-size',
+               default=65536,
+               min=1,
+               help='Maximum number of bytes of queued messages written to a datapath at once.'),
+    cfg.IntOpt('send-queue-size',
+               default=DEFAULT_SEND_QUEUE_SIZE,
+               min=1,
+               help='Maximum number of messages queued for sending to a datapath '
+                    '(default %d).' % DEFAULT_SEND_QUEUE_SIZE),
+    cfg.IntOpt('send-priority-queue-size',
+               default=DEFAULT_SEND_PRIORITY_QUEUE_SIZE,
+               min=1,
+               help='Maximum number of control messages (e.g. echo) queued for '
+                    'sending to a datapath ahead of other messages '
+                    '(default %d).' % DEFAULT_SEND_PRIORITY_QUEUE_SIZE),
+    cfg.BoolOpt('ofp-lazy-decoding',
+                default=False,
+                help='Decode matches, instructions and multipart reply bodies '
+                     'of received messages on first access (OpenFlow 1.3 or '
+                     'later).')
 ])
 
 
@@ -137,6 +209,9 @@ class OpenFlowController(object):
             self.ofp_tcp_listen_port = CONF.ofp_tcp_listen_port
             self.ofp_ssl_listen_port = CONF.ofp_ssl_listen_port
 
+        if CONF.ofp_lazy_decoding:
+            ofproto_parser.enable_lazy_decoding()
+
         # Example:
         # self._clients = {
         #     ('127.0.0.1', 6653): <instance of StreamClient>,
@@ -209,6 +284,157 @@ class OpenFlowController(object):
         server.serve_forever()
 
 
+class RequestFuture(object):
+    """
+    The pending reply to a request sent by Datapath.request().
+
+    .. tabularcolumns:: |l|L|
+
+    ============ ==========================================================
+    Attribute    Description
+    ============ ==========================================================
+    datapath     The Datapath the request was sent to.
+    xid          The xid of the request.
+    msgs         The list of replies received so far.  A multipart
+                 request may be answered by several messages.
+    timeout      The maximum time, in seconds, to wait for the first
+                 reply and between two segments of a multipart reply.
+                 None means no limit.
+    ============ ==========================================================
+    """
+
+    def __init__(self, datapath, xid, timeout=None):
+        super(RequestFuture, self).__init__()
+        self.datapath = datapath
+        self.xid = xid
+        self.msgs = []
+        self.timeout = timeout
+        self._last_activity = time.time()
+        self._done = False
+        self._exception = None
+        # Set whenever a reply arrives or the request fails.
+        self._event = hub.Event()
+
+    def done(self):
+        """
+        Returns True if the final reply has arrived or the request failed.
+        """
+        return self._done
+
+    def _expiry(self):
+        if self.timeout is None:
+            return None
+        return self._last_activity + self.timeout
+
+    def _wait_reply(self, end=None):
+        # Wait until a reply arrives, the request fails or times out, or
+        # end passes.  Returns False only in the last case.
+        expiry = self._expiry()
+        limits = [t for t in (end, expiry) if t is not None]
+        self._event.clear()
+        if not limits:
+            self._event.wait()
+        else:
+            remaining = min(limits) - time.time()
+            if remaining > 0:
+                self._event.wait(remaining)
+        if self._event.is_set():
+            return True
+        if expiry is not None and time.time() >= expiry:
+            self.datapath._requests.pop(self.xid, None)
+            self._set_exception(exception.OFPRequestTimeout(
+                xid=self.xid, timeout=self.timeout))
+            return True
+        return False
+
+    def wait(self, timeout=None):
+        """
+        Wait until the request completes, times out, or timeout seconds
+        pass.  Returns True if the request is done.
+        """
+        end = None if timeout is None else time.time() + timeout
+        while not self._done:
+            if not self._wait_reply(end):
+                break
+        return self._done
+
+    def exception(self, timeout=None):
+        """
+        Wait like wait() and return the exception the request failed
+        with, or None.
+        """
+        self.wait(timeout)
+        return self._exception
+
+    def result(self, timeout=None):
+        """
+        Wait like wait() and return the list of replies.
+
+        Raises OFPRequestError if the switch replied with an error,
+        OFPRequestTimeout if the request timed out or OFPRequestAborted
+        if the datapath disconnected.  Raises hub.Timeout if timeout
+        seconds passed before the request completed.
+        """
+        if not self.wait(timeout):
+            raise hub.Timeout()
+        if self._exception is not None:
+            raise self._exception
+        return self.msgs
+
+    def stream(self):
+        """
+        A generator yielding the replies as they arrive.
+
+        The yielded replies are removed from msgs, so that a large
+        multipart reply need not be held in memory at once.  If the
+        request fails, the exception is raised after the replies
+        received so far are yielded.
+        """
+        while True:
+            # Replies may arrive while the consumer holds a yielded one,
+            # so check for completion before taking the pending replies.
+            done = self._done
+            msgs, self.msgs = self.msgs, []
+            for msg in msgs:
+                yield msg
+            if done:
+                break
+            # The request may have completed while the replies were
+            # yielded, and waiting then would lose its result.
+            if not self.msgs and not self._done:
+                self._wait_reply()
+        if self._exception is not None:
+            raise self._exception
+
+    def cancel(self):
+        """
+        Stop waiting for the reply.
+
+        This is meant for requests which get no reply unless they fail,
+        such as flow mods, once a following barrier request is answered.
+        The future completes with the replies received so far.  Returns
+        False if it had already completed.
+        """
+        if self._done:
+            return False
+        self.datapath._requests.pop(self.xid, None)
+        self._done = True
+        self._event.set()
+        return True
+
+    def _add_reply(self, msg, last):
+        self.msgs.append(msg)
+        self._last_activity = time.time()
+        if last:
+            self._done = True
+        self._event.set()
+
+    def _set_exception(self, exc):
+        self._exception = exc
+        self._done = True
+        self._event.set()
+
+
 def _deactivate(method):
     def deactivate(self):
         try:
@@ -256,18 +482,45 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                                          example OFPFlowMod for flow-mod
                                          message.  Arguemnts depend on the
                                          message.
+    next_xid(self)                       Generate an OpenFlow XID.
     set_xid(self, msg)                   Generate an OpenFlow XID and put it
                                          in msg.xid.
+    request(self, msg, timeout=None)     Queue an OpenFlow request to send to
+                                         the switch and return a
+                                         RequestFuture which completes on the
+                                         reply.
     send_msg(self, msg)                  Queue an OpenFlow message to send to
                                          the corresponding switch.  If msg.xid
                                          is None, set_xid is automatically
                                          called on the message before queueing.
+                                         Echo request/reply messages are queued
+                                         in the priority lane and are sent
+                                         ahead of the other queued messages.
+    send_msgs(self, msgs)                Serialize OpenFlow messages into one
+                                         buffer and queue it to send to the
+                                         switch as a single entry.
+    batch(self)                          A context manager to collect
+                                         messages for send_msgs.
     send_packet_out                      deprecated
     send_flow_mod                        deprecated
     send_flow_del                        deprecated
     send_delete_all_flows                deprecated
     send_barrier                         Queue an OpenFlow barrier message to
                                          send to the switch.
+    sent_bytes                           Number of bytes written to the
+                                         switch.
+    sent_msgs                            Number of queued buffers written to
+                                         the switch.
+    send_flushes                         Number of writes to the socket.
+                                         Buffers queued back-to-back are
+                                         coalesced into a single write.
+    send_q_len                           Number of buffers currently queued.
+    send_q_high_water                    Maximum number of buffers queued at
+                                         once.
+    send_q_wait_count                    Number of sends which had to wait for
+                                         room in the send queue.
+    send_q_wait_time                     Total time, in seconds, spent waiting
+                                         for room in the send queue.
     send_nxt_set_flow_format             deprecated
     is_reserved_port                     deprecated
     ==================================== ======================================
@@ -282,16 +535,34 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         self.address = address
         self.is_active = True
 
-        # The limit is arbitrary. We need to limit queue size to
-        # prevent it from eating memory up.
-        self.send_q = hub.Queue(16)
-        self._send_q_sem = hub.BoundedSemaphore(self.send_q.maxsize)
+        # We need to limit queue size to prevent it from eating memory up.
+        # Control messages have their own slots so that they are never
+        # stuck behind a backlog of other messages.
+        self.send_q = hub.PriorityQueue()
+        self._send_q_sems = {
+            SEND_LANE_PRIORITY: hub.BoundedSemaphore(
+                CONF.send_priority_queue_size),
+            SEND_LANE_NORMAL: hub.BoundedSemaphore(CONF.send_queue_size),
+        }
+        # Keeps the messages in the same lane in FIFO order.
+        self._send_q_seq = itertools.count()
+        self.send_q_high_water = 0
+        self.send_q_wait_count = 0
+        self.send_q_wait_time = 0.0
+        self.max_send_batch_size = CONF.max_send_batch_size
+        self.sent_bytes = 0
+        self.sent_msgs = 0
+        self.send_flushes = 0
 
         self.echo_request_interval = CONF.echo_request_interval
         self.max_unreplied_echo_requests = CONF.maximum_unreplied_echo_requests
         self.unreplied_echo_requests = []
 
         self.xid = random.randint(0, self.ofproto.MAX_XID)
+        # xid -> RequestFuture.  Futures dropped by the callers are
+        # removed by themselves.
+        self._requests = weakref.WeakValueDictionary()
+        self._requests_expired = 0  # time of the last _expire_requests()
         self.id = None  # datapath_id is unknown yet
         self._ports = None
         self.flow_format = ofproto_v1_0.NXFF_OPENFLOW10
@@ -323,16 +594,25 @@ class Datapath(ofproto_protocol.ProtocolDesc):
     # Low level socket handling layer
     @_deactivate
     def _recv_loop(self):
-        buf = bytearray()
+        # Messages are read with recv_into() into a fixed size buffer and
+        # are parsed in place; the unconsumed data is buf[start:end].
+        # The pending bytes are moved to the head of the buffer only when
+        # the tail is reached, so each received byte is copied at most
+        # once more before being handed to the parser.
+        buf = bytearray(RECV_BUF_SIZE)
+        view = memoryview(buf)
+        start = end = 0
         count = 0
-        min_read_len = remaining_read_len = ofproto_common.OFP_HEADER_SIZE
+        min_read_len = ofproto_common.OFP_HEADER_SIZE
 
         while self.state != DEAD_DISPATCHER:
+            if end == RECV_BUF_SIZE:
+                pending = end - start
+                buf[:pending] = buf[start:end]
+                start = 0
+                end = pending
             try:
-                read_len = min_read_len
-                if remaining_read_len > min_read_len:
-                    read_len = remaining_read_len
-                ret = self.socket.recv(read_len)
+                ret = self.socket.recv_into(view[end:])
             except SocketTimeout:
                 continue
             except ssl.SSLError:
@@ -345,40 +625,33 @@ class Datapath(ofproto_protocol.ProtocolDesc):
             if not ret:
                 break
 
-            buf += ret
-            buf_len = len(buf)
-            while buf_len >= min_read_len:
-                (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            end += ret
+            while end - start >= min_read_len:
+                (version, msg_type, msg_len, xid) = ofproto_parser.header(
+                    view[start:end])
                 if msg_len < min_read_len:
                     # Someone isn't playing nicely; log it, and try something sane.
                     LOG.debug("Message with invalid length %s received from switch at address %s",
                               msg_len, self.address)
                     msg_len = min_read_len
-                if buf_len < msg_len:
-                    remaining_read_len = (msg_len - buf_len)
+                if end - start < msg_len:
                     break
 
                 msg = ofproto_parser.msg(
-                    self, version, msg_type, msg_len, xid, buf[:msg_len])
+                    self, version, msg_type, msg_len, xid,
+                    buf[start:start + msg_len])
+                start += msg_len
                 # LOG.debug('queue msg %s cls %s', msg, msg.__class__)
                 if msg:
+                    if self._requests:
+                        self._handle_reply(msg)
                     ev = ofp_event.ofp_msg_to_ev(msg)
                     if self.ofp_brick is not None:
                         self.ofp_brick.send_event_to_observers(ev, self.state)
-
-                        def dispatchers(x):
-                            return x.callers[ev.__class__].dispatchers
-
-                        handlers = [handler for handler in
-                                    self.ofp_brick.get_handlers(ev) if
-                                    self.state in dispatchers(handler)]
-                        for handler in handlers:
+                        for handler in self.ofp_brick.get_handlers(
+                                ev, self.state):
                             handler(ev)
 
-                buf = buf[msg_len:]
-                buf_len = len(buf)
-                remaining_read_len = min_read_len
-
                 # We need to schedule other greenlets. Otherwise, ryu
                 # can't accept new switches or handle the existing
                 # switches. The limit is arbitrary. We need the better
@@ -388,12 +661,33 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                     count = 0
                     hub.sleep(0)
 
+            if start == end:
+                start = end = 0
+
     def _send_loop(self):
         try:
             while self.state != DEAD_DISPATCHER:
-                buf, close_socket = self.send_q.get()
-                self._send_q_sem.release()
+                lane, _seq, buf, close_socket = self.send_q.get()
+                self._send_q_sems[lane].release()
+                # Coalesce whatever else is already queued into the same
+                # write, up to max_send_batch_size bytes.
+                bufs = [buf]
+                size = len(buf)
+                while not close_socket and size < self.max_send_batch_size:
+                    try:
+                        lane, _seq, buf, close_socket = self.send_q.get(
+                            block=False)
+                    except hub.QueueEmpty:
+                        break
+                    self._send_q_sems[lane].release()
+                    bufs.append(buf)
+                    size += len(buf)
+                if len(bufs) > 1:
+                    buf = b''.join(bufs)
                 self.socket.sendall(buf)
+                self.sent_bytes += size
+                self.sent_msgs += len(bufs)
+                self.send_flushes += 1
                 if close_socket:
                     break
         except SocketTimeout:
@@ -411,39 +705,146 @@ class Datapath(ofproto_protocol.ProtocolDesc):
             # Now, drain the send_q, releasing the associated semaphore for each entry.
             # This should release all threads waiting to acquire the semaphore.
             try:
-                while q.get(block=False):
-                    self._send_q_sem.release()
+                while True:
+                    lane = q.get(block=False)[0]
+                    self._send_q_sems[lane].release()
             except hub.QueueEmpty:
                 pass
             # Finally, disallow further sends.
             self._close_write()
 
-    def send(self, buf, close_socket=False):
+    def send(self, buf, close_socket=False, priority=False):
         msg_enqueued = False
-        self._send_q_sem.acquire()
+        lane = SEND_LANE_PRIORITY if priority else SEND_LANE_NORMAL
+        sem = self._send_q_sems[lane]
+        if not sem.acquire(blocking=False):
+            start = time.time()
+            sem.acquire()
+            self.send_q_wait_count += 1
+            self.send_q_wait_time += time.time() - start
         if self.send_q:
-            self.send_q.put((buf, close_socket))
+            self.send_q.put((lane, next(self._send_q_seq), buf, close_socket))
             msg_enqueued = True
+            self.send_q_high_water = max(self.send_q_high_water,
+                                         self.send_q.qsize())
         else:
-            self._send_q_sem.release()
+            sem.release()
         if not msg_enqueued:
             LOG.debug('Datapath in process of terminating; send() to %s discarded.',
                       self.address)
         return msg_enqueued
 
-    def set_xid(self, msg):
+    @property
+    def send_q_len(self):
+        if not self.send_q:
+            return 0
+        return self.send_q.qsize()
+
+    def next_xid(self):
         self.xid += 1
         self.xid &= self.ofproto.MAX_XID
-        msg.set_xid(self.xid)
         return self.xid
 
-    def send_msg(self, msg, close_socket=False):
+    def set_xid(self, msg):
+        msg.set_xid(self.next_xid())
+        return self.xid
+
+    def _is_priority_msg(self, msg):
+        return msg.msg_type in (self.ofproto.OFPT_ECHO_REQUEST,
+                                self.ofproto.OFPT_ECHO_REPLY)
+
+    def send_msg(self, msg, close_socket=False, priority=None):
         assert isinstance(msg, self.ofproto_parser.MsgBase)
         if msg.xid is None:
             self.set_xid(msg)
         msg.serialize()
+        if priority is None:
+            priority = self._is_priority_msg(msg)
         # LOG.debug('send_msg %s', msg)
-        return self.send(msg.buf, close_socket=close_socket)
+        return self.send(msg.buf, close_socket=close_socket,
+                         priority=priority)
+
+    def send_msgs(self, msgs):
+        """
+        Serialize msgs back-to-back into one buffer and queue it to send
+        as a single entry.  Returns False if the buffer was discarded.
+        """
+        with self.batch() as batch:
+            for msg in msgs:
+                batch.send_msg(msg)
+        return batch.enqueued
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        A context manager which yields a MsgBatch.  The messages given to
+        its send_msg are queued to send together when the block exits.
+        If the block raises an exception, the messages not queued yet are
+        discarded.  Those already queued because the buffer reached
+        max_send_batch_size are still sent.
+        """
+        batch = MsgBatch(self)
+        yield batch
+        batch.flush()
+
+    def request(self, msg, timeout=None):
+        """
+        Queue msg to send to the switch and return a RequestFuture.
+
+        The future completes when the switch replies to msg: with the
+        last segment (no REPLY_MORE flag) of a multipart reply, or with
+        an error message carrying the xid of msg.  If timeout is given,
+        the request fails when no reply arrives within timeout seconds
+        of sending the request or of receiving the previous segment.
+
+        The datapath holds the future only by a weak reference.  If the
+        caller drops it, the reply is not tracked any more, though it is
+        still delivered as an event.
+        """
+        now = time.time()
+        if now - self._requests_expired >= _REQUEST_EXPIRE_INTERVAL:
+            self._expire_requests(now)
+        if msg.xid is None:
+            self.set_xid(msg)
+        future = RequestFuture(self, msg.xid, timeout)
+        self._requests[msg.xid] = future
+        if not self.send_msg(msg):
+            del self._requests[msg.xid]
+            future._set_exception(exception.OFPRequestAborted(xid=msg.xid))
+        return future
+
+    def _handle_reply(self, msg):
+        future = self._requests.get(msg.xid)
+        if future is None:
+            return
+        ofproto = self.ofproto
+        msg_type = msg.msg_type
+        if msg_type == ofproto.OFPT_ERROR:
+            del self._requests[msg.xid]
+            future._set_exception(exception.OFPRequestError(msg))
+        elif msg_type in _reply_types(ofproto):
+            last = not (msg_type == _multipart_reply_type(ofproto) and
+                        msg.flags & _REPLY_MORE)
+            if last:
+                del self._requests[msg.xid]
+            future._add_reply(msg, last)
+
+    def _expire_requests(self, now):
+        # RequestFuture checks its timeout only while waited for, so the
+        # requests nobody waits for are failed here.
+        self._requests_expired = now
+        for xid, future in list(self._requests.items()):
+            expiry = future._expiry()
+            if expiry is not None and now >= expiry:
+                del self._requests[xid]
+                future._set_exception(exception.OFPRequestTimeout(
+                    xid=xid, timeout=future.timeout))
+
+    def _abort_requests(self):
+        requests = self._requests
+        self._requests = weakref.WeakValueDictionary()
+        for xid, future in list(requests.items()):
+            future._set_exception(exception.OFPRequestAborted(xid=xid))
 
     def _echo_request_loop(self):
         if not self.max_unreplied_echo_requests:
@@ -478,6 +879,7 @@ class Datapath(ofproto_protocol.ProtocolDesc):
             hub.kill(echo_thr)
             hub.joinall([send_thr, echo_thr])
             self.is_active = False
+            self._abort_requests()
 
     #
     # Utility methods for convenience
@@ -550,6 +952,61 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         return port_no > self.ofproto.OFPP_MAX
 
 
+class MsgBatch(object):
+    """
+    Messages being serialized into one buffer to send to a datapath.
+    See Datapath.batch.
+
+    The buffer is queued each time it grows beyond
+    max_send_batch_size bytes and when the batch is flushed.
+    """
+
+    def __init__(self, datapath):
+        self.datapath = datapath
+        self.buf = bytearray()
+        self.enqueued = True
+
+    def send_msg(self, msg):
+        """
+        Serialize msg into the buffer.  If msg.xid is None, an xid is
+        generated by the datapath.
+        """
+        datapath = self.datapath
+        assert isinstance(msg, datapath.ofproto_parser.MsgBase)
+        if msg.xid is None:
+            datapath.set_xid(msg)
+        msg.serialize()
+        self.buf += msg.buf
+        if len(self.buf) >= datapath.max_send_batch_size:
+            self.flush()
+
+    def send_buf(self, buf):
+        """
+        Copy buf, the wire bytes of a message, into the buffer with its
+        xid replaced with one generated by the datapath.  Returns the
+        xid.
+        """
+        datapath = self.datapath
+        xid = datapath.next_xid()
+        offset = len(self.buf)
+        self.buf += buf
+        _HEADER_XID.pack_into(self.buf, offset + _HEADER_XID_OFFSET, xid)
+        if len(self.buf) >= datapath.max_send_batch_size:
+            self.flush()
+        return xid
+
+    def flush(self):
+        """
+        Queue the buffer to send.  Returns False if it was discarded.
+        """
+        if self.buf:
+            buf = self.buf
+            self.buf = bytearray()
+            if not self.datapath.send(buf):
+                self.enqueued = False
+        return self.enqueued
+
+
 def datapath_connection_factory(socket, address):
     LOG.debug('connected socket:%s address:%s', socket, address)
     with contextlib.closing(Datapath(socket, address)) as datapath:
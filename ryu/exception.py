@@ -52,6 +52,25 @@ class OFPTruncatedMessage(RyuException):
         super(OFPTruncatedMessage, self).__init__(msg, **kwargs)
 
 
+class OFPRequestTimeout(RyuException):
+    message = 'no reply to request xid %(xid)d within %(timeout)s seconds'
+
+
+class OFPRequestError(RyuException):
+    message = 'error reply to request xid %(xid)d: %(error)s'
+
+    def __init__(self, error_msg, msg=None, **kwargs):
+        self.error_msg = error_msg
+        kwargs['xid'] = error_msg.xid
+        kwargs['error'] = str(error_msg)
+
+        super(OFPRequestError, self).__init__(msg, **kwargs)
+
+
+class OFPRequestAborted(RyuException):
+    message = 'request xid %(xid)d aborted: datapath disconnected'
+
+
 class OFPInvalidActionString(RyuException):
     message = 'unable to parse: %(action_str)s'
 
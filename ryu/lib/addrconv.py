@@ -14,9 +14,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import binascii
+import functools
+import socket
+
 import netaddr
 
 
+# The size of the caches of the MAC address conversions.
+MAC_CACHE_SIZE = 4096
+
+_HEX = ['%02x' % i for i in range(256)]
+
+
 class AddressConverter(object):
     def __init__(self, addr, strat, fallback=None, **kwargs):
         self._addr = addr
@@ -41,15 +51,78 @@ class AddressConverter(object):
                               **self._addr_kwargs))
 
 
-ipv4 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv4,
-                        fallback=netaddr.IPNetwork, version=4)
-ipv6 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv6,
-                        fallback=netaddr.IPNetwork, version=6)
+class IPAddressConverter(AddressConverter):
+    """
+    Converts the usual forms of IP addresses with inet_pton/inet_ntop.
+    The others, e.g. CIDR notations, are converted by netaddr.
+    """
+
+    def __init__(self, family, *args, **kwargs):
+        super(IPAddressConverter, self).__init__(*args, **kwargs)
+        self._family = family
+
+    def text_to_bin(self, text):
+        try:
+            return socket.inet_pton(self._family, text)
+        except (socket.error, TypeError, ValueError):
+            return super(IPAddressConverter, self).text_to_bin(text)
+
+    def bin_to_text(self, bin):
+        try:
+            return socket.inet_ntop(self._family, bin)
+        except (TypeError, ValueError):
+            return super(IPAddressConverter, self).bin_to_text(bin)
+
+
+class MacAddressConverter(AddressConverter):
+    """
+    Converts 'xx:xx:xx:xx:xx:xx' form of MAC addresses with the hex
+    table and caches the results.  The other forms are converted by
+    netaddr.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(MacAddressConverter, self).__init__(*args, **kwargs)
+        self._text_to_bin = functools.lru_cache(MAC_CACHE_SIZE)(
+            self._text_to_bin)
+        self._bin_to_text = functools.lru_cache(MAC_CACHE_SIZE)(
+            self._bin_to_text)
+
+    def _text_to_bin(self, text):
+        if len(text) == 17 and text[2::3] == ':::::':
+            try:
+                return binascii.unhexlify(text.replace(':', ''))
+            except ValueError:
+                pass
+        return super(MacAddressConverter, self).text_to_bin(text)
+
+    def _bin_to_text(self, bin):
+        if len(bin) == 6:
+            return ':'.join([_HEX[b] for b in bin])
+        return super(MacAddressConverter, self).bin_to_text(bin)
+
+    def text_to_bin(self, text):
+        if isinstance(text, str):
+            return self._text_to_bin(text)
+        return super(MacAddressConverter, self).text_to_bin(text)
+
+    def bin_to_text(self, bin):
+        if isinstance(bin, (bytearray, memoryview)):
+            bin = bytes(bin)
+        return self._bin_to_text(bin)
+
+
+ipv4 = IPAddressConverter(socket.AF_INET, netaddr.IPAddress,
+                          netaddr.strategy.ipv4, fallback=netaddr.IPNetwork,
+                          version=4)
+ipv6 = IPAddressConverter(socket.AF_INET6, netaddr.IPAddress,
+                          netaddr.strategy.ipv6, fallback=netaddr.IPNetwork,
+                          version=6)
 
 
 class mac_mydialect(netaddr.mac_unix):
     word_fmt = '%.2x'
 
 
-mac = AddressConverter(netaddr.EUI, netaddr.strategy.eui48, version=48,
-                       dialect=mac_mydialect)
+mac = MacAddressConverter(netaddr.EUI, netaddr.strategy.eui48, version=48,
+                          dialect=mac_mydialect)
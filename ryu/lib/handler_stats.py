@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Statistics of the event handlers of Ryu applications.
+
+Recording is disabled by default.  Once enabled, the event loop of each
+RyuApp records, per event handler and event class, the number of calls,
+the number of exceptions raised and a histogram of the time spent in
+the handler.  While disabled, the cost is a single flag check per event.
+"""
+
+import bisect
+import timeit
+
+# Upper bounds, in seconds, of the buckets of the latency histograms.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+timer = timeit.default_timer
+
+_enabled = False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+class HandlerStats(object):
+    """
+    Statistics of an event handler for an event class.
+    """
+
+    def __init__(self, handler, ev_cls):
+        super(HandlerStats, self).__init__()
+        self.handler = handler
+        self.ev_cls = ev_cls
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        # The last bucket counts the calls slower than LATENCY_BUCKETS[-1].
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, elapsed, error=False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def to_jsondict(self):
+        return {
+            'handler': self.handler,
+            'event': self.ev_cls,
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_time': self.total_time,
+            'max_time': self.max_time,
+            'buckets': dict(zip([str(le) for le in LATENCY_BUCKETS] +
+                                ['+Inf'], self.buckets)),
+        }
+
+
+def get_stats(apps):
+    """
+    Returns the statistics of the given RyuApp instances as a dict
+    suitable for JSON encoding.
+    """
+    stats = {'enabled': is_enabled(), 'apps': {}}
+    for app in apps:
+        events = app.events
+        stats['apps'][app.name] = {
+            'event_queue': {
+                'length': events.qsize(),
+                'maxsize': events.maxsize,
+                'high_water': events.high_water,
+                'dropped': events.dropped,
+            },
+            'handlers': [s.to_jsondict()
+                         for s in app.handler_stats.values()],
+        }
+    return stats
+
+
+def _label_value(value):
+    # backslash, double-quote and line feed are escaped in label values
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(**kwargs):
+    return ','.join('%s="%s"' % (k, _label_value(v))
+                    for k, v in sorted(kwargs.items()))
+
+
+def to_prometheus(apps):
+    """
+    Returns the statistics of the given RyuApp instances in the
+    Prometheus text exposition format.
+    """
+    queue_metrics = [
+        ('ryu_app_event_queue_length', 'gauge',
+         'Number of events waiting in the event queue.',
+         lambda app: app.events.qsize()),
+        ('ryu_app_event_queue_high_water', 'gauge',
+         'Maximum number of events queued at once.',
+         lambda app: app.events.high_water),
+        ('ryu_app_event_queue_dropped_total', 'counter',
+         'Number of events discarded due to the overflow policy.',
+         lambda app: app.events.dropped),
+    ]
+    handler_metrics = [
+        ('ryu_handler_calls_total', 'counter',
+         'Number of calls of the event handler.',
+         lambda s: s.calls),
+        ('ryu_handler_errors_total', 'counter',
+         'Number of exceptions raised by the event handler.',
+         lambda s: s.errors),
+    ]
+
+    apps = list(apps)
+    lines = []
+    for name, type_, help_, get in queue_metrics:
+        lines.append('# HELP %s %s' % (name, help_))
+        lines.append('# TYPE %s %s' % (name, type_))
+        for app in apps:
+            lines.append('%s{%s} %s' % (name, _labels(app=app.name),
+                                        get(app)))
+
+    stats = [(app.name, s) for app in apps
+             for s in app.handler_stats.values()]
+    for name, type_, help_, get in handler_metrics:
+        lines.append('# HELP %s %s' % (name, help_))
+        lines.append('# TYPE %s %s' % (name, type_))
+        for app_name, s in stats:
+            labels = _labels(app=app_name, handler=s.handler, event=s.ev_cls)
+            lines.append('%s{%s} %s' % (name, labels, get(s)))
+
+    name = 'ryu_handler_latency_seconds'
+    lines.append('# HELP %s Time spent in the event handler.' % name)
+    lines.append('# TYPE %s histogram' % name)
+    for app_name, s in stats:
+        count = 0
+        for le, n in zip([repr(le) for le in LATENCY_BUCKETS] + ['+Inf'],
+                         s.buckets):
+            count += n
+            labels = _labels(app=app_name, handler=s.handler,
+                             event=s.ev_cls, le=le)
+            lines.append('%s_bucket{%s} %d' % (name, labels, count))
+        labels = _labels(app=app_name, handler=s.handler, event=s.ev_cls)
+        lines.append('%s_sum{%s} %r' % (name, labels, s.total_time))
+        lines.append('%s_count{%s} %d' % (name, labels, s.calls))
+
+    return '\n'.join(lines) + '\n'
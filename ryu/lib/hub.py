@@ -105,6 +105,7 @@ if HUB_TYPE == 'eventlet':
                 pass
 
     Queue = eventlet.queue.LightQueue
+    PriorityQueue = eventlet.queue.PriorityQueue
     QueueEmpty = eventlet.queue.Empty
     Semaphore = eventlet.semaphore.Semaphore
     BoundedSemaphore = eventlet.semaphore.BoundedSemaphore
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import base64
+import collections
 import logging
 
 import netaddr
@@ -27,6 +28,11 @@ from ryu.ofproto import ofproto_v1_2
 LOG = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 1.0
 
+# Defaults of send_bulk()
+BULK_BARRIER_INTERVAL = 100
+BULK_MAX_PENDING_BARRIERS = 4
+BULK_TIMEOUT = 10.0
+
 # NOTE(jkoelker) Constants for converting actions
 OUTPUT = 'OUTPUT'
 COPY_TTL_OUT = 'COPY_TTL_OUT'
@@ -243,6 +249,18 @@ def send_msg(dp, msg, logger=None):
 
 
 def send_stats_request(dp, stats, waiters, msgs, logger=None):
+    """
+    Send a request and append the replies to msgs.
+
+    If waiters is None, the replies are collected by Datapath.request().
+    Otherwise the caller is responsible for handling the replies: it has
+    to append them to the list in waiters[dp.id][xid] and to set the
+    event stored with it once the last reply has arrived.
+    """
+    if waiters is None:
+        _collect(dp, stats, msgs, logger)
+        return
+
     dp.set_xid(stats)
     waiters_per_dp = waiters.setdefault(dp.id, {})
     lock = hub.Event()
@@ -262,6 +280,112 @@ def send_stats_request(dp, stats, waiters, msgs, logger=None):
         del waiters_per_dp[stats.xid]
 
 
+def _request(dp, stats, logger=None, timeout=DEFAULT_TIMEOUT):
+    dp.set_xid(stats)
+    log = get_logger(logger)
+    log_msg = ('Sending message with xid(%x) to '
+               'datapath(' + dpid._DPID_FMT + '): %s')
+    log.debug(log_msg, stats.xid, dp.id, stats)
+    return dp.request(stats, timeout=timeout)
+
+
+def _collect(dp, stats, msgs, logger=None):
+    future = _request(dp, stats, logger)
+    future.wait()
+    # Even a failed request may have received some of the replies.
+    msgs.extend(future.msgs)
+    if future.exception() is not None:
+        get_logger(logger).debug(
+            'Request to datapath(' + dpid._DPID_FMT + ') failed: %s',
+            dp.id, future.exception())
+
+
+def send_stats_request_stream(dp, stats, logger=None):
+    """
+    Send a request and return a generator yielding the replies as they
+    arrive.  See RequestFuture.stream().
+    """
+    return _request(dp, stats, logger).stream()
+
+
+def send_bulk(dp, msgs, barrier_interval=BULK_BARRIER_INTERVAL,
+              bundle=False, timeout=BULK_TIMEOUT, logger=None):
+    """
+    Send msgs, which get no reply unless they fail (e.g. flow mods),
+    with a barrier request after every barrier_interval messages.
+
+    Returns a list holding, for each message, None if the switch
+    accepted it, or the exception of the message otherwise:
+    OFPRequestError for the error returned by the switch, or the
+    exception of the following barrier request if it failed.  At most
+    BULK_MAX_PENDING_BARRIERS barrier requests are left unanswered.
+
+    If bundle is True, the messages are added to a bundle which is
+    committed at the end (OpenFlow 1.4 or later).
+    """
+    ofp = dp.ofproto
+    parser = dp.ofproto_parser
+    results = [None] * len(msgs)
+    pending = collections.deque()
+    unsettled = []
+
+    def _settle(futures, exc):
+        for i, future in futures:
+            if future.cancel():
+                results[i] = exc
+            else:
+                results[i] = future.exception()
+
+    def _barrier(futures):
+        barrier = parser.OFPBarrierRequest(dp)
+        pending.append((_request(dp, barrier, logger, timeout), futures))
+
+    def _wait_barrier():
+        barrier, futures = pending.popleft()
+        barrier.wait()
+        if bundle:
+            # The errors of the bundled messages may come on commit.
+            unsettled.extend(futures)
+        else:
+            _settle(futures, barrier.exception())
+
+    if bundle:
+        flags = ofp.OFPBF_ATOMIC | ofp.OFPBF_ORDERED
+        ctrl = parser.OFPBundleCtrlMsg(dp, type_=ofp.OFPBCT_OPEN_REQUEST,
+                                       flags=flags, properties=[])
+        dp.set_xid(ctrl)
+        bundle_id = ctrl.bundle_id = ctrl.xid
+        ctrl = _request(dp, ctrl, logger, timeout)
+        ctrl.wait()
+        if ctrl.exception() is not None:
+            return [ctrl.exception()] * len(msgs)
+
+    futures = []
+    for i, msg in enumerate(msgs):
+        if bundle:
+            msg = parser.OFPBundleAddMsg(dp, bundle_id, flags, msg, [])
+        futures.append((i, _request(dp, msg, logger, None)))
+        if len(futures) >= barrier_interval:
+            _barrier(futures)
+            futures = []
+            if len(pending) > BULK_MAX_PENDING_BARRIERS:
+                _wait_barrier()
+    if futures:
+        _barrier(futures)
+    while pending:
+        _wait_barrier()
+
+    if bundle:
+        ctrl = parser.OFPBundleCtrlMsg(dp, bundle_id,
+                                       ofp.OFPBCT_COMMIT_REQUEST,
+                                       flags, [])
+        ctrl = _request(dp, ctrl, logger, timeout)
+        ctrl.wait()
+        _settle(unsettled, ctrl.exception())
+
+    return results
+
+
 def str_to_int(str_num):
     return int(str(str_num), 0)
 
@@ -494,7 +494,7 @@ def get_port_desc(dp, waiters):
     return {str(dp.id): descs}
 
 
-def mod_flow_entry(dp, flow, cmd):
+def to_flow_mod(dp, flow, cmd):
     cookie = str_to_int(flow.get('cookie', 0))
     priority = str_to_int(
         flow.get('priority', dp.ofproto.OFP_DEFAULT_PRIORITY))
@@ -516,7 +516,11 @@ def mod_flow_entry(dp, flow, cmd):
         flags=flags,
         actions=actions)
 
-    ofctl_utils.send_msg(dp, flow_mod, LOG)
+    return flow_mod
+
+
+def mod_flow_entry(dp, flow, cmd):
+    ofctl_utils.send_msg(dp, to_flow_mod(dp, flow, cmd), LOG)
 
 
 def delete_flow_entry(dp):
@@ -767,7 +767,7 @@ def get_role(dp, waiters, to_user=True):
     return ofctl_utils.get_role(dp, waiters, to_user)
 
 
-def mod_flow_entry(dp, flow, cmd):
+def to_flow_mod(dp, flow, cmd):
     cookie = str_to_int(flow.get('cookie', 0))
     cookie_mask = str_to_int(flow.get('cookie_mask', 0))
     table_id = UTIL.ofp_table_from_user(flow.get('table_id', 0))
@@ -789,10 +789,14 @@ def mod_flow_entry(dp, flow, cmd):
         hard_timeout, priority, buffer_id, out_port, out_group,
         flags, match, inst)
 
-    ofctl_utils.send_msg(dp, flow_mod, LOG)
+    return flow_mod
 
 
-def mod_group_entry(dp, group, cmd):
+def mod_flow_entry(dp, flow, cmd):
+    ofctl_utils.send_msg(dp, to_flow_mod(dp, flow, cmd), LOG)
+
+
+def to_group_mod(dp, group, cmd):
 
     type_convert = {'ALL': dp.ofproto.OFPGT_ALL,
                     'SELECT': dp.ofproto.OFPGT_SELECT,
@@ -823,7 +827,11 @@ def mod_group_entry(dp, group, cmd):
     group_mod = dp.ofproto_parser.OFPGroupMod(
         dp, cmd, type_, group_id, buckets)
 
-    ofctl_utils.send_msg(dp, group_mod, LOG)
+    return group_mod
+
+
+def mod_group_entry(dp, group, cmd):
+    ofctl_utils.send_msg(dp, to_group_mod(dp, group, cmd), LOG)
 
 
 def mod_port_behavior(dp, port_config):
@@ -437,8 +437,7 @@ def get_queue_config(dp, waiters, port=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_flow_stats(dp, waiters, flow=None, to_user=True):
-    flow = flow if flow else {}
+def _flow_stats_request(dp, flow):
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
     flags = str_to_int(flow.get('flags', 0))
@@ -449,14 +448,45 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
     cookie = str_to_int(flow.get('cookie', 0))
     cookie_mask = str_to_int(flow.get('cookie_mask', 0))
     match = to_match(dp, flow.get('match', {}))
-    # Note: OpenFlow does not allow to filter flow entries by priority,
-    # but for efficiency, ofctl provides the way to do it.
-    priority = str_to_int(flow.get('priority', -1))
 
-    stats = dp.ofproto_parser.OFPFlowStatsRequest(
+    return dp.ofproto_parser.OFPFlowStatsRequest(
         dp, flags, table_id, out_port, out_group, cookie, cookie_mask,
         match)
 
+
+def _flow_stats_to_dict(stats, to_user):
+    s = {'priority': stats.priority,
+         'cookie': stats.cookie,
+         'idle_timeout': stats.idle_timeout,
+         'hard_timeout': stats.hard_timeout,
+         'byte_count': stats.byte_count,
+         'duration_sec': stats.duration_sec,
+         'duration_nsec': stats.duration_nsec,
+         'packet_count': stats.packet_count,
+         'length': stats.length,
+         'flags': stats.flags}
+
+    if to_user:
+        s['actions'] = actions_to_str(stats.instructions)
+        s['match'] = match_to_str(stats.match)
+        s['table_id'] = UTIL.ofp_table_to_user(stats.table_id)
+
+    else:
+        s['actions'] = stats.instructions
+        s['instructions'] = stats.instructions
+        s['match'] = stats.match
+        s['table_id'] = stats.table_id
+
+    return s
+
+
+def get_flow_stats(dp, waiters, flow=None, to_user=True):
+    flow = flow if flow else {}
+    stats = _flow_stats_request(dp, flow)
+    # Note: OpenFlow does not allow to filter flow entries by priority,
+    # but for efficiency, ofctl provides the way to do it.
+    priority = str_to_int(flow.get('priority', -1))
+
     msgs = []
     ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
 
@@ -466,31 +496,31 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
             if 0 <= priority != stats.priority:
                 continue
 
-            s = {'priority': stats.priority,
-                 'cookie': stats.cookie,
-                 'idle_timeout': stats.idle_timeout,
-                 'hard_timeout': stats.hard_timeout,
-                 'byte_count': stats.byte_count,
-                 'duration_sec': stats.duration_sec,
-                 'duration_nsec': stats.duration_nsec,
-                 'packet_count': stats.packet_count,
-                 'length': stats.length,
-                 'flags': stats.flags}
+            flows.append(_flow_stats_to_dict(stats, to_user))
 
-            if to_user:
-                s['actions'] = actions_to_str(stats.instructions)
-                s['match'] = match_to_str(stats.match)
-                s['table_id'] = UTIL.ofp_table_to_user(stats.table_id)
+    return wrap_dpid_dict(dp, flows, to_user)
 
-            else:
-                s['actions'] = stats.instructions
-                s['instructions'] = stats.instructions
-                s['match'] = stats.match
-                s['table_id'] = stats.table_id
 
-            flows.append(s)
+def get_flow_stats_stream(dp, flow=None, to_user=True):
+    """
+    Like get_flow_stats(), but return a generator yielding the flow
+    entries as each segment of the multipart reply arrives.
+    The request is sent before this function returns.
+    """
+    flow = flow if flow else {}
+    stats = _flow_stats_request(dp, flow)
+    priority = str_to_int(flow.get('priority', -1))
+    msgs = ofctl_utils.send_stats_request_stream(dp, stats, LOG)
 
-    return wrap_dpid_dict(dp, flows, to_user)
+    def _stream():
+        for msg in msgs:
+            for stats in msg.body:
+                if 0 <= priority != stats.priority:
+                    continue
+
+                yield _flow_stats_to_dict(stats, to_user)
+
+    return _stream()
 
 
 def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
@@ -1046,7 +1076,7 @@ def get_role(dp, waiters, to_user=True):
     return ofctl_utils.get_role(dp, waiters, to_user)
 
 
-def mod_flow_entry(dp, flow, cmd):
+def to_flow_mod(dp, flow, cmd):
     cookie = str_to_int(flow.get('cookie', 0))
     cookie_mask = str_to_int(flow.get('cookie_mask', 0))
     table_id = UTIL.ofp_table_from_user(flow.get('table_id', 0))
@@ -1068,10 +1098,14 @@ def mod_flow_entry(dp, flow, cmd):
         hard_timeout, priority, buffer_id, out_port, out_group,
         flags, match, inst)
 
-    ofctl_utils.send_msg(dp, flow_mod, LOG)
+    return flow_mod
 
 
-def mod_meter_entry(dp, meter, cmd):
+def mod_flow_entry(dp, flow, cmd):
+    ofctl_utils.send_msg(dp, to_flow_mod(dp, flow, cmd), LOG)
+
+
+def to_meter_mod(dp, meter, cmd):
 
     flags_convert = {'KBPS': dp.ofproto.OFPMF_KBPS,
                      'PKTPS': dp.ofproto.OFPMF_PKTPS,
@@ -1115,10 +1149,14 @@ def mod_meter_entry(dp, meter, cmd):
     meter_mod = dp.ofproto_parser.OFPMeterMod(
         dp, cmd, flags, meter_id, bands)
 
-    ofctl_utils.send_msg(dp, meter_mod, LOG)
+    return meter_mod
 
 
-def mod_group_entry(dp, group, cmd):
+def mod_meter_entry(dp, meter, cmd):
+    ofctl_utils.send_msg(dp, to_meter_mod(dp, meter, cmd), LOG)
+
+
+def to_group_mod(dp, group, cmd):
 
     type_convert = {'ALL': dp.ofproto.OFPGT_ALL,
                     'SELECT': dp.ofproto.OFPGT_SELECT,
@@ -1149,7 +1187,11 @@ def mod_group_entry(dp, group, cmd):
     group_mod = dp.ofproto_parser.OFPGroupMod(
         dp, cmd, type_, group_id, buckets)
 
-    ofctl_utils.send_msg(dp, group_mod, LOG)
+    return group_mod
+
+
+def mod_group_entry(dp, group, cmd):
+    ofctl_utils.send_msg(dp, to_group_mod(dp, group, cmd), LOG)
 
 
 def mod_port_behavior(dp, port_config):
@@ -315,8 +315,7 @@ def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_flow_stats(dp, waiters, flow=None, to_user=True):
-    flow = flow if flow else {}
+def _flow_stats_request(dp, flow):
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
     flags = str_to_int(flow.get('flags', 0))
@@ -327,14 +326,26 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
     cookie = str_to_int(flow.get('cookie', 0))
     cookie_mask = str_to_int(flow.get('cookie_mask', 0))
     match = to_match(dp, flow.get('match', {}))
-    # Note: OpenFlow does not allow to filter flow entries by priority,
-    # but for efficiency, ofctl provides the way to do it.
-    priority = str_to_int(flow.get('priority', -1))
 
-    stats = dp.ofproto_parser.OFPFlowStatsRequest(
+    return dp.ofproto_parser.OFPFlowStatsRequest(
         dp, flags, table_id, out_port, out_group, cookie, cookie_mask,
         match)
 
+
+def _flow_stats_to_dict(stats):
+    s = stats.to_jsondict()[stats.__class__.__name__]
+    s['instructions'] = instructions_to_str(stats.instructions)
+    s['match'] = match_to_str(stats.match)
+    return s
+
+
+def get_flow_stats(dp, waiters, flow=None, to_user=True):
+    flow = flow if flow else {}
+    stats = _flow_stats_request(dp, flow)
+    # Note: OpenFlow does not allow to filter flow entries by priority,
+    # but for efficiency, ofctl provides the way to do it.
+    priority = str_to_int(flow.get('priority', -1))
+
     msgs = []
     ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
 
@@ -344,14 +355,33 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
             if 0 <= priority != stats.priority:
                 continue
 
-            s = stats.to_jsondict()[stats.__class__.__name__]
-            s['instructions'] = instructions_to_str(stats.instructions)
-            s['match'] = match_to_str(stats.match)
-            flows.append(s)
+            flows.append(_flow_stats_to_dict(stats))
 
     return wrap_dpid_dict(dp, flows, to_user)
 
 
+def get_flow_stats_stream(dp, flow=None, to_user=True):
+    """
+    Like get_flow_stats(), but return a generator yielding the flow
+    entries as each segment of the multipart reply arrives.
+    The request is sent before this function returns.
+    """
+    flow = flow if flow else {}
+    stats = _flow_stats_request(dp, flow)
+    priority = str_to_int(flow.get('priority', -1))
+    msgs = ofctl_utils.send_stats_request_stream(dp, stats, LOG)
+
+    def _stream():
+        for msg in msgs:
+            for stats in msg.body:
+                if 0 <= priority != stats.priority:
+                    continue
+
+                yield _flow_stats_to_dict(stats)
+
+    return _stream()
+
+
 def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
@@ -821,7 +851,7 @@ def get_role(dp, waiters, to_user=True):
     return ofctl_utils.get_role(dp, waiters, to_user)
 
 
-def mod_flow_entry(dp, flow, cmd):
+def to_flow_mod(dp, flow, cmd):
     cookie = str_to_int(flow.get('cookie', 0))
     cookie_mask = str_to_int(flow.get('cookie_mask', 0))
     table_id = UTIL.ofp_table_from_user(flow.get('table_id', 0))
@@ -844,10 +874,14 @@ def mod_flow_entry(dp, flow, cmd):
         hard_timeout, priority, buffer_id, out_port, out_group,
         flags, importance, match, inst)
 
-    ofctl_utils.send_msg(dp, flow_mod, LOG)
+    return flow_mod
 
 
-def mod_meter_entry(dp, meter, cmd):
+def mod_flow_entry(dp, flow, cmd):
+    ofctl_utils.send_msg(dp, to_flow_mod(dp, flow, cmd), LOG)
+
+
+def to_meter_mod(dp, meter, cmd):
     flags = 0
     if 'flags' in meter:
         meter_flags = meter['flags']
@@ -887,10 +921,14 @@ def mod_meter_entry(dp, meter, cmd):
     meter_mod = dp.ofproto_parser.OFPMeterMod(
         dp, cmd, flags, meter_id, bands)
 
-    ofctl_utils.send_msg(dp, meter_mod, LOG)
+    return meter_mod
 
 
-def mod_group_entry(dp, group, cmd):
+def mod_meter_entry(dp, meter, cmd):
+    ofctl_utils.send_msg(dp, to_meter_mod(dp, meter, cmd), LOG)
+
+
+def to_group_mod(dp, group, cmd):
     group_type = str(group.get('type', 'ALL'))
     t = UTIL.ofp_group_type_from_user(group_type)
     group_type = t if t != group_type else None
@@ -917,7 +955,11 @@ def mod_group_entry(dp, group, cmd):
     group_mod = dp.ofproto_parser.OFPGroupMod(
         dp, cmd, group_type, group_id, buckets)
 
-    ofctl_utils.send_msg(dp, group_mod, LOG)
+    return group_mod
+
+
+def mod_group_entry(dp, group, cmd):
+    ofctl_utils.send_msg(dp, to_group_mod(dp, group, cmd), LOG)
 
 
 def mod_port_behavior(dp, port_config):
@@ -52,6 +52,9 @@ class arp(packet_base.PacketBase):
     ============== ===================================== =====================
     """
 
+    __slots__ = ('hwtype', 'proto', 'hlen', 'plen', 'opcode', 'src_mac',
+                 'src_ip', 'dst_mac', 'dst_ip')
+
     _PACK_STR = '!HHBBH6s4s6s4s'
     _MIN_LEN = struct.calcsize(_PACK_STR)
     _TYPE = {
@@ -95,6 +98,17 @@ class arp(packet_base.PacketBase):
                            addrconv.mac.text_to_bin(self.dst_mac),
                            addrconv.ipv4.text_to_bin(self.dst_ip))
 
+    def serialized_len(self):
+        return arp._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        struct.pack_into(arp._PACK_STR, buf, offset, self.hwtype, self.proto,
+                         self.hlen, self.plen, self.opcode,
+                         addrconv.mac.text_to_bin(self.src_mac),
+                         addrconv.ipv4.text_to_bin(self.src_ip),
+                         addrconv.mac.text_to_bin(self.dst_mac),
+                         addrconv.ipv4.text_to_bin(self.dst_ip))
+
 
 def arp_ip(opcode, src_mac, src_ip, dst_mac, dst_ip):
     """A convenient wrapper for IPv4 ARP for Ethernet.
@@ -226,6 +226,9 @@ class bfd(packet_base.PacketBase):
         else:
             return self._PACK_STR_LEN
 
+    def serialized_len(self):
+        return len(self)
+
     @classmethod
     def parser(cls, buf):
         (diag, flags, detect_mult, length, my_discr, your_discr,
@@ -38,6 +38,8 @@ class ethernet(packet_base.PacketBase):
     ============== ==================== =====================
     """
 
+    __slots__ = ('dst', 'src', 'ethertype')
+
     _PACK_STR = '!6s6sH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
     _MIN_PAYLOAD_LEN = 46
@@ -73,6 +75,16 @@ class ethernet(packet_base.PacketBase):
                            addrconv.mac.text_to_bin(self.src),
                            self.ethertype)
 
+    def serialized_len(self):
+        return ethernet._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        # The padding is allocated by Packet.serialize.
+        struct.pack_into(ethernet._PACK_STR, buf, offset,
+                         addrconv.mac.text_to_bin(self.dst),
+                         addrconv.mac.text_to_bin(self.src),
+                         self.ethertype)
+
     @classmethod
     def get_packet_type(cls, type_):
         """Override method for the ethernet IEEE802.3 Length/Type
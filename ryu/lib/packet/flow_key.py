@@ -0,0 +1,176 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Flow key extractor.
+
+extract() reads the L2-L4 fields of a raw packet in a single pass
+without creating the header objects of :py:class:`Packet
+<ryu.lib.packet.packet.Packet>`.  This is enough for many PacketIn
+handlers, e.g. a learning switch::
+
+    key = flow_key.extract(msg.data, text=True)
+    if key.eth_type == ether_types.ETH_TYPE_LLDP:
+        return
+    self.mac_to_port[dpid][key.eth_src] = in_port
+"""
+
+import collections
+import struct
+
+from ryu.lib import addrconv
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import in_proto
+
+
+class FlowKey(collections.namedtuple('FlowKey', [
+        'eth_dst', 'eth_src', 'vlan_vid', 'eth_type', 'ip_src', 'ip_dst',
+        'ip_proto', 'src_port', 'dst_port'])):
+    """
+    L2-L4 fields of a packet.
+
+    ============== ========================================================
+    Attribute      Description
+    ============== ========================================================
+    eth_dst        Destination MAC address
+    eth_src        Source MAC address
+    vlan_vid       VLAN id of the outermost 802.1Q or 802.1ad tag
+    eth_type       Ethertype following the VLAN tags
+    ip_src         Source IPv4/IPv6 address.
+                   Sender protocol address for ARP.
+    ip_dst         Destination IPv4/IPv6 address.
+                   Target protocol address for ARP.
+    ip_proto       IP protocol number.  The last next header for IPv6.
+                   Opcode for ARP.
+    src_port       Source port of TCP, UDP and SCTP.
+                   Type for ICMP and ICMPv6.
+    dst_port       Destination port of TCP, UDP and SCTP.
+                   Code for ICMP and ICMPv6.
+    ============== ========================================================
+
+    The fields which are not present in the packet are None.
+    """
+    __slots__ = ()
+
+
+_ETHERNET = struct.Struct('!6s6sH')
+_VLAN = struct.Struct('!HH')
+_VLAN_TYPES = (ether_types.ETH_TYPE_8021Q, ether_types.ETH_TYPE_8021AD)
+_VID_MASK = 0x0fff
+# version and header length, flags and fragment offset, protocol,
+# source and destination.
+_IPV4 = struct.Struct('!B5xHxB2x4s4s')
+_IPV4_OFFSET_MASK = 0x1fff
+# next header, source and destination.
+_IPV6 = struct.Struct('!6xB1x16s16s')
+_IPV6_EXT = struct.Struct('!BB')
+_IPV6_EXT_HEADERS = (in_proto.IPPROTO_HOPOPTS, in_proto.IPPROTO_ROUTING,
+                     in_proto.IPPROTO_DSTOPTS, in_proto.IPPROTO_FRAGMENT,
+                     in_proto.IPPROTO_AH)
+_IPV6_FRAG = struct.Struct('!BxH')
+_IPV6_FRAG_OFFSET_MASK = 0xfff8
+# opcode, sender and target protocol addresses of ethernet/ipv4.
+_ARP = struct.Struct('!6xH6x4s6x4s')
+_PORTS = struct.Struct('!HH')
+_PORTS_PROTOS = (in_proto.IPPROTO_TCP, in_proto.IPPROTO_UDP,
+                 in_proto.IPPROTO_SCTP)
+_ICMP = struct.Struct('!BB')
+_ICMP_PROTOS = (in_proto.IPPROTO_ICMP, in_proto.IPPROTO_ICMPV6)
+
+
+def _ipv6_proto(data, offset, nxt):
+    # skips the extension headers.  returns (protocol, offset of the
+    # upper layer header or None for non-first fragments)
+    while nxt in _IPV6_EXT_HEADERS:
+        if nxt == in_proto.IPPROTO_FRAGMENT:
+            nxt, frag = _IPV6_FRAG.unpack_from(data, offset)
+            if frag & _IPV6_FRAG_OFFSET_MASK:
+                return nxt, None
+            offset += 8
+        elif nxt == in_proto.IPPROTO_AH:
+            nxt, len_ = _IPV6_EXT.unpack_from(data, offset)
+            offset += (len_ + 2) * 4
+        else:
+            nxt, len_ = _IPV6_EXT.unpack_from(data, offset)
+            offset += (len_ + 1) * 8
+    return nxt, offset
+
+
+def _to_text(key):
+    if len(key.ip_src or b'') == 16:
+        ip_to_text = addrconv.ipv6.bin_to_text
+    else:
+        ip_to_text = addrconv.ipv4.bin_to_text
+    return key._replace(
+        eth_dst=addrconv.mac.bin_to_text(key.eth_dst),
+        eth_src=addrconv.mac.bin_to_text(key.eth_src),
+        ip_src=key.ip_src and ip_to_text(key.ip_src),
+        ip_dst=key.ip_dst and ip_to_text(key.ip_dst))
+
+
+def extract(data, text=False):
+    """
+    Returns the FlowKey of the ethernet frame *data*.
+
+    The addresses are binary strings, or strings in the text
+    representation if *text* is True.  Returns None if *data* is
+    shorter than an ethernet header.  A truncated upper layer results
+    in None fields.
+    """
+    try:
+        eth_dst, eth_src, eth_type = _ETHERNET.unpack_from(data)
+    except struct.error:
+        return None
+    vlan_vid = ip_src = ip_dst = ip_proto = src_port = dst_port = None
+    offset = _ETHERNET.size
+    try:
+        if eth_type in _VLAN_TYPES:
+            tci, eth_type = _VLAN.unpack_from(data, offset)
+            vlan_vid = tci & _VID_MASK
+            offset += _VLAN.size
+            while eth_type in _VLAN_TYPES:
+                _tci, eth_type = _VLAN.unpack_from(data, offset)
+                offset += _VLAN.size
+
+        if eth_type == ether_types.ETH_TYPE_IP:
+            ver_hlen, frag, proto, src, dst = _IPV4.unpack_from(data, offset)
+            ip_src, ip_dst, ip_proto = src, dst, proto
+            if frag & _IPV4_OFFSET_MASK:
+                # no upper layer header in non-first fragments
+                offset = None
+            else:
+                offset += (ver_hlen & 0xf) * 4
+        elif eth_type == ether_types.ETH_TYPE_IPV6:
+            nxt, src, dst = _IPV6.unpack_from(data, offset)
+            ip_src, ip_dst = src, dst
+            ip_proto, offset = _ipv6_proto(data, offset + _IPV6.size, nxt)
+        elif eth_type == ether_types.ETH_TYPE_ARP:
+            ip_proto, ip_src, ip_dst = _ARP.unpack_from(data, offset)
+            offset = None
+        else:
+            offset = None
+
+        if offset is None:
+            pass
+        elif ip_proto in _PORTS_PROTOS:
+            src_port, dst_port = _PORTS.unpack_from(data, offset)
+        elif ip_proto in _ICMP_PROTOS:
+            src_port, dst_port = _ICMP.unpack_from(data, offset)
+    except struct.error:
+        pass
+
+    key = FlowKey(eth_dst, eth_src, vlan_vid, eth_type, ip_src, ip_dst,
+                  ip_proto, src_port, dst_port)
+    if text:
+        return _to_text(key)
+    return key
@@ -68,6 +68,8 @@ class icmp(packet_base.PacketBase):
     ============== ====================
     """
 
+    __slots__ = ('type', 'code', 'csum', 'data')
+
     _PACK_STR = '!BBH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
     _ICMP_TYPES = {}
@@ -125,6 +127,29 @@ class icmp(packet_base.PacketBase):
     def __len__(self):
         return self._MIN_LEN + len(self.data)
 
+    def serialized_len(self):
+        if not self.data:
+            self.data = echo()
+        return len(self)
+
+    def serialize_into(self, buf, offset, payload, prev):
+        # self.data is echo() for the types without payload classes too
+        # if it was empty.  see serialized_len().
+        if isinstance(self.data, _ICMPv4Payload):
+            data = self.data.serialize()
+        else:
+            assert self.type not in icmp._ICMP_TYPES
+            data = self.data
+        struct.pack_into(icmp._PACK_STR, buf, offset, self.type, self.code,
+                         self.csum)
+        start = offset + icmp._MIN_LEN
+        end = start + len(data)
+        buf[start:end] = data
+
+        if self.csum == 0:
+            self.csum = packet_utils.checksum(memoryview(buf)[offset:end])
+            struct.pack_into('!H', buf, offset + 2, self.csum)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class _ICMPv4Payload(stringify.StringifyMixin):
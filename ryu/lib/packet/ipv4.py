@@ -69,6 +69,10 @@ class ipv4(packet_base.PacketBase):
     ============== ======================================== ==================
     """
 
+    __slots__ = ('version', 'header_length', 'tos', 'total_length',
+                 'identification', 'flags', 'offset', 'ttl', 'proto', 'csum',
+                 'src', 'dst', 'option')
+
     _PACK_STR = '!BBHHHBBH4s4s'
     _MIN_LEN = struct.calcsize(_PACK_STR)
     _TYPE = {
@@ -142,6 +146,30 @@ class ipv4(packet_base.PacketBase):
         struct.pack_into('!H', hdr, 10, self.csum)
         return hdr
 
+    def serialized_len(self):
+        return len(self)
+
+    def serialize_into(self, buf, offset, payload, prev):
+        length = len(self)
+        version = self.version << 4 | self.header_length
+        flags = self.flags << 13 | self.offset
+        if self.total_length == 0:
+            self.total_length = self.header_length * 4 + len(payload)
+        struct.pack_into(ipv4._PACK_STR, buf, offset, version, self.tos,
+                         self.total_length, self.identification, flags,
+                         self.ttl, self.proto, 0,
+                         addrconv.ipv4.text_to_bin(self.src),
+                         addrconv.ipv4.text_to_bin(self.dst))
+
+        if self.option:
+            assert (length - ipv4._MIN_LEN) >= len(self.option)
+            start = offset + ipv4._MIN_LEN
+            buf[start:start + len(self.option)] = self.option
+
+        self.csum = packet_utils.checksum(
+            memoryview(buf)[offset:offset + length])
+        struct.pack_into('!H', buf, offset + 10, self.csum)
+
 
 ipv4.register_packet_type(icmp.icmp, inet.IPPROTO_ICMP)
 ipv4.register_packet_type(igmp.igmp, inet.IPPROTO_IGMP)
@@ -59,6 +59,9 @@ class ipv6(packet_base.PacketBase):
     ============== ======================================== ==================
     """
 
+    __slots__ = ('version', 'traffic_class', 'flow_label', 'payload_length',
+                 'nxt', 'hop_limit', 'src', 'dst', 'ext_hdrs')
+
     _PACK_STR = '!IHBB16s16s'
     _MIN_LEN = struct.calcsize(_PACK_STR)
     _IPV6_EXT_HEADER_TYPE = {}
@@ -137,6 +140,21 @@ class ipv6(packet_base.PacketBase):
             struct.pack_into('!H', hdr, 4, self.payload_length)
         return hdr
 
+    def serialized_len(self):
+        if self.ext_hdrs:
+            return None
+        return self._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        if 0 == self.payload_length:
+            self.payload_length = len(payload)
+        v_tc_flow = (self.version << 28 | self.traffic_class << 20 |
+                     self.flow_label)
+        struct.pack_into(ipv6._PACK_STR, buf, offset, v_tc_flow,
+                         self.payload_length, self.nxt, self.hop_limit,
+                         addrconv.ipv6.text_to_bin(self.src),
+                         addrconv.ipv6.text_to_bin(self.dst))
+
     def __len__(self):
         ext_hdrs_len = 0
         for ext_hdr in self.ext_hdrs:
@@ -197,6 +197,13 @@ class lldp(packet_base.PacketBase):
     def __len__(self):
         return sum(LLDP_TLV_SIZE + tlv.len for tlv in self.tlvs)
 
+    def serialized_len(self):
+        return len(self)
+
+    def serialize_into(self, buf, offset, payload, prev):
+        data = b''.join([tlv.serialize() for tlv in self.tlvs])
+        buf[offset:offset + len(data)] = data
+
 
 @lldp.set_tlv_type(LLDP_TLV_END)
 class End(LLDPBasicTLV):
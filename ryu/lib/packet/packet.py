@@ -51,43 +51,86 @@ class Packet(StringifyMixin):
     The payload is a bytearray.  They are iterated in on-wire order.
 
     *data* should be omitted when encoding a packet.
+
+    If *lazy* is True, the headers are decoded on demand, i.e.
+    get_protocol() and iteration decode *data* only as far as the
+    requested header.  The results are the same as the eager decoding.
     """
 
     # Ignore data field when outputting json representation.
     _base_attributes = ['data']
+    # protocols is a property to decode lazily.
+    _opt_attributes = ['protocols']
 
-    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet):
+    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet,
+                 lazy=False):
         super(Packet, self).__init__()
         self.data = data
+        # (the class of the next header, the rest of data) while data
+        # is not decoded completely.
+        self._unparsed = None
         if protocols is None:
-            self.protocols = []
+            self._protocols = []
         else:
-            self.protocols = protocols
+            self._protocols = protocols
         if self.data:
-            self._parser(parse_cls)
-
-    def _parser(self, cls):
-        rest_data = self.data
-        while cls:
-            # Ignores an empty buffer
-            if not six.binary_type(rest_data).strip(b'\x00'):
-                break
+            self._unparsed = (parse_cls, self.data)
+            if not lazy:
+                self._parser()
+
+    @property
+    def protocols(self):
+        self._parser()
+        return self._protocols
+
+    @protocols.setter
+    def protocols(self, protocols):
+        self._unparsed = None
+        self._protocols = protocols
+
+    def _parser(self):
+        while self._unparsed is not None:
+            self._parse_next()
+
+    def _parse_next(self):
+        cls, rest_data = self._unparsed
+        # Ignores an empty buffer
+        if cls and six.binary_type(rest_data).strip(b'\x00'):
             try:
                 proto, cls, rest_data = cls.parser(rest_data)
             except struct.error:
-                break
-            if proto:
-                self.protocols.append(proto)
+                pass
+            else:
+                if proto:
+                    self._protocols.append(proto)
+                self._unparsed = (cls, rest_data)
+                return
+        self._unparsed = None
         # If rest_data is all padding, we ignore rest_data
         if rest_data and six.binary_type(rest_data).strip(b'\x00'):
-            self.protocols.append(rest_data)
+            self._protocols.append(rest_data)
+
+    def _iter_protocols(self):
+        i = 0
+        while True:
+            while i >= len(self._protocols):
+                if self._unparsed is None:
+                    return
+                self._parse_next()
+            yield self._protocols[i]
+            i += 1
 
     def serialize(self):
         """Encode a packet and store the resulted bytearray in self.data.
 
         This method is legal only when encoding a packet.
+
+        If all the headers support serialized_len(), the packet is
+        encoded into a single preallocated bytearray.
         """
 
+        if self._serialize_into():
+            return
         self.data = bytearray()
         r = self.protocols[::-1]
         for i, p in enumerate(r):
@@ -101,6 +144,52 @@ class Packet(StringifyMixin):
                 data = six.binary_type(p)
             self.data = bytearray(data + self.data)
 
+    def _serialize_into(self):
+        protocols = self.protocols
+        if not protocols:
+            return False
+        # (header length, payload length or None for raw data) from
+        # the inner-most.
+        lens = []
+        rest_len = 0
+        hdrs_len = 0
+        for p in reversed(protocols):
+            serialized_len = getattr(p, 'serialized_len', None)
+            if serialized_len is None:
+                hdr_len = len(p)
+                lens.append((hdr_len, None))
+                rest_len += hdr_len
+            else:
+                hdr_len = serialized_len()
+                if hdr_len is None:
+                    return False
+                lens.append((hdr_len, rest_len))
+                if rest_len < p._MIN_PAYLOAD_LEN:
+                    rest_len = p._MIN_PAYLOAD_LEN
+                rest_len += hdr_len
+            hdrs_len += hdr_len
+
+        buf = bytearray(rest_len)
+        view = memoryview(buf)
+        # The headers are encoded from the inner-most, which ends at
+        # hdrs_len.  The padding follows it.
+        end = hdrs_len
+        i = len(protocols)
+        for hdr_len, payload_len in lens:
+            i -= 1
+            offset = end - hdr_len
+            if payload_len is None:
+                buf[offset:end] = protocols[i]
+            else:
+                protocols[i].serialize_into(
+                    buf, offset, view[end:end + payload_len],
+                    protocols[i - 1] if i else None)
+            end = offset
+        # buf can not be resized while it is exported.
+        view.release()
+        self.data = buf
+        return True
+
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
                       **additional_args):
@@ -140,9 +229,12 @@ class Packet(StringifyMixin):
         """Returns the firstly found protocol that matches to the
         specified protocol.
         """
-        result = self.get_protocols(protocol)
-        if len(result) > 0:
-            return result[0]
+        if isinstance(protocol, packet_base.PacketBase):
+            protocol = protocol.__class__
+        assert issubclass(protocol, packet_base.PacketBase)
+        for p in self._iter_protocols():
+            if isinstance(p, protocol):
+                return p
         return None
 
     def __div__(self, trailer):
@@ -153,7 +245,7 @@ class Packet(StringifyMixin):
         return self.__div__(trailer)
 
     def __iter__(self):
-        return iter(self.protocols)
+        return self._iter_protocols()
 
     def __getitem__(self, idx):
         return self.protocols[idx]
@@ -170,8 +262,9 @@ class Packet(StringifyMixin):
     def __contains__(self, protocol):
         if (inspect.isclass(protocol) and
                 issubclass(protocol, packet_base.PacketBase)):
-            return protocol in [p.__class__ for p in self.protocols]
-        return protocol in self.protocols
+            return any(p.__class__ == protocol
+                       for p in self._iter_protocols())
+        return protocol in self._iter_protocols()
 
     def __str__(self):
         return ', '.join(repr(protocol) for protocol in self.protocols)
@@ -21,8 +21,14 @@ from ryu.lib import stringify
 @six.add_metaclass(abc.ABCMeta)
 class PacketBase(stringify.StringifyMixin):
     """A base class for a protocol (ethernet, ipv4, ...) header."""
+
+    __slots__ = ()
+
     _TYPES = {}
 
+    # The payload is padded with zeros up to this length when encoding.
+    _MIN_PAYLOAD_LEN = 0
+
     @classmethod
     def get_packet_type(cls, type_):
         """Per-protocol dict-like get method.
@@ -86,3 +92,31 @@ class PacketBase(stringify.StringifyMixin):
         For example, *prev* is ipv4 or ipv6 for tcp.serialize.
         """
         pass
+
+    def serialized_len(self):
+        """Returns the length of the encoded header.
+
+        This method is used only when encoding a packet.
+
+        A subclass which returns the length can be encoded by
+        serialize_into(), which lets Packet.serialize encode the whole
+        packet into a single preallocated buffer.  The default
+        implementation returns None, i.e. the header is encoded by
+        serialize().
+        """
+        return None
+
+    def serialize_into(self, buf, offset, payload, prev):
+        """Encode a protocol header into bytearray *buf* at *offset*.
+
+        This method is used only when encoding a packet and only if
+        serialized_len() returns the length of the header.
+
+        *payload* is a memoryview of the rest of the packet, which is
+        already encoded in *buf* immediately after the header.
+        *prev* is the same as serialize().
+
+        The default implementation copies the result of serialize().
+        """
+        hdr = self.serialize(payload, prev)
+        buf[offset:offset + len(hdr)] = hdr
@@ -13,10 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import array
 import six
-import socket
 import struct
+
 from ryu.lib import addrconv
 
 
@@ -25,15 +24,78 @@ def carry_around_add(a, b):
     return (c & 0xffff) + (c >> 16)
 
 
-def checksum(data):
-    data = six.binary_type(data)    # input can be bytearray.
+def _sum16(data):
+    # the 16 bit words of data as a big integer.  the ones' complement
+    # sum of the words is congruent with it modulo 0xffff, which lets
+    # int.from_bytes do the summation.  data can be bytes, bytearray or
+    # memoryview and is not copied to another bytes.
+    s = int.from_bytes(data, 'big')
     if len(data) % 2:
-        data += b'\x00'
+        # pads the last byte with zero
+        s <<= 8
+    return s
+
+
+def _fold(s):
+    # ones' complement of the ones' complement sum congruent with s.
+    # a sum of non-zero words is never +0 (0x0000) but -0 (0xffff).
+    r = s % 0xffff
+    if r == 0 and s:
+        r = 0xffff
+    return ~r & 0xffff
+
+
+def _to_bytes(data):
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = six.binary_type(data)
+    return data
+
+
+def checksum(data):
+    """
+    calculate the Internet checksum (RFC1071) of data
+
+    data can be bytes, bytearray or memoryview.
+    """
+    return _fold(_sum16(_to_bytes(data)))
+
 
-    s = sum(array.array('H', data))
-    s = (s & 0xffff) + (s >> 16)
-    s += (s >> 16)
-    return socket.ntohs(~s & 0xffff)
+def checksum_batch(buffers):
+    """
+    calculate the Internet checksums of buffers
+
+    This is the same as [checksum(buf) for buf in buffers].
+    """
+    return [_fold(_sum16(_to_bytes(buf))) for buf in buffers]
+
+
+def _word_sum(value):
+    # value is a 16 bit word or a binary string of 16 bit words
+    if isinstance(value, six.integer_types):
+        return value
+    return _sum16(_to_bytes(value))
+
+
+def checksum_update(csum, old, new):
+    """
+    incrementally update the Internet checksum csum (RFC1624)
+
+    old and new are the old and the new values of the modified field,
+    which are 16 bit words or binary strings of the same even length
+    aligned with 16 bit words in the checksummed data.  For example,
+    when decrementing TTL of an IPv4 header::
+
+        ip.csum = checksum_update(ip.csum, ip.ttl << 8 | ip.proto,
+                                  (ip.ttl - 1) << 8 | ip.proto)
+
+    The result is the same as computing the checksum of the whole
+    modified data with checksum().
+    """
+    # HC' = ~(~HC + ~m + m') of RFC1624 Eqn. 3, where ~m is congruent
+    # with -m modulo 0xffff.  the sum of the checksummed data is never
+    # +0 as the data are not all zeros.
+    s = ((~csum & 0xffff) - _word_sum(old) + _word_sum(new)) % 0xffff
+    return ~(s or 0xffff) & 0xffff
 
 
 # avoid circular import
@@ -96,8 +158,8 @@ def checksum_ip(ipvx, length, payload):
     else:
         raise ValueError('Unknown IP version %d' % ipvx.version)
 
-    buf = header + payload
-    return checksum(buf)
+    # the header is 16 bit aligned.  sums the payload without copying.
+    return _fold(_sum16(header) + _sum16(_to_bytes(payload)))
 
 
 _MODX = 4102
@@ -77,6 +77,9 @@ class tcp(packet_base.PacketBase):
     ============== ====================
     """
 
+    __slots__ = ('src_port', 'dst_port', 'seq', 'ack', 'offset', 'bits',
+                 'window_size', 'csum', 'urgent', 'option')
+
     _PACK_STR = '!HHIIBBHHH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
 
@@ -189,6 +192,24 @@ class tcp(packet_base.PacketBase):
             struct.pack_into('!H', h, 16, self.csum)
         return six.binary_type(h)
 
+    def serialized_len(self):
+        if self.option:
+            return None
+        return tcp._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        if self.offset == 0:
+            self.offset = tcp._MIN_LEN >> 2
+        struct.pack_into(tcp._PACK_STR, buf, offset, self.src_port,
+                         self.dst_port, self.seq, self.ack, self.offset << 4,
+                         self.bits, self.window_size, self.csum, self.urgent)
+        if self.csum == 0:
+            total_length = tcp._MIN_LEN + len(payload)
+            self.csum = packet_utils.checksum_ip(
+                prev, total_length,
+                memoryview(buf)[offset:offset + total_length])
+            struct.pack_into('!H', buf, offset + 16, self.csum)
+
 
 class TCPOption(stringify.StringifyMixin):
     _KINDS = {}
@@ -42,6 +42,8 @@ class udp(packet_base.PacketBase):
     ============== ====================
     """
 
+    __slots__ = ('src_port', 'dst_port', 'total_length', 'csum')
+
     _PACK_STR = '!HHHH'
     _MIN_LEN = struct.calcsize(_PACK_STR)
 
@@ -85,3 +87,17 @@ class udp(packet_base.PacketBase):
             h = struct.pack(udp._PACK_STR, self.src_port, self.dst_port,
                             self.total_length, self.csum)
         return h
+
+    def serialized_len(self):
+        return udp._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        if self.total_length == 0:
+            self.total_length = udp._MIN_LEN + len(payload)
+        struct.pack_into(udp._PACK_STR, buf, offset, self.src_port,
+                         self.dst_port, self.total_length, self.csum)
+        if self.csum == 0:
+            self.csum = packet_utils.checksum_ip(
+                prev, self.total_length,
+                memoryview(buf)[offset:offset + udp._MIN_LEN + len(payload)])
+            struct.pack_into('!H', buf, offset + 6, self.csum)
@@ -30,6 +30,8 @@ from . import ether_types as ether
 
 @six.add_metaclass(abc.ABCMeta)
 class _vlan(packet_base.PacketBase):
+    __slots__ = ('pcp', 'cfi', 'vid', 'ethertype')
+
     _PACK_STR = "!HH"
     _MIN_LEN = struct.calcsize(_PACK_STR)
 
@@ -54,6 +56,13 @@ class _vlan(packet_base.PacketBase):
         tci = self.pcp << 13 | self.cfi << 12 | self.vid
         return struct.pack(vlan._PACK_STR, tci, self.ethertype)
 
+    def serialized_len(self):
+        return vlan._MIN_LEN
+
+    def serialize_into(self, buf, offset, payload, prev):
+        tci = self.pcp << 13 | self.cfi << 12 | self.vid
+        struct.pack_into(vlan._PACK_STR, buf, offset, tci, self.ethertype)
+
 
 class vlan(_vlan):
     """VLAN (IEEE 802.1Q) header encoder/decoder class.
@@ -72,6 +81,8 @@ class vlan(_vlan):
     ============== ====================
     """
 
+    __slots__ = ()
+
     def __init__(self, pcp=0, cfi=0, vid=0, ethertype=ether.ETH_TYPE_IP):
         super(vlan, self).__init__(pcp, cfi, vid, ethertype)
 
@@ -110,6 +121,8 @@ class svlan(_vlan):
     ============== ====================
     """
 
+    __slots__ = ()
+
     def __init__(self, pcp=0, cfi=0, vid=0, ethertype=ether.ETH_TYPE_8021Q):
         super(svlan, self).__init__(pcp, cfi, vid, ethertype)
 
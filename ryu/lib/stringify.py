@@ -18,6 +18,7 @@ from __future__ import print_function
 
 import base64
 import inspect
+import types
 
 import six
 
@@ -153,6 +154,10 @@ class StringifyMixin(object):
     # Then, please specify the attributes into this list.
     _opt_attributes = []
 
+    # Sub classes may define __slots__ for compact instances.
+    # The slots are included in the str and json representations.
+    __slots__ = ()
+
     def stringify_attrs(self):
         """an override point for sub classes"""
         return obj_python_attrs(self)
@@ -379,6 +384,9 @@ def obj_python_attrs(msg_):
     base = getattr(msg_, '_base_attributes', [])
     opt = getattr(msg_, '_opt_attributes', [])
     for k, v in inspect.getmembers(msg_):
+        if isinstance(v, types.MemberDescriptorType):
+            # an unset slot
+            continue
         if k in opt:
             pass
         elif k.startswith('_'):
@@ -387,11 +395,15 @@ def obj_python_attrs(msg_):
             continue
         elif k in base:
             continue
-        elif hasattr(msg_.__class__, k):
+        elif hasattr(msg_.__class__, k) and not _is_slot(msg_.__class__, k):
             continue
         yield (k, v)
 
 
+def _is_slot(cls, k):
+    return isinstance(getattr(cls, k, None), types.MemberDescriptorType)
+
+
 def obj_attrs(msg_):
     """similar to obj_python_attrs() but deals with python reserved keywords
     """
@@ -38,12 +38,84 @@ if six.PY3:
 def header(buf):
     assert len(buf) >= ofproto_common.OFP_HEADER_SIZE
     # LOG.debug('len %d bufsize %d', len(buf), ofproto.OFP_HEADER_SIZE)
-    return struct.unpack_from(ofproto_common.OFP_HEADER_PACK_STR,
-                              six.binary_type(buf))
+    return struct.unpack_from(ofproto_common.OFP_HEADER_PACK_STR, buf)
 
 
 _MSG_PARSERS = {}
 
+_lazy_decoding = False
+
+
+def enable_lazy_decoding():
+    """
+    Make the parsers which support it defer decoding the costly parts of
+    messages, e.g. matches, instructions and multipart reply bodies,
+    until they are accessed.  Errors in those parts are then raised on
+    access instead of being logged by msg().
+    """
+    global _lazy_decoding
+    _lazy_decoding = True
+
+
+def disable_lazy_decoding():
+    global _lazy_decoding
+    _lazy_decoding = False
+
+
+def is_lazy_decoding():
+    return _lazy_decoding
+
+
+class LazyAttribute(object):
+    """
+    A descriptor of an attribute which is decoded on first access.
+
+    The value is cached in the instance dict, which takes precedence
+    over the descriptor afterwards.  An attribute assigned as usual,
+    e.g. by __init__(), is never decoded.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        decoders = obj.__dict__.get('_lazy_decoders', {})
+        try:
+            decode = decoders[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        # The decoder is kept until it succeeds, so that every access
+        # to a malformed attribute raises the parse error.
+        value = obj.__dict__[self.name] = decode()
+        del decoders[self.name]
+        return value
+
+
+def lazy_attributes(*names):
+    """
+    A class decorator declaring the attributes which the parser may
+    decode lazily with set_lazy().
+    """
+    def _lazy_attributes(cls):
+        for name in names:
+            setattr(cls, name, LazyAttribute(name))
+        # Attributes of the class are hidden from stringify otherwise.
+        cls._opt_attributes = list(cls._opt_attributes) + list(names)
+        return cls
+    return _lazy_attributes
+
+
+def set_lazy(obj, name, decode, *args):
+    """
+    Make decode(*args) compute the attribute name of obj, which must
+    have been declared with lazy_attributes(), on first access.
+    """
+    obj.__dict__.pop(name, None)
+    obj.__dict__.setdefault('_lazy_decoders', {})[name] = \
+        functools.partial(decode, *args)
+
 
 def register_msg_parser(version):
     def register(msg_parser):
@@ -176,6 +248,7 @@ def ofp_instruction_from_jsondict(dp, jsonlist, encap=True):
 
 
 class StringifyMixin(stringify.StringifyMixin):
+    __slots__ = ()
     _class_prefixes = ["OFP", "ONF", "MT", "NX"]
 
     @classmethod
@@ -0,0 +1,247 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pre-serialized OpenFlow messages.
+
+Applications often send a message per PacketIn which differs from the
+previous one only in a port, an address or the xid.  MsgTemplate
+serializes such a message once and produces the wire bytes of its
+variants by patching fields in a copy of the buffer.
+
+Example::
+
+    match = parser.OFPMatch(in_port=1, eth_dst='00:00:00:00:00:00')
+    actions = [parser.OFPActionOutput(1)]
+    inst = [parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS,
+                                         actions)]
+    self.flow_tmpl = ofproto_template.MsgTemplate(
+        parser.OFPFlowMod(datapath, priority=1, match=match,
+                          instructions=inst))
+
+    # for each PacketIn
+    self.flow_tmpl.send(datapath, in_port=in_port, eth_dst=dst,
+                        output=out_port)
+
+The fields which can be patched are:
+
+=========== ==========================================================
+Name        Description
+=========== ==========================================================
+xid         Transaction id
+(body)      Fields of the fixed part of the message.
+            buffer_id, cookie, priority, idle_timeout, etc. for
+            OFPFlowMod and buffer_id, in_port for OFPPacketOut.
+(match)     Fields of the match, e.g. in_port, eth_dst, ipv4_src.
+            A value has the same format as an OFPMatch keyword
+            argument and must encode to the same length, i.e. with
+            a mask if and only if the template has one.
+output      Port of the OFPActionOutput of the message.  Only
+            available when the message has exactly one.
+data        Packet data of OFPPacketOut.
+=========== ==========================================================
+
+OFPFlowMod and OFPPacketOut of OpenFlow 1.2 or later are supported.
+"""
+
+import functools
+import re
+import struct
+
+from ryu import utils
+
+
+_HDR_XID = struct.Struct('!I')
+_HDR_XID_OFFSET = 4
+_HDR_LENGTH = struct.Struct('!H')
+_HDR_LENGTH_OFFSET = 2
+_TLV_HDR = struct.Struct('!HH')
+_ACTION_OUTPUT_PORT = struct.Struct('!I')
+_ACTION_OUTPUT_PORT_OFFSET = 4
+
+# names of the fields of fixed parts of messages in the order of
+# their pack strings.
+_FLOW_MOD_FIELDS = ['cookie', 'cookie_mask', 'table_id', 'command',
+                    'idle_timeout', 'hard_timeout', 'priority',
+                    'buffer_id', 'out_port', 'out_group', 'flags',
+                    'importance']
+_PACKET_OUT_FIELDS = ['buffer_id', 'in_port', 'actions_len']
+_PACKET_OUT_0_FIELDS = ['buffer_id', 'actions_len']
+
+
+def _fixed_fields(pack_str, names, offset, end):
+    fields = {}
+    names = iter(names)
+    for code in re.findall(r'\d*[a-zA-Z?]', pack_str):
+        if offset >= end:
+            break
+        size = struct.calcsize('!' + code)
+        if not code.endswith('x'):
+            name = next(names, None)
+            if name is None:
+                break
+            fields[name] = (offset, struct.Struct('!' + code))
+        offset += size
+    return fields
+
+
+def _action_lists(ofproto, buf, offset, end):
+    # returns (offset, length) of the action lists of instructions.
+    lists = []
+    while offset < end:
+        type_, len_ = _TLV_HDR.unpack_from(buf, offset)
+        if type_ in (ofproto.OFPIT_WRITE_ACTIONS,
+                     ofproto.OFPIT_APPLY_ACTIONS):
+            lists.append((offset + ofproto.OFP_INSTRUCTION_ACTIONS_SIZE,
+                          len_ - ofproto.OFP_INSTRUCTION_ACTIONS_SIZE))
+        offset += len_
+    return lists
+
+
+def _match_end(buf, offset):
+    _type, length = _TLV_HDR.unpack_from(buf, offset)
+    return offset + utils.round_up(length, 8)
+
+
+def _flow_mod_layout(ofproto, buf):
+    match_offset = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_MATCH_SIZE
+    fixed = _fixed_fields(ofproto.OFP_FLOW_MOD_PACK_STR, _FLOW_MOD_FIELDS,
+                          ofproto.OFP_HEADER_SIZE, match_offset)
+    actions = _action_lists(ofproto, buf, _match_end(buf, match_offset),
+                            len(buf))
+    return fixed, match_offset, actions, None
+
+
+def _packet_out_layout(ofproto, buf):
+    if hasattr(ofproto, 'OFP_PACKET_OUT_0_PACK_STR'):
+        # OpenFlow 1.5 or later
+        match_offset = ofproto.OFP_PACKET_OUT_0_SIZE
+        fixed = _fixed_fields(ofproto.OFP_PACKET_OUT_0_PACK_STR,
+                              _PACKET_OUT_0_FIELDS,
+                              ofproto.OFP_HEADER_SIZE, match_offset)
+        actions_offset = _match_end(buf, match_offset)
+    else:
+        match_offset = None
+        fixed = _fixed_fields(ofproto.OFP_PACKET_OUT_PACK_STR,
+                              _PACKET_OUT_FIELDS, ofproto.OFP_HEADER_SIZE,
+                              ofproto.OFP_PACKET_OUT_SIZE)
+        actions_offset = ofproto.OFP_PACKET_OUT_SIZE
+    # actions_len must be consistent with the actions.
+    offset, fmt_struct = fixed.pop('actions_len')
+    (actions_len, ) = fmt_struct.unpack_from(buf, offset)
+    actions = [(actions_offset, actions_len)]
+    return fixed, match_offset, actions, actions_offset + actions_len
+
+
+_LAYOUTS = {
+    'OFPFlowMod': _flow_mod_layout,
+    'OFPPacketOut': _packet_out_layout,
+}
+
+
+def _patch_struct(fmt_struct, offset, buf, value):
+    fmt_struct.pack_into(buf, offset, value)
+
+
+def _patch_oxm(ofproto, name, offset, length, buf, value):
+    if ofproto.oxm_serialize_user(name, value, buf, offset) != length:
+        raise ValueError('%s=%r does not fit the template' % (name, value))
+
+
+class MsgTemplate(object):
+    """
+    A serialized OpenFlow message whose fields can be patched.
+
+    msg is serialized when the template is created.  Its xid is
+    ignored.
+    """
+
+    def __init__(self, msg):
+        try:
+            layout = _LAYOUTS[msg.__class__.__name__]
+        except KeyError:
+            raise ValueError('no template support for %s' %
+                             msg.__class__.__name__)
+        ofproto = msg.datapath.ofproto
+        if ofproto.OFP_VERSION < 0x03:
+            raise ValueError('no template support for OpenFlow 0x%02x' %
+                             ofproto.OFP_VERSION)
+        msg.serialize()
+        self.buf = bytes(msg.buf)
+
+        fixed, match_offset, action_lists, data_offset = layout(
+            ofproto, self.buf)
+        fields = {}
+        for name, (offset, fmt_struct) in fixed.items():
+            fields[name] = functools.partial(_patch_struct, fmt_struct,
+                                             offset)
+        if match_offset is not None:
+            _type, match_len = _TLV_HDR.unpack_from(self.buf, match_offset)
+            offset = match_offset + _TLV_HDR.size
+            while offset < match_offset + match_len:
+                name, _value, length = ofproto.oxm_parse_user(self.buf,
+                                                              offset)
+                fields[name] = functools.partial(_patch_oxm, ofproto, name,
+                                                 offset, length)
+                offset += length
+        outputs = []
+        for offset, length in action_lists:
+            end = offset + length
+            while offset < end:
+                type_, len_ = _TLV_HDR.unpack_from(self.buf, offset)
+                if type_ == ofproto.OFPAT_OUTPUT:
+                    outputs.append(offset + _ACTION_OUTPUT_PORT_OFFSET)
+                offset += len_
+        if len(outputs) == 1:
+            fields['output'] = functools.partial(
+                _patch_struct, _ACTION_OUTPUT_PORT, outputs[0])
+        self._fields = fields
+        self._data_offset = data_offset
+
+    @property
+    def fields(self):
+        """
+        Names of the fields which can be patched, besides xid and data.
+        """
+        return sorted(self._fields)
+
+    def render(self, xid=0, data=None, **values):
+        """
+        Returns the wire bytes of the message with the given fields
+        patched as a bytearray.
+        """
+        if data is None:
+            buf = bytearray(self.buf)
+        else:
+            if self._data_offset is None:
+                raise ValueError('the message has no data')
+            buf = bytearray(self.buf[:self._data_offset])
+            buf += data
+            _HDR_LENGTH.pack_into(buf, _HDR_LENGTH_OFFSET, len(buf))
+        _HDR_XID.pack_into(buf, _HDR_XID_OFFSET, xid)
+        for name, value in values.items():
+            try:
+                patch = self._fields[name]
+            except KeyError:
+                raise ValueError('unknown field for the template: %s' % name)
+            patch(buf, value)
+        return buf
+
+    def send(self, datapath, data=None, **values):
+        """
+        Render the message with an xid generated by datapath and queue
+        it to send.  Returns the xid.
+        """
+        xid = datapath.next_xid()
+        datapath.send(self.render(xid, data, **values))
+        return xid
@@ -94,6 +94,22 @@ def msg_parser(datapath, version, msg_type, msg_len, xid, buf):
     return parser(datapath, version, msg_type, msg_len, xid, buf)
 
 
+def _match_length(buf, offset):
+    # The length of the ofp_match at offset, without decoding it.
+    (_type, length) = struct.unpack_from('!HH', buf, offset)
+    return length
+
+
+def _parser_instructions(buf, offset, inst_length):
+    instructions = []
+    while inst_length > 0:
+        inst = OFPInstruction.parser(buf, offset)
+        instructions.append(inst)
+        offset += inst.len
+        inst_length -= inst.len
+    return instructions
+
+
 @_register_parser
 @_set_msg_type(ofproto.OFPT_HELLO)
 class OFPHello(MsgBase):
@@ -876,8 +892,6 @@ class OFPMatch(StringifyMixin):
         define.
         """
         super(OFPMatch, self).__init__()
-        self._wc = FlowWildcards()
-        self._flow = Flow()
         self.fields = []
         self.type = ofproto.OFPMT_OXM
         self.length = length
@@ -1035,9 +1049,20 @@ class OFPMatch(StringifyMixin):
         """
         self.fields.append(OFPMatchField.make(header, value, mask))
 
+    def __getattr__(self, name):
+        # The objects for the old API are created on first use.
+        if name == '_wc':
+            self._wc = FlowWildcards()
+            return self._wc
+        if name == '_flow':
+            self._flow = Flow()
+            return self._flow
+        raise AttributeError(name)
+
     def _composed_with_old_api(self):
         return (self.fields and not self._fields2) or \
-            self._wc.__dict__ != FlowWildcards().__dict__
+            ('_wc' in self.__dict__ and
+             self._wc.__dict__ != FlowWildcards().__dict__)
 
     def serialize(self, buf, offset):
         """
@@ -1049,14 +1074,11 @@ class OFPMatch(StringifyMixin):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
         hdr_pack_str = '!HH'
         field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+        for (k, uv) in self._fields2:
+            field_offset += ofproto.oxm_serialize_user(k, uv, buf,
+                                                       field_offset)
 
         length = field_offset - offset
         msg_pack_into(hdr_pack_str, buf, offset,
@@ -1328,8 +1350,7 @@ class OFPMatch(StringifyMixin):
         fields = []
         try:
             while length > 0:
-                n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-                k, uv = ofproto.oxm_to_user(n, value, mask)
+                k, uv, field_len = ofproto.oxm_parse_user(buf, offset)
                 fields.append((k, uv))
                 offset += field_len
                 length -= field_len
@@ -1708,6 +1729,7 @@ class OFPPropCommonExperimenter4ByteData(StringifyMixin):
 
 
 class OFPMatchField(StringifyMixin):
+    __slots__ = ('header', 'n_bytes', 'length', 'value', 'mask')
     _FIELDS_HEADERS = {}
 
     @staticmethod
@@ -1823,6 +1845,7 @@ class OFPMatchField(StringifyMixin):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IN_PORT])
 class MTInPort(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -1833,6 +1856,7 @@ class MTInPort(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_METADATA,
                                       ofproto.OXM_OF_METADATA_W])
 class MTMetadata(OFPMatchField):
+    __slots__ = ()
     pack_str = '!Q'
 
     def __init__(self, header, value, mask=None):
@@ -1843,6 +1867,7 @@ class MTMetadata(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IN_PHY_PORT])
 class MTInPhyPort(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -1853,6 +1878,7 @@ class MTInPhyPort(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ETH_DST,
                                       ofproto.OXM_OF_ETH_DST_W])
 class MTEthDst(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -1864,6 +1890,7 @@ class MTEthDst(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ETH_SRC,
                                       ofproto.OXM_OF_ETH_SRC_W])
 class MTEthSrc(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -1874,6 +1901,7 @@ class MTEthSrc(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ETH_TYPE])
 class MTEthType(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1884,6 +1912,7 @@ class MTEthType(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_VLAN_VID,
                                       ofproto.OXM_OF_VLAN_VID_W])
 class MTVlanVid(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1900,6 +1929,7 @@ class MTVlanVid(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_VLAN_PCP])
 class MTVlanPcp(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -1909,6 +1939,7 @@ class MTVlanPcp(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IP_DSCP])
 class MTIPDscp(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -1918,6 +1949,7 @@ class MTIPDscp(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IP_ECN])
 class MTIPECN(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -1927,6 +1959,7 @@ class MTIPECN(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IP_PROTO])
 class MTIPProto(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -1937,6 +1970,7 @@ class MTIPProto(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV4_SRC,
                                       ofproto.OXM_OF_IPV4_SRC_W])
 class MTIPV4Src(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -1948,6 +1982,7 @@ class MTIPV4Src(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV4_DST,
                                       ofproto.OXM_OF_IPV4_DST_W])
 class MTIPV4Dst(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -1958,6 +1993,7 @@ class MTIPV4Dst(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_TCP_SRC])
 class MTTCPSrc(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1967,6 +2003,7 @@ class MTTCPSrc(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_TCP_DST])
 class MTTCPDst(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1976,6 +2013,7 @@ class MTTCPDst(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_UDP_SRC])
 class MTUDPSrc(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1985,6 +2023,7 @@ class MTUDPSrc(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_UDP_DST])
 class MTUDPDst(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -1994,6 +2033,7 @@ class MTUDPDst(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_SCTP_SRC])
 class MTSCTPSrc(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -2003,6 +2043,7 @@ class MTSCTPSrc(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_SCTP_DST])
 class MTSCTPDst(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -2012,6 +2053,7 @@ class MTSCTPDst(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ICMPV4_TYPE])
 class MTICMPV4Type(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2021,6 +2063,7 @@ class MTICMPV4Type(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ICMPV4_CODE])
 class MTICMPV4Code(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2030,6 +2073,7 @@ class MTICMPV4Code(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ARP_OP])
 class MTArpOp(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -2040,6 +2084,7 @@ class MTArpOp(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ARP_SPA,
                                       ofproto.OXM_OF_ARP_SPA_W])
 class MTArpSpa(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -2051,6 +2096,7 @@ class MTArpSpa(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ARP_TPA,
                                       ofproto.OXM_OF_ARP_TPA_W])
 class MTArpTpa(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -2062,6 +2108,7 @@ class MTArpTpa(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ARP_SHA,
                                       ofproto.OXM_OF_ARP_SHA_W])
 class MTArpSha(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -2073,6 +2120,7 @@ class MTArpSha(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ARP_THA,
                                       ofproto.OXM_OF_ARP_THA_W])
 class MTArpTha(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -2082,6 +2130,8 @@ class MTArpTha(OFPMatchField):
 
 
 class MTIPv6(StringifyMixin):
+    __slots__ = ()
+
     @classmethod
     def field_parser(cls, header, buf, offset):
         if ofproto.oxm_tlv_header_extract_hasmask(header):
@@ -2099,6 +2149,7 @@ class MTIPv6(StringifyMixin):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_SRC,
                                       ofproto.OXM_OF_IPV6_SRC_W])
 class MTIPv6Src(MTIPv6, OFPMatchField):
+    __slots__ = ()
     pack_str = '!8H'
 
     def __init__(self, header, value, mask=None):
@@ -2110,6 +2161,7 @@ class MTIPv6Src(MTIPv6, OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_DST,
                                       ofproto.OXM_OF_IPV6_DST_W])
 class MTIPv6Dst(MTIPv6, OFPMatchField):
+    __slots__ = ()
     pack_str = '!8H'
 
     def __init__(self, header, value, mask=None):
@@ -2121,6 +2173,7 @@ class MTIPv6Dst(MTIPv6, OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_FLABEL,
                                       ofproto.OXM_OF_IPV6_FLABEL_W])
 class MTIPv6Flabel(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -2131,6 +2184,7 @@ class MTIPv6Flabel(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_MPLS_LABEL])
 class MTMplsLabel(OFPMatchField):
+    __slots__ = ()
     pack_str = '!I'
 
     def __init__(self, header, value, mask=None):
@@ -2140,6 +2194,7 @@ class MTMplsLabel(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ICMPV6_TYPE])
 class MTICMPV6Type(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2149,6 +2204,7 @@ class MTICMPV6Type(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_ICMPV6_CODE])
 class MTICMPV6Code(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2158,6 +2214,7 @@ class MTICMPV6Code(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_ND_TARGET])
 class MTIPv6NdTarget(MTIPv6, OFPMatchField):
+    __slots__ = ()
     pack_str = '!8H'
 
     def __init__(self, header, value, mask=None):
@@ -2170,6 +2227,7 @@ class MTIPv6NdTarget(MTIPv6, OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_ND_SLL])
 class MTIPv6NdSll(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -2179,6 +2237,7 @@ class MTIPv6NdSll(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_ND_TLL])
 class MTIPv6NdTll(OFPMatchField):
+    __slots__ = ()
     pack_str = '!6s'
 
     def __init__(self, header, value, mask=None):
@@ -2188,6 +2247,7 @@ class MTIPv6NdTll(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_MPLS_TC])
 class MTMplsTc(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2197,6 +2257,7 @@ class MTMplsTc(OFPMatchField):
 
 @OFPMatchField.register_field_header([ofproto.OXM_OF_MPLS_BOS])
 class MTMplsBos(OFPMatchField):
+    __slots__ = ()
     pack_str = '!B'
 
     def __init__(self, header, value, mask=None):
@@ -2207,6 +2268,7 @@ class MTMplsBos(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_PBB_ISID,
                                       ofproto.OXM_OF_PBB_ISID_W])
 class MTPbbIsid(OFPMatchField):
+    __slots__ = ()
     pack_str = '!3B'
 
     def __init__(self, header, value, mask=None):
@@ -2239,6 +2301,7 @@ class MTPbbIsid(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_TUNNEL_ID,
                                       ofproto.OXM_OF_TUNNEL_ID_W])
 class MTTunnelId(OFPMatchField):
+    __slots__ = ()
     pack_str = '!Q'
 
     def __init__(self, header, value, mask=None):
@@ -2250,6 +2313,7 @@ class MTTunnelId(OFPMatchField):
 @OFPMatchField.register_field_header([ofproto.OXM_OF_IPV6_EXTHDR,
                                       ofproto.OXM_OF_IPV6_EXTHDR_W])
 class MTIPv6ExtHdr(OFPMatchField):
+    __slots__ = ()
     pack_str = '!H'
 
     def __init__(self, header, value, mask=None):
@@ -2260,6 +2324,7 @@ class MTIPv6ExtHdr(OFPMatchField):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_PACKET_IN)
+@ofproto_parser.lazy_attributes('match')
 class OFPPacketIn(MsgBase):
     """
     Packet-In message
@@ -2328,10 +2393,14 @@ class OFPPacketIn(MsgBase):
             ofproto.OFP_PACKET_IN_PACK_STR,
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
-                                    ofproto.OFP_MATCH_SIZE)
-
-        match_len = utils.round_up(msg.match.length, 8)
+        offset = ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+            match_len = utils.round_up(_match_length(msg.buf, offset), 8)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
+            match_len = utils.round_up(msg.match.length, 8)
         msg.data = msg.buf[(ofproto.OFP_PACKET_IN_SIZE -
                             ofproto.OFP_MATCH_SIZE + match_len + 2):]
 
@@ -2344,6 +2413,7 @@ class OFPPacketIn(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_FLOW_REMOVED)
+@ofproto_parser.lazy_attributes('match')
 class OFPFlowRemoved(MsgBase):
     """
     Flow removed message
@@ -2434,7 +2504,11 @@ class OFPFlowRemoved(MsgBase):
         offset = (ofproto.OFP_FLOW_REMOVED_SIZE -
                   ofproto.OFP_MATCH_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, offset)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
 
         return msg
 
@@ -2984,6 +3058,8 @@ class OFPInstructionMeter(OFPInstruction):
 
 
 class OFPActionHeader(StringifyMixin):
+    __slots__ = ('type', 'len')
+
     def __init__(self, type_, len_):
         self.type = type_
         self.len = len_
@@ -2994,6 +3070,7 @@ class OFPActionHeader(StringifyMixin):
 
 
 class OFPAction(OFPActionHeader):
+    __slots__ = ()
     _ACTION_TYPES = {}
 
     @staticmethod
@@ -3035,6 +3112,8 @@ class OFPActionOutput(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('port', 'max_len')
+
     def __init__(self, port, max_len=ofproto.OFPCML_MAX,
                  type_=None, len_=None):
         super(OFPActionOutput, self).__init__()
@@ -3067,6 +3146,8 @@ class OFPActionGroup(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('group_id', )
+
     def __init__(self, group_id=0, type_=None, len_=None):
         super(OFPActionGroup, self).__init__()
         self.group_id = group_id
@@ -3098,6 +3179,8 @@ class OFPActionSetQueue(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('queue_id', )
+
     def __init__(self, queue_id, type_=None, len_=None):
         super(OFPActionSetQueue, self).__init__()
         self.queue_id = queue_id
@@ -3128,6 +3211,8 @@ class OFPActionSetMplsTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('mpls_ttl', )
+
     def __init__(self, mpls_ttl, type_=None, len_=None):
         super(OFPActionSetMplsTtl, self).__init__()
         self.mpls_ttl = mpls_ttl
@@ -3152,6 +3237,8 @@ class OFPActionDecMplsTtl(OFPAction):
     This action decrements the MPLS TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecMplsTtl, self).__init__()
 
@@ -3177,6 +3264,8 @@ class OFPActionSetNwTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('nw_ttl', )
+
     def __init__(self, nw_ttl, type_=None, len_=None):
         super(OFPActionSetNwTtl, self).__init__()
         self.nw_ttl = nw_ttl
@@ -3201,6 +3290,8 @@ class OFPActionDecNwTtl(OFPAction):
     This action decrements the IP TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecNwTtl, self).__init__()
 
@@ -3221,6 +3312,8 @@ class OFPActionCopyTtlOut(OFPAction):
     the outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlOut, self).__init__()
 
@@ -3241,6 +3334,8 @@ class OFPActionCopyTtlIn(OFPAction):
     next-to-outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlIn, self).__init__()
 
@@ -3266,6 +3361,8 @@ class OFPActionPushVlan(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_8021Q, type_=None, len_=None):
         super(OFPActionPushVlan, self).__init__()
         self.ethertype = ethertype
@@ -3296,6 +3393,8 @@ class OFPActionPushMpls(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_MPLS, type_=None, len_=None):
         super(OFPActionPushMpls, self).__init__()
         self.ethertype = ethertype
@@ -3320,6 +3419,8 @@ class OFPActionPopVlan(OFPAction):
     This action pops the outermost VLAN tag from the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopVlan, self).__init__()
 
@@ -3339,6 +3440,8 @@ class OFPActionPopMpls(OFPAction):
     This action pops the MPLS header from the packet.
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_IP, type_=None, len_=None):
         super(OFPActionPopMpls, self).__init__()
         self.ethertype = ethertype
@@ -3393,8 +3496,7 @@ class OFPActionSetField(OFPAction):
     def parser(cls, buf, offset):
         (type_, len_) = struct.unpack_from(
             ofproto.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
-        (n, value, mask, _len) = ofproto.oxm_parse(buf, offset + 4)
-        k, uv = ofproto.oxm_to_user(n, value, mask)
+        k, uv, _len = ofproto.oxm_parse_user(buf, offset + 4)
         action = cls(**{k: uv})
         action.len = len_
 
@@ -3408,8 +3510,8 @@ class OFPActionSetField(OFPAction):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        n, value, mask = ofproto.oxm_from_user(self.key, self.value)
-        len_ = ofproto.oxm_serialize(n, value, mask, buf, offset + 4)
+        len_ = ofproto.oxm_serialize_user(self.key, self.value, buf,
+                                          offset + 4)
         self.len = utils.round_up(4 + len_, 8)
         msg_pack_into('!HH', buf, offset, self.type, self.len)
         pad_len = self.len - (4 + len_)
@@ -3485,6 +3587,8 @@ class OFPActionPushPbb(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype, type_=None, len_=None):
         super(OFPActionPushPbb, self).__init__()
         self.ethertype = ethertype
@@ -3510,6 +3614,8 @@ class OFPActionPopPbb(OFPAction):
     the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopPbb, self).__init__()
 
@@ -3889,6 +3995,7 @@ class OFPMultipartRequest(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_MULTIPART_REPLY)
+@ofproto_parser.lazy_attributes('body')
 class OFPMultipartReply(MsgBase):
     _STATS_MSG_TYPES = {}
 
@@ -3941,19 +4048,26 @@ class OFPMultipartReply(MsgBase):
         msg.flags = flags
 
         if stats_type_cls is not None:
-            offset = ofproto.OFP_MULTIPART_REPLY_SIZE
-            body = []
-            while offset < msg_len:
-                b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
-                body.append(b)
-                offset += b.length if hasattr(b, 'length') else b.len
-
-            if stats_type_cls.cls_body_single_struct:
-                msg.body = body[0]
+            if ofproto_parser.is_lazy_decoding():
+                ofproto_parser.set_lazy(msg, 'body', cls._parser_body,
+                                        stats_type_cls, msg.buf, msg_len)
             else:
-                msg.body = body
+                msg.body = cls._parser_body(stats_type_cls, msg.buf, msg_len)
         return msg
 
+    @staticmethod
+    def _parser_body(stats_type_cls, buf, msg_len):
+        offset = ofproto.OFP_MULTIPART_REPLY_SIZE
+        body = []
+        while offset < msg_len:
+            b = stats_type_cls.cls_stats_body_cls.parser(buf, offset)
+            body.append(b)
+            offset += b.length if hasattr(b, 'length') else b.len
+
+        if stats_type_cls.cls_body_single_struct:
+            return body[0]
+        return body
+
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
         'mfr_desc', 'hw_desc', 'sw_desc', 'serial_num', 'dp_desc'))):
@@ -4038,6 +4152,7 @@ class OFPDescStatsReply(OFPMultipartReply):
         super(OFPDescStatsReply, self).__init__(datapath, **kwargs)
 
 
+@ofproto_parser.lazy_attributes('match', 'instructions')
 class OFPFlowStats(StringifyMixin):
     def __init__(self, table_id=None, duration_sec=None, duration_nsec=None,
                  priority=None, idle_timeout=None, hard_timeout=None,
@@ -4072,20 +4187,24 @@ class OFPFlowStats(StringifyMixin):
             ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
         offset += ofproto.OFP_FLOW_STATS_0_SIZE
 
-        flow_stats.match = OFPMatch.parser(buf, offset)
-        match_length = utils.round_up(flow_stats.match.length, 8)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_stats, 'match',
+                                    OFPMatch.parser, buf, offset)
+            match_length = utils.round_up(_match_length(buf, offset), 8)
+        else:
+            flow_stats.match = OFPMatch.parser(buf, offset)
+            match_length = utils.round_up(flow_stats.match.length, 8)
         inst_length = (flow_stats.length - (ofproto.OFP_FLOW_STATS_SIZE -
                                             ofproto.OFP_MATCH_SIZE +
                                             match_length))
         offset += match_length
-        instructions = []
-        while inst_length > 0:
-            inst = OFPInstruction.parser(buf, offset)
-            instructions.append(inst)
-            offset += inst.len
-            inst_length -= inst.len
-
-        flow_stats.instructions = instructions
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_stats, 'instructions',
+                                    _parser_instructions,
+                                    buf, offset, inst_length)
+        else:
+            flow_stats.instructions = _parser_instructions(
+                buf, offset, inst_length)
         return flow_stats
 
 
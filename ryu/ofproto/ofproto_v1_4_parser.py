@@ -58,6 +58,22 @@ def msg_parser(datapath, version, msg_type, msg_len, xid, buf):
     return parser(datapath, version, msg_type, msg_len, xid, buf)
 
 
+def _match_length(buf, offset):
+    # The length of the ofp_match at offset, without decoding it.
+    (_type, length) = struct.unpack_from('!HH', buf, offset)
+    return length
+
+
+def _parser_instructions(buf, offset, inst_length):
+    instructions = []
+    while inst_length > 0:
+        inst = OFPInstruction.parser(buf, offset)
+        instructions.append(inst)
+        offset += inst.len
+        inst_length -= inst.len
+    return instructions
+
+
 @_register_parser
 @_set_msg_type(ofproto.OFPT_HELLO)
 class OFPHello(MsgBase):
@@ -784,8 +800,7 @@ class OFPMatch(StringifyMixin):
 
         fields = []
         while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto.oxm_parse_user(buf, offset)
             fields.append((k, uv))
             offset += field_len
             length -= field_len
@@ -798,14 +813,11 @@ class OFPMatch(StringifyMixin):
         the buf.
         Returns the output length.
         """
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
         hdr_pack_str = '!HH'
         field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+        for (k, uv) in self._fields2:
+            field_offset += ofproto.oxm_serialize_user(k, uv, buf,
+                                                       field_offset)
 
         length = field_offset - offset
         msg_pack_into(hdr_pack_str, buf, offset, ofproto.OFPMT_OXM, length)
@@ -1158,6 +1170,7 @@ class OFPBundlePropExperimenter(OFPPropCommonExperimenter4ByteData):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_PACKET_IN)
+@ofproto_parser.lazy_attributes('match')
 class OFPPacketIn(MsgBase):
     """
     Packet-In message
@@ -1235,10 +1248,14 @@ class OFPPacketIn(MsgBase):
             ofproto.OFP_PACKET_IN_PACK_STR,
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
-                                    ofproto.OFP_MATCH_SIZE)
-
-        match_len = utils.round_up(msg.match.length, 8)
+        offset = ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+            match_len = utils.round_up(_match_length(msg.buf, offset), 8)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
+            match_len = utils.round_up(msg.match.length, 8)
         msg.data = msg.buf[(ofproto.OFP_PACKET_IN_SIZE -
                             ofproto.OFP_MATCH_SIZE + match_len + 2):]
 
@@ -1251,6 +1268,7 @@ class OFPPacketIn(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_FLOW_REMOVED)
+@ofproto_parser.lazy_attributes('match')
 class OFPFlowRemoved(MsgBase):
     """
     Flow removed message
@@ -1342,7 +1360,11 @@ class OFPFlowRemoved(MsgBase):
 
         offset = (ofproto.OFP_FLOW_REMOVED_SIZE - ofproto.OFP_MATCH_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, offset)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
 
         return msg
 
@@ -1601,6 +1623,7 @@ class OFPTableMod(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_MULTIPART_REPLY)
+@ofproto_parser.lazy_attributes('body')
 class OFPMultipartReply(MsgBase):
     _STATS_MSG_TYPES = {}
 
@@ -1652,18 +1675,25 @@ class OFPMultipartReply(MsgBase):
         msg.type = type_
         msg.flags = flags
 
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'body', cls._parser_body,
+                                    stats_type_cls, msg.buf, msg_len)
+        else:
+            msg.body = cls._parser_body(stats_type_cls, msg.buf, msg_len)
+        return msg
+
+    @staticmethod
+    def _parser_body(stats_type_cls, buf, msg_len):
         offset = ofproto.OFP_MULTIPART_REPLY_SIZE
         body = []
         while offset < msg_len:
-            b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
+            b = stats_type_cls.cls_stats_body_cls.parser(buf, offset)
             body.append(b)
             offset += b.length if hasattr(b, 'length') else b.len
 
         if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
-        else:
-            msg.body = body
-        return msg
+            return body[0]
+        return body
 
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
@@ -3440,6 +3470,7 @@ class OFPExperimenterStatsReply(OFPMultipartReply):
         super(OFPExperimenterStatsReply, self).__init__(datapath, **kwargs)
 
 
+@ofproto_parser.lazy_attributes('match', 'instructions')
 class OFPFlowStats(StringifyMixin):
     def __init__(self, table_id=None, duration_sec=None, duration_nsec=None,
                  priority=None, idle_timeout=None, hard_timeout=None,
@@ -3476,20 +3507,24 @@ class OFPFlowStats(StringifyMixin):
             ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
         offset += ofproto.OFP_FLOW_STATS_0_SIZE
 
-        flow_stats.match = OFPMatch.parser(buf, offset)
-        match_length = utils.round_up(flow_stats.match.length, 8)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_stats, 'match',
+                                    OFPMatch.parser, buf, offset)
+            match_length = utils.round_up(_match_length(buf, offset), 8)
+        else:
+            flow_stats.match = OFPMatch.parser(buf, offset)
+            match_length = utils.round_up(flow_stats.match.length, 8)
         inst_length = (flow_stats.length - (ofproto.OFP_FLOW_STATS_SIZE -
                                             ofproto.OFP_MATCH_SIZE +
                                             match_length))
         offset += match_length
-        instructions = []
-        while inst_length > 0:
-            inst = OFPInstruction.parser(buf, offset)
-            instructions.append(inst)
-            offset += inst.len
-            inst_length -= inst.len
-
-        flow_stats.instructions = instructions
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_stats, 'instructions',
+                                    _parser_instructions,
+                                    buf, offset, inst_length)
+        else:
+            flow_stats.instructions = _parser_instructions(
+                buf, offset, inst_length)
         return flow_stats
 
 
@@ -4642,6 +4677,8 @@ class OFPInstructionMeter(OFPInstruction):
 
 
 class OFPActionHeader(StringifyMixin):
+    __slots__ = ('type', 'len')
+
     def __init__(self, type_, len_):
         self.type = type_
         self.len = len_
@@ -4652,6 +4689,7 @@ class OFPActionHeader(StringifyMixin):
 
 
 class OFPAction(OFPActionHeader):
+    __slots__ = ()
     _ACTION_TYPES = {}
 
     @staticmethod
@@ -4693,6 +4731,8 @@ class OFPActionOutput(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('port', 'max_len')
+
     def __init__(self, port, max_len=ofproto.OFPCML_MAX,
                  type_=None, len_=None):
         super(OFPActionOutput, self).__init__()
@@ -4725,6 +4765,8 @@ class OFPActionGroup(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('group_id', )
+
     def __init__(self, group_id=0, type_=None, len_=None):
         super(OFPActionGroup, self).__init__()
         self.group_id = group_id
@@ -4756,6 +4798,8 @@ class OFPActionSetQueue(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('queue_id', )
+
     def __init__(self, queue_id, type_=None, len_=None):
         super(OFPActionSetQueue, self).__init__()
         self.queue_id = queue_id
@@ -4786,6 +4830,8 @@ class OFPActionSetMplsTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('mpls_ttl', )
+
     def __init__(self, mpls_ttl, type_=None, len_=None):
         super(OFPActionSetMplsTtl, self).__init__()
         self.mpls_ttl = mpls_ttl
@@ -4810,6 +4856,8 @@ class OFPActionDecMplsTtl(OFPAction):
     This action decrements the MPLS TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecMplsTtl, self).__init__()
 
@@ -4835,6 +4883,8 @@ class OFPActionSetNwTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('nw_ttl', )
+
     def __init__(self, nw_ttl, type_=None, len_=None):
         super(OFPActionSetNwTtl, self).__init__()
         self.nw_ttl = nw_ttl
@@ -4859,6 +4909,8 @@ class OFPActionDecNwTtl(OFPAction):
     This action decrements the IP TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecNwTtl, self).__init__()
 
@@ -4879,6 +4931,8 @@ class OFPActionCopyTtlOut(OFPAction):
     the outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlOut, self).__init__()
 
@@ -4899,6 +4953,8 @@ class OFPActionCopyTtlIn(OFPAction):
     next-to-outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlIn, self).__init__()
 
@@ -4924,6 +4980,8 @@ class OFPActionPushVlan(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_8021Q, type_=None, len_=None):
         super(OFPActionPushVlan, self).__init__()
         self.ethertype = ethertype
@@ -4954,6 +5012,8 @@ class OFPActionPushMpls(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_MPLS, type_=None, len_=None):
         super(OFPActionPushMpls, self).__init__()
         self.ethertype = ethertype
@@ -4978,6 +5038,8 @@ class OFPActionPopVlan(OFPAction):
     This action pops the outermost VLAN tag from the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopVlan, self).__init__()
 
@@ -4997,6 +5059,8 @@ class OFPActionPopMpls(OFPAction):
     This action pops the MPLS header from the packet.
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_IP, type_=None, len_=None):
         super(OFPActionPopMpls, self).__init__()
         self.ethertype = ethertype
@@ -5041,15 +5105,14 @@ class OFPActionSetField(OFPAction):
     def parser(cls, buf, offset):
         (type_, len_) = struct.unpack_from(
             ofproto.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
-        (n, value, mask, _len) = ofproto.oxm_parse(buf, offset + 4)
-        k, uv = ofproto.oxm_to_user(n, value, mask)
+        k, uv, _len = ofproto.oxm_parse_user(buf, offset + 4)
         action = cls(**{k: uv})
         action.len = len_
         return action
 
     def serialize(self, buf, offset):
-        n, value, mask = ofproto.oxm_from_user(self.key, self.value)
-        len_ = ofproto.oxm_serialize(n, value, mask, buf, offset + 4)
+        len_ = ofproto.oxm_serialize_user(self.key, self.value, buf,
+                                          offset + 4)
         self.len = utils.round_up(4 + len_, 8)
         msg_pack_into('!HH', buf, offset, self.type, self.len)
         pad_len = self.len - (4 + len_)
@@ -5088,6 +5151,8 @@ class OFPActionPushPbb(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype, type_=None, len_=None):
         super(OFPActionPushPbb, self).__init__()
         self.ethertype = ethertype
@@ -5113,6 +5178,8 @@ class OFPActionPopPbb(OFPAction):
     the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopPbb, self).__init__()
 
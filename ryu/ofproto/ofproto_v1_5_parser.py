@@ -59,6 +59,22 @@ def msg_parser(datapath, version, msg_type, msg_len, xid, buf):
     return parser(datapath, version, msg_type, msg_len, xid, buf)
 
 
+def _match_length(buf, offset):
+    # The length of the ofp_match at offset, without decoding it.
+    (_type, length) = struct.unpack_from('!HH', buf, offset)
+    return length
+
+
+def _parser_instructions(buf, offset, inst_length):
+    instructions = []
+    while inst_length > 0:
+        inst = OFPInstruction.parser(buf, offset)
+        instructions.append(inst)
+        offset += inst.len
+        inst_length -= inst.len
+    return instructions
+
+
 @_register_parser
 @_set_msg_type(ofproto.OFPT_HELLO)
 class OFPHello(MsgBase):
@@ -783,8 +799,7 @@ class OFPMatch(StringifyMixin):
 
         fields = []
         while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto.oxm_parse_user(buf, offset)
             fields.append((k, uv))
             offset += field_len
             length -= field_len
@@ -797,14 +812,11 @@ class OFPMatch(StringifyMixin):
         the buf.
         Returns the output length.
         """
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
         hdr_pack_str = '!HH'
         field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+        for (k, uv) in self._fields2:
+            field_offset += ofproto.oxm_serialize_user(k, uv, buf,
+                                                       field_offset)
 
         length = field_offset - offset
         msg_pack_into(hdr_pack_str, buf, offset, ofproto.OFPMT_OXM, length)
@@ -1397,6 +1409,7 @@ class OFPBundlePropExperimenter(OFPPropCommonExperimenter4ByteData):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_PACKET_IN)
+@ofproto_parser.lazy_attributes('match')
 class OFPPacketIn(MsgBase):
     """
     Packet-In message
@@ -1474,10 +1487,14 @@ class OFPPacketIn(MsgBase):
             ofproto.OFP_PACKET_IN_PACK_STR,
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
-                                    ofproto.OFP_MATCH_SIZE)
-
-        match_len = utils.round_up(msg.match.length, 8)
+        offset = ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+            match_len = utils.round_up(_match_length(msg.buf, offset), 8)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
+            match_len = utils.round_up(msg.match.length, 8)
         msg.data = msg.buf[(ofproto.OFP_PACKET_IN_SIZE -
                             ofproto.OFP_MATCH_SIZE + match_len + 2):]
 
@@ -1490,6 +1507,7 @@ class OFPPacketIn(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_FLOW_REMOVED)
+@ofproto_parser.lazy_attributes('match')
 class OFPFlowRemoved(MsgBase):
     """
     Flow removed message
@@ -1573,8 +1591,13 @@ class OFPFlowRemoved(MsgBase):
             msg.buf, ofproto.OFP_HEADER_SIZE)
         offset = (ofproto.OFP_FLOW_REMOVED_SIZE - ofproto.OFP_MATCH_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, offset)
-        offset += utils.round_up(msg.match.length, 8)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'match',
+                                    OFPMatch.parser, msg.buf, offset)
+            offset += utils.round_up(_match_length(msg.buf, offset), 8)
+        else:
+            msg.match = OFPMatch.parser(msg.buf, offset)
+            offset += utils.round_up(msg.match.length, 8)
 
         stats_length = msg.msg_len - offset
         if stats_length > 0:
@@ -1837,6 +1860,7 @@ class OFPTableMod(MsgBase):
 
 @_register_parser
 @_set_msg_type(ofproto.OFPT_MULTIPART_REPLY)
+@ofproto_parser.lazy_attributes('body')
 class OFPMultipartReply(MsgBase):
     _STATS_MSG_TYPES = {}
 
@@ -1888,10 +1912,19 @@ class OFPMultipartReply(MsgBase):
         msg.type = type_
         msg.flags = flags
 
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(msg, 'body', cls._parser_body,
+                                    stats_type_cls, msg.buf, msg_len)
+        else:
+            msg.body = cls._parser_body(stats_type_cls, msg.buf, msg_len)
+        return msg
+
+    @staticmethod
+    def _parser_body(stats_type_cls, buf, msg_len):
         offset = ofproto.OFP_MULTIPART_REPLY_SIZE
         body = []
         while offset < msg_len:
-            b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
+            b = stats_type_cls.cls_stats_body_cls.parser(buf, offset)
             offset_step = b.length if hasattr(b, 'length') else b.len
             if offset_step < 1:
                 raise exception.OFPMalformedMessage()
@@ -1899,10 +1932,8 @@ class OFPMultipartReply(MsgBase):
             offset += offset_step
 
         if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
-        else:
-            msg.body = body
-        return msg
+            return body[0]
+        return body
 
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
@@ -2324,19 +2355,16 @@ class OFPTableFeaturePropOxmValues(OFPTableFeatureProp):
         rest = cls.get_rest(buf)
         values = []
         while rest:
-            n, value, mask, field_len = ofproto.oxm_parse(rest, 0)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto.oxm_parse_user(rest, 0)
             values.append((k, uv))
             rest = rest[field_len:]
         return cls(_ordered_values=values)
 
     def serialize_body(self):
-        values = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self.oxm_values]
         offset = 0
         buf = bytearray()
-        for (n, value, mask) in values:
-            offset += ofproto.oxm_serialize(n, value, mask, buf, offset)
+        for (k, uv) in self.oxm_values:
+            offset += ofproto.oxm_serialize_user(k, uv, buf, offset)
         return buf
 
     def __getitem__(self, key):
@@ -3947,6 +3975,7 @@ class OFPExperimenterStatsReply(OFPMultipartReply):
         super(OFPExperimenterStatsReply, self).__init__(datapath, **kwargs)
 
 
+@ofproto_parser.lazy_attributes('match', 'instructions')
 class OFPFlowDesc(StringifyMixin):
     def __init__(self, table_id=None, priority=None,
                  idle_timeout=None, hard_timeout=None, flags=None,
@@ -3977,27 +4006,32 @@ class OFPFlowDesc(StringifyMixin):
             ofproto.OFP_FLOW_DESC_0_PACK_STR, buf, offset)
         offset += ofproto.OFP_FLOW_DESC_0_SIZE
 
-        flow_desc.match = OFPMatch.parser(buf, offset)
-        match_length = utils.round_up(flow_desc.match.length, 8)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_desc, 'match',
+                                    OFPMatch.parser, buf, offset)
+            match_length = utils.round_up(_match_length(buf, offset), 8)
+        else:
+            flow_desc.match = OFPMatch.parser(buf, offset)
+            match_length = utils.round_up(flow_desc.match.length, 8)
         offset += match_length
 
         flow_desc.stats = OFPStats.parser(buf, offset)
         stats_length = utils.round_up(flow_desc.stats.length, 8)
         offset += stats_length
 
-        instructions = []
         inst_length = (flow_desc.length - (ofproto.OFP_FLOW_DESC_0_SIZE +
                                            match_length + stats_length))
-        while inst_length > 0:
-            inst = OFPInstruction.parser(buf, offset)
-            instructions.append(inst)
-            offset += inst.len
-            inst_length -= inst.len
-
-        flow_desc.instructions = instructions
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_desc, 'instructions',
+                                    _parser_instructions,
+                                    buf, offset, inst_length)
+        else:
+            flow_desc.instructions = _parser_instructions(
+                buf, offset, inst_length)
         return flow_desc
 
 
+@ofproto_parser.lazy_attributes('match')
 class OFPFlowStats(StringifyMixin):
     def __init__(self, table_id=None, reason=None, priority=None,
                  match=None, stats=None, length=None):
@@ -4018,8 +4052,13 @@ class OFPFlowStats(StringifyMixin):
             ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
         offset += ofproto.OFP_FLOW_STATS_0_SIZE
 
-        flow_stats.match = OFPMatch.parser(buf, offset)
-        match_length = utils.round_up(flow_stats.match.length, 8)
+        if ofproto_parser.is_lazy_decoding():
+            ofproto_parser.set_lazy(flow_stats, 'match',
+                                    OFPMatch.parser, buf, offset)
+            match_length = utils.round_up(_match_length(buf, offset), 8)
+        else:
+            flow_stats.match = OFPMatch.parser(buf, offset)
+            match_length = utils.round_up(flow_stats.match.length, 8)
         offset += match_length
 
         stats_length = (flow_stats.length - (ofproto.OFP_FLOW_STATS_0_SIZE +
@@ -5524,6 +5563,8 @@ class OFPInstructionStatTrigger(OFPInstruction):
 
 
 class OFPActionHeader(StringifyMixin):
+    __slots__ = ('type', 'len')
+
     def __init__(self, type_, len_):
         self.type = type_
         self.len = len_
@@ -5534,6 +5575,7 @@ class OFPActionHeader(StringifyMixin):
 
 
 class OFPAction(OFPActionHeader):
+    __slots__ = ()
     _ACTION_TYPES = {}
 
     @staticmethod
@@ -5575,6 +5617,8 @@ class OFPActionOutput(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('port', 'max_len')
+
     def __init__(self, port, max_len=ofproto.OFPCML_MAX,
                  type_=None, len_=None):
         super(OFPActionOutput, self).__init__()
@@ -5607,6 +5651,8 @@ class OFPActionGroup(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('group_id', )
+
     def __init__(self, group_id=0, type_=None, len_=None):
         super(OFPActionGroup, self).__init__()
         self.group_id = group_id
@@ -5638,6 +5684,8 @@ class OFPActionSetQueue(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('queue_id', )
+
     def __init__(self, queue_id, type_=None, len_=None):
         super(OFPActionSetQueue, self).__init__()
         self.queue_id = queue_id
@@ -5668,6 +5716,8 @@ class OFPActionSetMplsTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('mpls_ttl', )
+
     def __init__(self, mpls_ttl, type_=None, len_=None):
         super(OFPActionSetMplsTtl, self).__init__()
         self.mpls_ttl = mpls_ttl
@@ -5692,6 +5742,8 @@ class OFPActionDecMplsTtl(OFPAction):
     This action decrements the MPLS TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecMplsTtl, self).__init__()
 
@@ -5717,6 +5769,8 @@ class OFPActionSetNwTtl(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('nw_ttl', )
+
     def __init__(self, nw_ttl, type_=None, len_=None):
         super(OFPActionSetNwTtl, self).__init__()
         self.nw_ttl = nw_ttl
@@ -5741,6 +5795,8 @@ class OFPActionDecNwTtl(OFPAction):
     This action decrements the IP TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionDecNwTtl, self).__init__()
 
@@ -5761,6 +5817,8 @@ class OFPActionCopyTtlOut(OFPAction):
     the outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlOut, self).__init__()
 
@@ -5781,6 +5839,8 @@ class OFPActionCopyTtlIn(OFPAction):
     next-to-outermost header with TTL.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionCopyTtlIn, self).__init__()
 
@@ -5806,6 +5866,8 @@ class OFPActionPushVlan(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_8021Q, type_=None, len_=None):
         super(OFPActionPushVlan, self).__init__()
         self.ethertype = ethertype
@@ -5836,6 +5898,8 @@ class OFPActionPushMpls(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_MPLS, type_=None, len_=None):
         super(OFPActionPushMpls, self).__init__()
         self.ethertype = ethertype
@@ -5860,6 +5924,8 @@ class OFPActionPopVlan(OFPAction):
     This action pops the outermost VLAN tag from the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopVlan, self).__init__()
 
@@ -5879,6 +5945,8 @@ class OFPActionPopMpls(OFPAction):
     This action pops the MPLS header from the packet.
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype=ether.ETH_TYPE_IP, type_=None, len_=None):
         super(OFPActionPopMpls, self).__init__()
         self.ethertype = ethertype
@@ -5925,15 +5993,14 @@ class OFPActionSetField(OFPAction):
     def parser(cls, buf, offset):
         (type_, len_) = struct.unpack_from(
             ofproto.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
-        (n, value, mask, _len) = ofproto.oxm_parse(buf, offset + 4)
-        k, uv = ofproto.oxm_to_user(n, value, mask)
+        k, uv, _len = ofproto.oxm_parse_user(buf, offset + 4)
         action = cls(**{k: uv})
         action.len = len_
         return action
 
     def serialize(self, buf, offset):
-        n, value, mask = ofproto.oxm_from_user(self.key, self.value)
-        len_ = ofproto.oxm_serialize(n, value, mask, buf, offset + 4)
+        len_ = ofproto.oxm_serialize_user(self.key, self.value, buf,
+                                          offset + 4)
         self.len = utils.round_up(4 + len_, 8)
         msg_pack_into('!HH', buf, offset, self.type, self.len)
         pad_len = self.len - (4 + len_)
@@ -5972,6 +6039,8 @@ class OFPActionPushPbb(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('ethertype', )
+
     def __init__(self, ethertype, type_=None, len_=None):
         super(OFPActionPushPbb, self).__init__()
         self.ethertype = ethertype
@@ -5997,6 +6066,8 @@ class OFPActionPopPbb(OFPAction):
     the packet.
     """
 
+    __slots__ = ()
+
     def __init__(self, type_=None, len_=None):
         super(OFPActionPopPbb, self).__init__()
 
@@ -6030,6 +6101,8 @@ class OFPActionCopyField(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('n_bits', 'src_offset', 'dst_offset', 'oxm_ids')
+
     def __init__(self, n_bits=0, src_offset=0, dst_offset=0, oxm_ids=None,
                  type_=None, len_=None):
         oxm_ids = oxm_ids if oxm_ids else []
@@ -6089,6 +6162,8 @@ class OFPActionMeter(OFPAction):
     ================ ======================================================
     """
 
+    __slots__ = ('meter_id', )
+
     def __init__(self, meter_id,
                  type_=None, len_=None):
         super(OFPActionMeter, self).__init__()
@@ -64,6 +64,11 @@
 # | reserved, should be zero      | pbb_uca       |
 # +-------------------------------+---------------+
 
+import struct
+
+import six
+
+from ryu.lib import type_desc
 from ryu.ofproto.oxx_fields import (
     _get_field_info_by_name,
     _from_user,
@@ -205,10 +210,138 @@ def generate(modname):
     add_attr('oxm_serialize_header',
              functools.partial(_serialize_header, oxx, mod))
 
+    # table driven fast paths of oxm_parse + oxm_to_user and
+    # oxm_from_user + oxm_serialize.
+    decoders, encoders = _compile(num_to_field, name_to_field)
+    add_attr('oxm_parse_user',
+             functools.partial(_parse_user, mod, decoders))
+    add_attr('oxm_serialize_user',
+             functools.partial(_serialize_user, mod, encoders))
+
     add_attr('oxm_to_jsondict', _to_jsondict)
     add_attr('oxm_from_jsondict', _from_jsondict)
 
 
+_OXM_HEADER = struct.Struct('!I')
+
+# struct format characters of integer fields which can be packed and
+# unpacked directly.
+_INT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+_ADDR_TYPES = (type_desc.MacAddr, type_desc.IPv4Addr, type_desc.IPv6Addr)
+
+
+def _field_format(t):
+    if isinstance(t, type_desc.IntDescr) and t.size in _INT_FORMATS:
+        return _INT_FORMATS[t.size], None, None
+    if t in _ADDR_TYPES:
+        return '%ds' % t.size, t.to_user, t.from_user
+    return None, None, None
+
+
+def _compile(num_to_field, name_to_field):
+    """
+    Build lookup tables with precompiled structs for the fields with
+    a 32-bit OXM header and an integer or address value.
+
+    decoders maps an on-wire OXM header to
+    (name, value struct, to_user, hasmask).
+    encoders maps a field name to
+    (header, struct, masked header, masked struct, from_user, max value).
+    Other fields are left to the generic oxx_fields functions.
+    """
+    decoders = {}
+    for num, f in num_to_field.items():
+        if isinstance(num, tuple):
+            continue
+        fmt, to_user, _from_user = _field_format(f.type)
+        if fmt is None:
+            continue
+        size = f.type.size
+        decoders[(num << 9) | size] = (
+            f.name, struct.Struct('!' + fmt), to_user, False)
+        decoders[(num << 9) | (1 << 8) | (size * 2)] = (
+            f.name, struct.Struct('!' + fmt * 2), to_user, True)
+
+    encoders = {}
+    for name, f in name_to_field.items():
+        if isinstance(f.num, tuple):
+            continue
+        fmt, _to_user, from_user = _field_format(f.type)
+        if fmt is None:
+            continue
+        size = f.type.size
+        encoders[name] = (
+            (f.num << 9) | size, struct.Struct('!I' + fmt),
+            (f.num << 9) | (1 << 8) | (size * 2),
+            struct.Struct('!I' + fmt * 2),
+            from_user, (1 << (size * 8)) - 1)
+    return decoders, encoders
+
+
+def _parse_user(mod, decoders, buf, offset):
+    (header, ) = _OXM_HEADER.unpack_from(buf, offset)
+    try:
+        name, value_struct, to_user, hasmask = decoders[header]
+    except KeyError:
+        n, value, mask, field_len = mod.oxm_parse(buf, offset)
+        name, user_value = mod.oxm_to_user(n, value, mask)
+        return name, user_value, field_len
+    values = value_struct.unpack_from(buf, offset + 4)
+    if to_user is not None:
+        values = [to_user(v) for v in values]
+    if hasmask:
+        user_value = (values[0], values[1])
+    else:
+        user_value = values[0]
+    return name, user_value, 4 + (header & 0xff)
+
+
+def _to_wire(from_user, max_value, user_value):
+    # Returns None if user_value needs the generic conversion.
+    # Masking integers by max_value gives the same bytes as
+    # type_desc.IntDescr.from_user().
+    if from_user is None:
+        if isinstance(user_value, six.integer_types):
+            return user_value & max_value
+    elif isinstance(user_value, six.string_types):
+        value = from_user(user_value)
+        if isinstance(value, bytes):
+            # otherwise, CIDR notation which results in (value, mask)
+            return value
+    return None
+
+
+def _pack_into(fmt_struct, buf, offset, *args):
+    needed_len = offset + fmt_struct.size
+    if len(buf) < needed_len:
+        buf += bytearray(needed_len - len(buf))
+    fmt_struct.pack_into(buf, offset, *args)
+    return fmt_struct.size
+
+
+def _serialize_user(mod, encoders, name, user_value, buf, offset):
+    try:
+        (header, fmt_struct, header_w, fmt_struct_w,
+         from_user, max_value) = encoders[name]
+    except KeyError:
+        pass
+    else:
+        if isinstance(user_value, (tuple, list)):
+            if len(user_value) == 2:
+                value = _to_wire(from_user, max_value, user_value[0])
+                mask = _to_wire(from_user, max_value, user_value[1])
+                if value is not None and mask is not None:
+                    return _pack_into(fmt_struct_w, buf, offset,
+                                      header_w, value, mask)
+        else:
+            value = _to_wire(from_user, max_value, user_value)
+            if value is not None:
+                return _pack_into(fmt_struct, buf, offset, header, value)
+    n, value, mask = mod.oxm_from_user(name, user_value)
+    return mod.oxm_serialize(n, value, mask, buf, offset)
+
+
 def _to_jsondict(k, uv):
     if isinstance(uv, tuple):
         (value, mask) = uv
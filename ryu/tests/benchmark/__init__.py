@@ -0,0 +1,32 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmarks for hot paths of Ryu.
+
+Each module in this package is a standalone script, e.g.::
+
+    $ python -m ryu.tests.benchmark.dispatch
+"""
+
+import timeit
+
+
+def measure(name, func, number=100000, repeat=5):
+    """
+    Run func() number times, repeat times, and print the best cost
+    per call in micro seconds.  Returns the cost in seconds.
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print('%-40s %10.3f usec/call' % (name, best * 1e6))
+    return best
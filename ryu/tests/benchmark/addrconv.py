@@ -0,0 +1,82 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of the address conversions of ryu.lib.addrconv compared with
+the plain netaddr based AddressConverter, and of decoding an
+ethernet/ipv4/tcp packet which converts the addresses of its headers.
+"""
+
+import netaddr
+
+from ryu.lib import addrconv
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 10000
+
+_NETADDR = {
+    'mac': addrconv.AddressConverter(
+        netaddr.EUI, netaddr.strategy.eui48, version=48,
+        dialect=addrconv.mac_mydialect),
+    'ipv4': addrconv.AddressConverter(
+        netaddr.IPAddress, netaddr.strategy.ipv4,
+        fallback=netaddr.IPNetwork, version=4),
+    'ipv6': addrconv.AddressConverter(
+        netaddr.IPAddress, netaddr.strategy.ipv6,
+        fallback=netaddr.IPNetwork, version=6),
+}
+
+_ADDRS = {
+    'mac': 'f2:0b:a4:01:0a:23',
+    'ipv4': '192.0.2.1',
+    'ipv6': '2001:db8::1',
+}
+
+
+def _bench_conv(name):
+    conv = getattr(addrconv, name)
+    text = _ADDRS[name]
+    bin_ = conv.text_to_bin(text)
+    for conv_name, func, arg in [('text_to_bin', 'text_to_bin', text),
+                                 ('bin_to_text', 'bin_to_text', bin_)]:
+        base = measure('%s.%s (netaddr)' % (name, conv_name),
+                       lambda: getattr(_NETADDR[name], func)(arg), NUMBER)
+        cost = measure('%s.%s' % (name, conv_name),
+                       lambda: getattr(conv, func)(arg), NUMBER)
+        print('speedup: %.1fx' % (base / cost))
+
+
+def _bench_packet():
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(ethertype=0x0800))
+    pkt.add_protocol(ipv4.ipv4(proto=6))
+    pkt.add_protocol(tcp.tcp(src_port=1, dst_port=2))
+    pkt.serialize()
+    data = bytes(pkt.data)
+    measure('Packet (eth/ipv4/tcp)', lambda: packet.Packet(data), NUMBER)
+
+
+def main():
+    for name in ['mac', 'ipv4', 'ipv6']:
+        _bench_conv(name)
+    _bench_packet()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of the Internet checksum of an IPv4 header and of a full size
+payload, and of updating the IPv4 header checksum after decrementing
+TTL.
+"""
+
+import array
+import os
+import socket
+
+from ryu.lib.packet import packet_utils
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 10000
+
+
+def _array_checksum(data):
+    # the previous implementation summing an array of 16 bit words
+    data = bytes(data)
+    if len(data) % 2:
+        data += b'\x00'
+    s = sum(array.array('H', data))
+    s = (s & 0xffff) + (s >> 16)
+    s += (s >> 16)
+    return socket.ntohs(~s & 0xffff)
+
+
+def main():
+    for name, length in [('IPv4 header', 20), ('1500 bytes', 1500)]:
+        data = os.urandom(length)
+        base = measure('%s (array)' % name,
+                       lambda: _array_checksum(data), NUMBER)
+        cost = measure('%s (checksum)' % name,
+                       lambda: packet_utils.checksum(data), NUMBER)
+        print('speedup: %.1fx' % (base / cost))
+
+    buffers = [os.urandom(20) for _ in range(100)]
+    base = measure('100 IPv4 headers (checksum)',
+                   lambda: [packet_utils.checksum(buf) for buf in buffers],
+                   NUMBER // 100)
+    cost = measure('100 IPv4 headers (checksum_batch)',
+                   lambda: packet_utils.checksum_batch(buffers),
+                   NUMBER // 100)
+    print('speedup: %.1fx' % (base / cost))
+
+    header = bytearray(os.urandom(20))
+    header[8] = 64  # TTL
+    csum = packet_utils.checksum(header)
+
+    def recompute():
+        header[8] -= 1
+        packet_utils.checksum(header)
+        header[8] += 1
+
+    def update():
+        packet_utils.checksum_update(csum, header[8] << 8 | header[9],
+                                     (header[8] - 1) << 8 | header[9])
+
+    base = measure('decrement TTL (checksum)', recompute, NUMBER)
+    cost = measure('decrement TTL (checksum_update)', update, NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
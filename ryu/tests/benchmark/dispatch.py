@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of looking up the handlers of a PacketIn event in RyuApp.
+
+The "filter" case reproduces the per-event filtering which
+RyuApp.get_handlers() did before the dispatch index was introduced.
+"""
+
+from ryu.base import app_manager
+from ryu.controller import handler
+from ryu.controller import ofp_event
+from ryu.controller.handler import CONFIG_DISPATCHER
+from ryu.controller.handler import MAIN_DISPATCHER
+from ryu.tests.benchmark import measure
+
+
+class _App(app_manager.RyuApp):
+    @handler.set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
+    def packet_in_handler(self, ev):
+        pass
+
+    @handler.set_ev_cls(ofp_event.EventOFPPacketIn,
+                        [CONFIG_DISPATCHER, MAIN_DISPATCHER])
+    def packet_in_handler2(self, ev):
+        pass
+
+    @handler.set_ev_cls(ofp_event.EventOFPPacketIn, CONFIG_DISPATCHER)
+    def packet_in_handler3(self, ev):
+        pass
+
+
+def _filter_handlers(app, ev, state):
+    ev_cls = ev.__class__
+    handlers = app.event_handlers.get(ev_cls, [])
+
+    def test(h):
+        if not hasattr(h, 'callers') or ev_cls not in h.callers:
+            return True
+        states = h.callers[ev_cls].dispatchers
+        if not states:
+            return True
+        return state in states
+
+    return filter(test, handlers)
+
+
+def main():
+    app = _App()
+    handler.register_instance(app)
+    ev = ofp_event.EventOFPPacketIn(None)
+
+    def filtered():
+        for h in _filter_handlers(app, ev, MAIN_DISPATCHER):
+            pass
+
+    def indexed():
+        for h in app.get_handlers(ev, MAIN_DISPATCHER):
+            pass
+
+    before = measure('PacketIn dispatch (filter)', filtered)
+    after = measure('PacketIn dispatch (index)', indexed)
+    print('speedup: %.1fx' % (before / after))
+
+
+if __name__ == '__main__':
+    main()
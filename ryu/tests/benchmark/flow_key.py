@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of getting the L2-L4 key of an ethernet/ipv4/tcp packet with
+Packet and with flow_key.extract().
+"""
+
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import flow_key
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 10000
+
+
+def main():
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(ethertype=0x0800))
+    pkt.add_protocol(ipv4.ipv4(proto=6))
+    pkt.add_protocol(tcp.tcp(src_port=1, dst_port=2))
+    pkt.add_protocol(b'\x00' * 64)
+    pkt.serialize()
+    data = bytes(pkt.data)
+
+    def packet_key():
+        pkt = packet.Packet(data)
+        eth = pkt.get_protocol(ethernet.ethernet)
+        ip = pkt.get_protocol(ipv4.ipv4)
+        l4 = pkt.get_protocol(tcp.tcp)
+        return (eth.dst, eth.src, eth.ethertype, ip.src, ip.dst, ip.proto,
+                l4.src_port, l4.dst_port)
+
+    def extract():
+        return flow_key.extract(data)
+
+    def extract_text():
+        return flow_key.extract(data, text=True)
+
+    base = measure('Packet', packet_key, NUMBER)
+    for name, func in [('flow_key.extract', extract),
+                       ('flow_key.extract (text)', extract_text)]:
+        print('speedup: %.1fx' % (base / measure(name, func, NUMBER)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of looking up the hosts of a datapath among 50000 hosts learned
+by ryu.topology.switches, by scanning HostState and by its index.
+"""
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.tests.benchmark import measure
+from ryu.topology import switches
+
+
+NUMBER = 100
+DPIDS = 100
+HOSTS_PER_PORT = 10
+
+
+def _port(dpid, port_no):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no, '00:00:00:00:00:01', b'port', 0, 0, 0, 0, 0, 0, 0, 0)
+    return switches.Port(dpid, ofproto_v1_3, ofpport)
+
+
+def main():
+    hosts = switches.HostState()
+    i = 0
+    for dpid in range(1, DPIDS + 1):
+        for port_no in range(1, 51):
+            port = _port(dpid, port_no)
+            for _ in range(HOSTS_PER_PORT):
+                i += 1
+                mac = ':'.join('%02x' % b for b in i.to_bytes(6, 'big'))
+                hosts.add(switches.Host(mac, port))
+
+    def scan():
+        return [host for host in hosts.values() if host.port.dpid == 1]
+
+    base = measure('get_by_dpid (scan)', scan, NUMBER)
+    cost = measure('get_by_dpid (index)', lambda: hosts.get_by_dpid(1),
+                   NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
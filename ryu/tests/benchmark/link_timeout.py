@@ -0,0 +1,57 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of finding the timed out links among 10000 links in
+Switches.link_loop, by scanning LinkState and by its deadline index.
+"""
+
+import time
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.tests.benchmark import measure
+from ryu.topology import switches
+
+
+NUMBER = 100
+LINKS = 10000
+
+
+def _port(dpid, port_no):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no, '00:00:00:00:00:01', b'port', 0, 0, 0, 0, 0, 0, 0, 0)
+    return switches.Port(dpid, ofproto_v1_3, ofpport)
+
+
+def main():
+    links = switches.LinkState()
+    for i in range(LINKS):
+        links.update_link(_port(1, i + 1), _port(2, i + 1))
+    expire = time.time() - switches.Switches.LINK_TIMEOUT
+
+    def scan():
+        return [link for link, timestamp in links.items()
+                if timestamp < expire]
+
+    def index():
+        return links.expired(expire)
+
+    base = measure('scan', scan, NUMBER)
+    cost = measure('deadline index', index, NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
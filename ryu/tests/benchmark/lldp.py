@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of the LLDP packets of ryu.topology.switches: encoding a
+PacketOut of an LLDP packet, from scratch and by patching xid of the
+cached wire bytes, and parsing a received LLDP packet, with Packet and
+with the fixed-offset fast path.
+"""
+
+import struct
+
+from ryu.lib.packet import lldp
+from ryu.lib.packet import packet
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.tests.benchmark import measure
+from ryu.topology import switches
+
+
+NUMBER = 10000
+
+
+def _packet_parse(data):
+    # the parser before the fast path
+    tlvs = packet.Packet(data).get_protocol(lldp.lldp).tlvs
+    chassis_id = tlvs[0].chassis_id.decode('utf-8')
+    return (int(chassis_id[switches.LLDPPacket.CHASSIS_ID_PREFIX_LEN:], 16),
+            struct.unpack(switches.LLDPPacket.PORT_ID_STR,
+                          tlvs[1].port_id)[0])
+
+
+def main():
+    dp = ofproto_protocol.ProtocolDesc(ofproto_v1_3.OFP_VERSION)
+    ofp = dp.ofproto
+    parser = dp.ofproto_parser
+    data = switches.LLDPPacket.lldp_packet(1, 1, '00:00:00:00:00:01', 120)
+
+    def packet_out():
+        out = parser.OFPPacketOut(
+            datapath=dp, in_port=ofp.OFPP_CONTROLLER,
+            buffer_id=ofp.OFP_NO_BUFFER,
+            actions=[parser.OFPActionOutput(1)], data=data)
+        out.set_xid(1)
+        out.serialize()
+        return out.buf
+
+    cached = bytes(packet_out())
+
+    def patch_xid():
+        buf = bytearray(cached)
+        struct.pack_into('!I', buf, 4, 1)
+        return buf
+
+    base = measure('PacketOut (serialize)', packet_out, NUMBER)
+    cost = measure('PacketOut (patch xid)', patch_xid, NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+    base = measure('parse (Packet)', lambda: _packet_parse(data), NUMBER)
+    cost = measure('parse (fixed offsets)',
+                   lambda: switches.LLDPPacket.lldp_parse(data), NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Memory retained by parsed packets and OpenFlow 1.3-1.5 flow stats
+entries, e.g. by an application caching them.
+
+The numbers of objects can be given on the command line::
+
+    $ python -m ryu.tests.benchmark.memory [PACKETS [FLOW_STATS]]
+"""
+
+import os
+import sys
+import tracemalloc
+
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_4
+from ryu.ofproto import ofproto_v1_5
+
+
+PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'packet_data')
+
+FLOW_STATS_REPLIES = [
+    (ofproto_v1_3, 'of13/4-12-ofp_flow_stats_reply.packet'),
+    (ofproto_v1_4, 'of14/5-12-ofp_flow_stats_reply.packet'),
+    (ofproto_v1_5, 'of15/libofproto-OFP15-flow_stats_reply.packet'),
+]
+
+PACKETS = 1000000
+FLOW_STATS = 100000
+
+
+def _retained(name, number, create):
+    # Snapshots of a million objects are slow to compare, so only the
+    # total traced size is used.
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objs = create()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    size = after - before
+    print('%-40s %10d bytes (%d bytes each)' % (name, size, size // number))
+    del objs
+
+
+def _packets(number):
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(ethertype=0x0800))
+    pkt.add_protocol(ipv4.ipv4(proto=6))
+    pkt.add_protocol(tcp.tcp(src_port=1, dst_port=2))
+    pkt.serialize()
+    data = bytes(pkt.data)
+
+    def create():
+        return [packet.Packet(data) for _ in range(number)]
+
+    _retained('%d eth/ipv4/tcp packets' % number, number, create)
+
+
+def _flow_stats(number, ofproto, name):
+    with open(os.path.join(PACKET_DATA_DIR, name), 'rb') as f:
+        buf = f.read()
+    dp = ofproto_protocol.ProtocolDesc(version=ofproto.OFP_VERSION)
+    version, msg_type, msg_len, xid = ofproto_parser.header(buf)
+    per_msg = len(ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                                     buf).body)
+
+    def create():
+        return [ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                                   buf).body
+                for _ in range(number // per_msg)]
+
+    _retained('%d OpenFlow 0x%x flow stats entries'
+              % (number, ofproto.OFP_VERSION), number, create)
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:]]
+    _packets(args[0] if args else PACKETS)
+    for ofproto, name in FLOW_STATS_REPLIES:
+        _flow_stats(args[1] if len(args) > 1 else FLOW_STATS, ofproto, name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of producing the wire bytes of the OpenFlow 1.3 FlowMod and
+PacketOut which simple_switch_13 sends for a PacketIn, by building and
+serializing the messages and by patching templates.
+"""
+
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto.ofproto_template import MsgTemplate
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 20000
+
+
+def main():
+    dp = ofproto_protocol.ProtocolDesc(ofproto_v1_3.OFP_VERSION)
+    ofp = dp.ofproto
+    parser = dp.ofproto_parser
+    data = b'\x00' * 64
+
+    def flow_mod(in_port, dst, src, out_port):
+        match = parser.OFPMatch(in_port=in_port, eth_dst=dst, eth_src=src)
+        actions = [parser.OFPActionOutput(out_port)]
+        inst = [parser.OFPInstructionActions(ofp.OFPIT_APPLY_ACTIONS,
+                                             actions)]
+        msg = parser.OFPFlowMod(datapath=dp, priority=1, match=match,
+                                instructions=inst)
+        msg.set_xid(1)
+        msg.serialize()
+        return msg
+
+    def packet_out(in_port, out_port):
+        actions = [parser.OFPActionOutput(out_port)]
+        msg = parser.OFPPacketOut(datapath=dp, buffer_id=ofp.OFP_NO_BUFFER,
+                                  in_port=in_port, actions=actions,
+                                  data=data)
+        msg.set_xid(1)
+        msg.serialize()
+        return msg
+
+    src = '00:00:00:00:00:01'
+    dst = '00:00:00:00:00:02'
+    flow_tmpl = MsgTemplate(flow_mod(1, dst, src, 2))
+    out_tmpl = MsgTemplate(packet_out(1, 2))
+
+    before = measure(
+        'FlowMod (serialize)', lambda: flow_mod(3, dst, src, 4), NUMBER)
+    after = measure(
+        'FlowMod (template)',
+        lambda: flow_tmpl.render(1, in_port=3, eth_dst=dst, eth_src=src,
+                                 output=4), NUMBER)
+    print('speedup: %.1fx' % (before / after))
+
+    before = measure(
+        'PacketOut (serialize)', lambda: packet_out(3, 4), NUMBER)
+    after = measure(
+        'PacketOut (template)',
+        lambda: out_tmpl.render(1, data, in_port=3, output=4), NUMBER)
+    print('speedup: %.1fx' % (before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of parsing received OpenFlow 1.3 messages, eagerly and with
+lazy decoding of matches, instructions and multipart bodies.
+
+The "lazy + access" cases touch the decoded attributes as an
+application handling every message would.
+"""
+
+import os
+
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.tests.benchmark import measure
+
+
+PACKET_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), '..', 'packet_data', 'of13')
+
+NUMBER = 10000
+
+
+def _load(name):
+    with open(os.path.join(PACKET_DATA_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def _bench(title, buf, access):
+    dp = ofproto_protocol.ProtocolDesc(version=ofproto_v1_3.OFP_VERSION)
+    version, msg_type, msg_len, xid = ofproto_parser.header(buf)
+
+    def parse():
+        ofproto_parser.msg(dp, version, msg_type, msg_len, xid, buf)
+
+    def parse_access():
+        access(ofproto_parser.msg(dp, version, msg_type, msg_len, xid, buf))
+
+    try:
+        eager = measure('%s (eager)' % title, parse, NUMBER)
+        ofproto_parser.enable_lazy_decoding()
+        lazy = measure('%s (lazy)' % title, parse, NUMBER)
+        measure('%s (lazy + access)' % title, parse_access, NUMBER)
+    finally:
+        ofproto_parser.disable_lazy_decoding()
+    print('speedup: %.1fx' % (eager / lazy))
+
+
+def _access_packet_in(msg):
+    msg.match['in_port']
+
+
+def _access_flow_stats(msg):
+    for stats in msg.body:
+        stats.match
+        stats.instructions
+
+
+def main():
+    _bench('PacketIn', _load('4-4-ofp_packet_in.packet'), _access_packet_in)
+    _bench('FlowStatsReply', _load('4-12-ofp_flow_stats_reply.packet'),
+           _access_flow_stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of encoding and decoding the OXM fields of an OpenFlow 1.3 match
+of a typical L4 flow.
+
+The "generic" cases go through oxm_from_user/oxm_serialize and
+oxm_parse/oxm_to_user for each field, as OFPMatch did before the
+table driven codec was introduced.  The "OFPMatch" cases include
+the match header and the old API compat parsing.
+"""
+
+from ryu.ofproto import ofproto_v1_3 as ofproto
+from ryu.ofproto import ofproto_v1_3_parser as parser
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 20000
+
+
+def _serialize_generic(fields, buf, offset):
+    for (n, value, mask) in [ofproto.oxm_from_user(k, uv)
+                             for (k, uv) in fields]:
+        offset += ofproto.oxm_serialize(n, value, mask, buf, offset)
+
+
+def _serialize_table(fields, buf, offset):
+    for (k, uv) in fields:
+        offset += ofproto.oxm_serialize_user(k, uv, buf, offset)
+
+
+def _parse_generic(buf, offset, length):
+    fields = []
+    while length > 0:
+        n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
+        fields.append(ofproto.oxm_to_user(n, value, mask))
+        offset += field_len
+        length -= field_len
+    return fields
+
+
+def _parse_table(buf, offset, length):
+    fields = []
+    while length > 0:
+        k, uv, field_len = ofproto.oxm_parse_user(buf, offset)
+        fields.append((k, uv))
+        offset += field_len
+        length -= field_len
+    return fields
+
+
+def main():
+    match = parser.OFPMatch(in_port=1, eth_type=0x0800, ip_proto=6,
+                            ipv4_src='192.0.2.1',
+                            ipv4_dst=('198.51.100.0', '255.255.255.0'),
+                            tcp_src=12345, tcp_dst=80)
+    buf = bytearray()
+    match.serialize(buf, 0)
+    fields = match._fields2
+    length = match.length - 4
+
+    assert _parse_generic(buf, 4, length) == \
+        _parse_table(buf, 4, length)
+
+    encode_before = measure(
+        'OXM encode (generic)',
+        lambda: _serialize_generic(fields, bytearray(), 0), NUMBER)
+    encode_after = measure(
+        'OXM encode (table)',
+        lambda: _serialize_table(fields, bytearray(), 0), NUMBER)
+    print('speedup: %.1fx' % (encode_before / encode_after))
+
+    decode_before = measure(
+        'OXM decode (generic)',
+        lambda: _parse_generic(buf, 4, length), NUMBER)
+    decode_after = measure(
+        'OXM decode (table)',
+        lambda: _parse_table(buf, 4, length), NUMBER)
+    print('speedup: %.1fx' % (decode_before / decode_after))
+
+    measure('OFPMatch.serialize',
+            lambda: match.serialize(bytearray(), 0), NUMBER)
+    measure('OFPMatch.parser',
+            lambda: parser.OFPMatch.parser(buf, 0), NUMBER)
+
+
+if __name__ == '__main__':
+    main()
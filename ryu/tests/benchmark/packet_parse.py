@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of decoding the packets of the pcap files in
+ryu/tests/packet_data/pcap, eagerly and lazily.
+
+The lazy cases stop at the header requested with get_protocol() as a
+PacketIn handler of an L2 switch (ethernet) or of an L3 application
+(ipv4) would.
+"""
+
+import os
+
+from ryu.lib import pcaplib
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.tests.benchmark import measure
+
+
+PCAP_DIR = os.path.join(
+    os.path.dirname(__file__), '..', 'packet_data', 'pcap')
+
+NUMBER = 100
+
+
+def _load():
+    bufs = []
+    for name in sorted(os.listdir(PCAP_DIR)):
+        with open(os.path.join(PCAP_DIR, name), 'rb') as f:
+            bufs.extend(buf for _, buf in pcaplib.Reader(f))
+    return bufs
+
+
+def main():
+    bufs = _load()
+    print('%d packets' % len(bufs))
+
+    def eager():
+        for buf in bufs:
+            packet.Packet(buf).get_protocol(ethernet.ethernet)
+
+    def lazy_ethernet():
+        for buf in bufs:
+            packet.Packet(buf, lazy=True).get_protocol(ethernet.ethernet)
+
+    def lazy_ipv4():
+        for buf in bufs:
+            packet.Packet(buf, lazy=True).get_protocol(ipv4.ipv4)
+
+    def lazy_all():
+        for buf in bufs:
+            packet.Packet(buf, lazy=True).protocols
+
+    base = measure('eager', eager, NUMBER)
+    print('%.0f packets/sec' % (len(bufs) / base))
+    for name, func in [('lazy (ethernet)', lazy_ethernet),
+                       ('lazy (ipv4)', lazy_ipv4),
+                       ('lazy (all)', lazy_all)]:
+        cost = measure(name, func, NUMBER)
+        print('%.0f packets/sec, speedup: %.1fx'
+              % (len(bufs) / cost, base / cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of encoding packets generated by applications with
+Packet.serialize, into a single buffer and layer by layer.
+"""
+
+from ryu.lib.packet import arp
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import icmp
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import lldp
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 10000
+
+SRC_MAC = '00:00:00:00:00:01'
+DST_MAC = '00:00:00:00:00:02'
+
+
+def _arp():
+    return [ethernet.ethernet(DST_MAC, SRC_MAC, ether_types.ETH_TYPE_ARP),
+            arp.arp_ip(arp.ARP_REQUEST, SRC_MAC, '192.0.2.1', DST_MAC,
+                       '192.0.2.2')]
+
+
+def _icmp():
+    return [ethernet.ethernet(DST_MAC, SRC_MAC, ether_types.ETH_TYPE_IP),
+            ipv4.ipv4(proto=in_proto.IPPROTO_ICMP, src='192.0.2.1',
+                      dst='192.0.2.2'),
+            icmp.icmp(type_=icmp.ICMP_ECHO_REPLY,
+                      data=icmp.echo(data=b'\x00' * 56))]
+
+
+def _lldp():
+    return [ethernet.ethernet(lldp.LLDP_MAC_NEAREST_BRIDGE, SRC_MAC,
+                              ether_types.ETH_TYPE_LLDP),
+            lldp.lldp([lldp.ChassisID(
+                subtype=lldp.ChassisID.SUB_LOCALLY_ASSIGNED,
+                chassis_id=b'dpid:0000000000000001'),
+                lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                            port_id=b'\x00\x00\x00\x01'),
+                lldp.TTL(ttl=120), lldp.End()])]
+
+
+def _tcp():
+    return [ethernet.ethernet(DST_MAC, SRC_MAC, ether_types.ETH_TYPE_IP),
+            ipv4.ipv4(proto=in_proto.IPPROTO_TCP, src='192.0.2.1',
+                      dst='192.0.2.2'),
+            tcp.tcp(src_port=1, dst_port=2), b'\x00' * 1400]
+
+
+class _LayerByLayer(packet.Packet):
+    def _serialize_into(self):
+        return False
+
+
+def main():
+    for name, protocols in [('ARP', _arp), ('ICMP', _icmp),
+                            ('LLDP', _lldp), ('TCP 1400 bytes', _tcp)]:
+        def serialize(cls=packet.Packet):
+            # the checksums and lengths are computed on each encoding
+            cls(protocols=protocols()).serialize()
+
+        base = measure('%s (layer by layer)' % name,
+                       lambda: serialize(_LayerByLayer), NUMBER)
+        cost = measure('%s (single buffer)' % name, serialize, NUMBER)
+        print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of sending 100 OpenFlow 1.3 FlowMods to a datapath through its
+send loop, one by one with send_msg and at once with send_msgs.
+"""
+
+from ryu.base import app_manager  # noqa: to be imported before controller
+from ryu.controller import controller
+from ryu.lib import hub
+from ryu.ofproto import ofproto_v1_3
+from ryu.tests.benchmark import measure
+
+
+NUMBER = 200
+MSGS = 100
+
+
+class _Socket(object):
+    def setsockopt(self, *args):
+        pass
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendall(self, buf):
+        pass
+
+    def shutdown(self, how):
+        pass
+
+
+def _datapath():
+    dp = controller.Datapath(_Socket(), ('127.0.0.1', 6653))
+    dp.set_version(ofproto_v1_3.OFP_VERSION)
+    return dp
+
+
+def _flow_mods(dp):
+    ofp = dp.ofproto
+    parser = dp.ofproto_parser
+    msgs = []
+    for i in range(MSGS):
+        match = parser.OFPMatch(in_port=1, eth_type=0x0800,
+                                ipv4_dst=(i << 8, 0xffffff00))
+        inst = [parser.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [parser.OFPActionOutput(2)])]
+        msgs.append(parser.OFPFlowMod(dp, priority=1, match=match,
+                                      instructions=inst))
+    return msgs
+
+
+def main():
+    dp = _datapath()
+    msgs = _flow_mods(dp)
+
+    def send(send_msgs):
+        dp = _datapath()
+        for msg in msgs:
+            msg.xid = None
+        thread = hub.spawn(dp._send_loop)
+        send_msgs(dp)
+        dp.send(b'', close_socket=True)
+        hub.joinall([thread])
+
+    def one_by_one(dp):
+        for msg in msgs:
+            dp.send_msg(msg)
+
+    def at_once(dp):
+        dp.send_msgs(msgs)
+
+    before = measure('%d FlowMods (send_msg)' % MSGS,
+                     lambda: send(one_by_one), NUMBER)
+    after = measure('%d FlowMods (send_msgs)' % MSGS,
+                    lambda: send(at_once), NUMBER)
+    print('speedup: %.1fx' % (before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Cost of keeping a networkx graph of 200 switches in a ring with chords
+up to date while links flap, by rebuilding it from the link list as the
+routing apps do, and by ryu.topology.graph.TopologyGraph.
+"""
+
+import networkx
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.tests.benchmark import measure
+from ryu.topology import graph
+from ryu.topology import switches
+
+
+NUMBER = 100
+DPIDS = 200
+
+
+def _port(dpid, port_no):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no, '00:00:00:00:00:01', b'port', 0, 0, 0, 0, 0, 0, 0, 0)
+    return switches.Port(dpid, ofproto_v1_3, ofpport)
+
+
+def _links():
+    links = []
+    for dpid in range(1, DPIDS + 1):
+        for port_no, step in [(1, 1), (2, 7)]:
+            peer = (dpid + step - 1) % DPIDS + 1
+            src = _port(dpid, port_no)
+            dst = _port(peer, port_no + 2)
+            links.append(switches.Link(src, dst))
+            links.append(switches.Link(dst, src))
+    return links
+
+
+def main():
+    links = _links()
+    flapping = links[0]
+    link_set = set(links)
+
+    def rebuild():
+        link_set.discard(flapping)
+        g = networkx.DiGraph()
+        for link in link_set:
+            g.add_edge(link.src.dpid, link.dst.dpid,
+                       src_port=link.src.port_no, dst_port=link.dst.port_no)
+        link_set.add(flapping)
+        return g
+
+    topology = graph.TopologyGraph()
+    for link in links:
+        topology.add_link(link)
+    topology.to_networkx()
+
+    def update():
+        topology.delete_link(flapping)
+        topology.add_link(flapping)
+        return topology.to_networkx()
+
+    base = measure('link flap (rebuild)', rebuild, NUMBER)
+    cost = measure('link flap (in place)', update, NUMBER)
+    print('speedup: %.1fx' % (base / cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -26,11 +26,15 @@ try:
 except ImportError:
     from unittest import mock  # Python 3
 from nose.tools import eq_
+from nose.tools import ok_
 
 from ryu.app import ofctl_rest
 from ryu.app.wsgi import Request
 from ryu.app.wsgi import WSGIApplication
 from ryu.controller.dpset import DPSet
+from ryu.exception import OFPRequestError
+from ryu.exception import OFPRequestTimeout
+from ryu.lib import hub
 from ryu.ofproto import ofproto_protocol
 from ryu.ofproto import ofproto_v1_0
 from ryu.ofproto import ofproto_v1_2
@@ -91,6 +95,122 @@ class Test_ofctl_rest(unittest.TestCase):
             res = req.get_response(wsgi)
         eq_(res.status, '200 OK')
 
+    def test_stats_all(self):
+        dpset = DPSet()
+        dp1 = DummyDatapath(ofproto_v1_3.OFP_VERSION)
+        dp2 = DummyDatapath(ofproto_v1_3.OFP_VERSION)
+        dp2.id = 2
+        dpset._register(dp1)
+        dpset._register(dp2)
+        wsgi = WSGIApplication()
+        ofctl_rest.RestStatsApi(dpset=dpset, wsgi=wsgi)
+
+        def _get_flow_stats(dp, waiters, flow):
+            if dp.id == 2:
+                hub.sleep(1)
+            return {str(dp.id): [flow]}
+
+        req = Request.blank(
+            '/stats/flow/all?dpid=1&dpid=2&dpid=3&timeout=0.1')
+        req.body = json.dumps({'table_id': 1}).encode('utf-8')
+        req.method = 'POST'
+
+        with mock.patch('ryu.lib.ofctl_v1_3.get_flow_stats',
+                        side_effect=_get_flow_stats):
+            res = req.get_response(wsgi)
+        eq_(res.status, '200 OK')
+        eq_({'stats': {'1': [{'table_id': 1}]},
+             'status': {'1': 'ok', '2': 'timeout', '3': 'not_found'}},
+            res.json)
+
+    def test_bulk(self):
+        dpset = DPSet()
+        dp = DummyDatapath(ofproto_v1_3.OFP_VERSION)
+        dpset._register(dp)
+        wsgi = WSGIApplication()
+        ofctl_rest.RestStatsApi(dpset=dpset, wsgi=wsgi)
+
+        entries = [
+            {'dpid': 1, 'priority': 1},
+            {'dpid': 2},
+            {'dpid': 1, 'entry': 'group', 'cmd': 'add', 'group_id': 1},
+            {'dpid': 1, 'cmd': 'unknown'},
+            {'dpid': 1, 'entry': 'meter', 'cmd': 'delete', 'meter_id': 1},
+        ]
+        req = Request.blank('/stats/bulk?barrier=10')
+        req.body = '\n'.join(json.dumps(e) for e in entries).encode('utf-8')
+        req.method = 'POST'
+
+        error = dp.ofproto_parser.OFPErrorMsg(dp, type_=1, code=2)
+        with mock.patch('ryu.lib.ofctl_utils.send_bulk',
+                        return_value=[None, None, OFPRequestError(error)]
+                        ) as send_bulk:
+            res = req.get_response(wsgi)
+        eq_(res.status, '200 OK')
+
+        args, kwargs = send_bulk.call_args
+        eq_(dp, args[0])
+        eq_(['OFPFlowMod', 'OFPGroupMod', 'OFPMeterMod'],
+            [msg.__class__.__name__ for msg in args[1]])
+        eq_((10, False), args[2:])
+        eq_(5, res.json['total'])
+        eq_(2, res.json['succeeded'])
+        eq_([1, 3, 4], [e['index'] for e in res.json['errors']])
+        eq_((1, 2), (res.json['errors'][2]['type'],
+                     res.json['errors'][2]['code']))
+
+    def _flow_stats_stream(self, body, segments, error=False):
+        dpset = DPSet()
+        dp = DummyDatapath(ofproto_v1_3.OFP_VERSION)
+        dpset._register(dp)
+        wsgi = WSGIApplication()
+        ofctl_rest.RestStatsApi(dpset=dpset, wsgi=wsgi)
+
+        req = Request.blank('/stats/flowstream/1')
+        req.body = json.dumps(body).encode('utf-8')
+        req.method = 'POST'
+
+        parser = dp.ofproto_parser
+        replies = [parser.OFPFlowStatsReply(dp, body=[
+            parser.OFPFlowStats(
+                table_id=0, duration_sec=0, duration_nsec=0,
+                priority=priority, idle_timeout=0, hard_timeout=0, flags=0,
+                cookie=cookie, packet_count=0, byte_count=0,
+                match=parser.OFPMatch(), instructions=[], length=56)
+            for cookie, priority in entries]) for entries in segments]
+
+        def _replies():
+            for reply in replies:
+                yield reply
+            if error:
+                raise OFPRequestTimeout(xid=0, timeout=1)
+
+        with mock.patch('ryu.lib.ofctl_utils.send_stats_request_stream',
+                        return_value=_replies()), \
+                mock.patch.object(ofctl_rest, 'STREAM_CHUNK_SIZE', 1):
+            res = req.get_response(wsgi)
+            eq_(res.status, '200 OK')
+            chunks = list(res.app_iter)
+        return chunks, json.loads(b''.join(chunks).decode('utf-8'))
+
+    def test_flow_stats_stream(self):
+        segments = [[(1, 1), (2, 2)], [(3, 1)], [], [(4, 1)]]
+        chunks, ret = self._flow_stats_stream({}, segments)
+        # an entry in each chunk as the chunk size is 1
+        eq_(5, len(chunks))
+        eq_([1, 2, 3, 4], [flow['cookie'] for flow in ret['1']])
+        ok_('error' not in ret)
+
+        # filtered by priority
+        _chunks, ret = self._flow_stats_stream({'priority': 1}, segments)
+        eq_([1, 3, 4], [flow['cookie'] for flow in ret['1']])
+
+    def test_flow_stats_stream_truncated(self):
+        segments = [[(1, 1), (2, 1)]]
+        _chunks, ret = self._flow_stats_stream({}, segments, error=True)
+        eq_([1, 2], [flow['cookie'] for flow in ret['1']])
+        ok_('within 1 seconds' in ret['error'])
+
 
 def _add_tests():
     _ofp_vers = {
@@ -21,6 +21,13 @@ from socket import error as SocketError
 import mock
 
 from ryu.app.ws_topology import WebSocketTopology
+from ryu.lib.packet import arp
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import packet
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import switches
+from ryu.topology.switches import TopologyChange
 
 
 class Test_ws_topology(unittest.TestCase):
@@ -45,10 +52,85 @@ class Test_ws_topology(unittest.TestCase):
         ]
 
         ev_mock = mock.Mock()
-        app._event_link_add_handler(ev_mock)
+        changes = [TopologyChange(1, 'event_link_add', {})]
+        with mock.patch('ryu.app.ws_topology.get_topology_changes',
+                        return_value=changes):
+            app._event_topology_handler(ev_mock)
 
         rpc_client_mock1.get_proxy.assert_called_once_with()
         rpc_client_mock2.get_proxy.assert_called_once_with()
+        self.assertEqual([rpc_client_mock2], app.rpc_clients)
+
+    def test_changes(self):
+        app = WebSocketTopology(wsgi=mock.Mock())
+        rpc_client_mock = mock.Mock()
+        app.rpc_clients = [rpc_client_mock]
+        rpc_server = rpc_client_mock.get_proxy.return_value
+
+        link = {'src': {}, 'dst': {}}
+        host = {'mac': '00:00:00:00:00:01'}
+        changes = [TopologyChange(1, 'event_link_add', link),
+                   TopologyChange(2, 'event_host_add', host)]
+        with mock.patch('ryu.app.ws_topology.get_topology_changes',
+                        return_value=changes) as get_changes:
+            app._event_topology_handler(mock.Mock())
+        get_changes.assert_called_once_with(app, 0)
+        rpc_server.event_link_add.assert_called_once_with(link, 1)
+        rpc_server.event_host_add.assert_called_once_with(host, 2)
+        self.assertEqual(2, app.version)
+
+        # fell behind the changes
+        topology = mock.Mock(version=10)
+        with mock.patch('ryu.app.ws_topology.get_topology_changes',
+                        return_value=None), \
+                mock.patch('ryu.app.ws_topology.get_topology',
+                           return_value=topology):
+            app._event_topology_handler(mock.Mock())
+        rpc_server.event_topology.assert_called_once_with(
+            topology.to_dict.return_value)
+        self.assertEqual(10, app.version)
+
+    def test_host_ip_learned(self):
+        sw = switches.Switches()
+        dp = mock.Mock(id=1, ofproto=ofproto_v1_3,
+                       ofproto_parser=ofproto_v1_3_parser)
+        dp.ports = {1: ofproto_v1_3_parser.OFPPort(
+            1, '00:00:00:00:00:01', b'port', 0, 0, 0, 0, 0, 0, 0, 0)}
+        sw._register(dp)
+        port = sw._get_port(1, 1)
+        sw.hosts.add(switches.Host('00:00:00:00:01:01', port))
+
+        app = WebSocketTopology(wsgi=mock.Mock())
+        app.version = sw.changes.version
+        rpc_client_mock = mock.Mock()
+        app.rpc_clients = [rpc_client_mock]
+        rpc_server = rpc_client_mock.get_proxy.return_value
+
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet(
+            'ff:ff:ff:ff:ff:ff', '00:00:00:00:01:01', 0x0806))
+        pkt.add_protocol(arp.arp_ip(
+            arp.ARP_REQUEST, '00:00:00:00:01:01', '192.0.2.1',
+            '00:00:00:00:00:00', '192.0.2.2'))
+        pkt.serialize()
+        ev = mock.Mock()
+        ev.msg.data = bytes(pkt.data)
+        ev.msg.datapath = dp
+        ev.msg.match = {'in_port': 1}
+
+        # the only event is the one of the learned IP address
+        with mock.patch.object(sw, 'send_event_to_observers') as send:
+            sw.host_discovery_packet_in_handler(ev)
+        self.assertEqual(1, send.call_count)
+        with mock.patch('ryu.app.ws_topology.get_topology_changes',
+                        side_effect=lambda _app, version:
+                        sw.changes.since(version)):
+            app._event_topology_handler(send.call_args[0][0])
+
+        host = rpc_server.event_host_update.call_args[0][0]
+        self.assertEqual('00:00:00:00:01:01', host['mac'])
+        self.assertEqual(['192.0.2.1'], host['ipv4'])
+        self.assertEqual(sw.changes.version, app.version)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nose.tools import eq_
+
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller import handler
+from ryu.controller.handler import CONFIG_DISPATCHER
+from ryu.controller.handler import MAIN_DISPATCHER
+
+
+class _Event(event.EventBase):
+    pass
+
+
+class _App(app_manager.RyuApp):
+    @handler.set_ev_cls(_Event, MAIN_DISPATCHER)
+    def main_handler(self, ev):
+        pass
+
+    @handler.set_ev_cls(_Event, [MAIN_DISPATCHER, CONFIG_DISPATCHER])
+    def main_config_handler(self, ev):
+        pass
+
+    @handler.set_ev_cls(_Event)
+    def any_handler(self, ev):
+        pass
+
+
+class Test_RyuApp(unittest.TestCase):
+    """ Test case for ryu.base.app_manager.RyuApp
+    """
+
+    def setUp(self):
+        self.app = _App()
+        handler.register_instance(self.app)
+
+    def _names(self, handlers):
+        return sorted(h.__name__ for h in handlers)
+
+    def test_get_handlers(self):
+        ev = _Event()
+        eq_(['any_handler', 'main_config_handler', 'main_handler'],
+            self._names(self.app.get_handlers(ev)))
+        eq_(['any_handler', 'main_config_handler', 'main_handler'],
+            self._names(self.app.get_handlers(ev, MAIN_DISPATCHER)))
+        eq_(['any_handler', 'main_config_handler'],
+            self._names(self.app.get_handlers(ev, CONFIG_DISPATCHER)))
+        eq_(['any_handler'],
+            self._names(self.app.get_handlers(ev, handler.DEAD_DISPATCHER)))
+
+    def test_get_handlers_after_register(self):
+        ev = _Event()
+
+        def dynamic_handler(ev):
+            pass
+
+        eq_(2, len(self.app.get_handlers(ev, CONFIG_DISPATCHER)))
+        self.app.register_handler(_Event, dynamic_handler)
+        eq_(['any_handler', 'dynamic_handler', 'main_config_handler'],
+            self._names(self.app.get_handlers(ev, CONFIG_DISPATCHER)))
+        self.app.unregister_handler(_Event, dynamic_handler)
+        eq_(['any_handler', 'main_config_handler'],
+            self._names(self.app.get_handlers(ev, CONFIG_DISPATCHER)))
+
+
+class _PriorityEvent(event.EventBase):
+    pass
+
+
+class _OverflowEvent(event.EventBase):
+    def __init__(self, n):
+        super(_OverflowEvent, self).__init__()
+        self.n = n
+
+
+class Test_EventQueue(unittest.TestCase):
+    """ Test case for ryu.base.app_manager.EventQueue
+    """
+
+    def _queue(self, policy):
+        return app_manager.EventQueue(
+            3, priority_events=[_PriorityEvent],
+            overflow_events=[_OverflowEvent],
+            overflow_policy=policy, sample_rate=2)
+
+    def _drain(self, q):
+        items = []
+        while not q.empty():
+            items.append(q.get()[0])
+        return items
+
+    def test_priority_lane(self):
+        q = self._queue(app_manager.EVENT_OVERFLOW_BLOCK)
+        ev1 = _Event()
+        ev2 = _PriorityEvent()
+        ev3 = _Event()
+        ev4 = _PriorityEvent()
+        for ev in (ev1, ev2, ev3, ev4):
+            q.put((ev, None))
+        eq_(4, q.qsize())
+        eq_([ev2, ev4, ev1, ev3], self._drain(q))
+
+    def _test_overflow(self, policy, expected, dropped):
+        q = self._queue(policy)
+        ev = _Event()
+        q.put((ev, None))
+        for n in range(5):
+            q.put((_OverflowEvent(n), None))
+        items = self._drain(q)
+        eq_(ev, items[0])
+        eq_(expected, [i.n for i in items[1:]])
+        eq_(dropped, q.dropped)
+
+    def test_overflow_drop_newest(self):
+        self._test_overflow(app_manager.EVENT_OVERFLOW_DROP_NEWEST,
+                            [0, 1], 3)
+
+    def test_overflow_drop_oldest(self):
+        self._test_overflow(app_manager.EVENT_OVERFLOW_DROP_OLDEST,
+                            [3, 4], 3)
+
+    def test_overflow_sample(self):
+        self._test_overflow(app_manager.EVENT_OVERFLOW_SAMPLE,
+                            [1, 3], 3)
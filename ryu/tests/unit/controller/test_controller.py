@@ -29,12 +29,14 @@ import logging
 import random
 import unittest
 
-from nose.tools import eq_, raises
+from nose.tools import eq_, ok_, raises
 
 from ryu.base import app_manager  # To suppress cyclic import
+from ryu import exception
 from ryu.controller import controller
 from ryu.controller import handler
 from ryu.lib import hub
+from ryu.ofproto import ofproto_v1_3
 from ryu.ofproto import ofproto_v1_3_parser
 from ryu.ofproto import ofproto_v1_2_parser
 from ryu.ofproto import ofproto_v1_0_parser
@@ -153,6 +155,11 @@ class Test_Datapath(unittest.TestCase):
                 self.buf = self.buf[size:]
                 return out
 
+            def recv_into(self, buf):
+                out = self.recv(len(buf))
+                buf[:len(out)] = out
+                return len(out)
+
         # Prepare mock
         ofp_brick_mock = mock.MagicMock(spec=app_manager.RyuApp)
         app_manager_mock.lookup_service_brick.return_value = ofp_brick_mock
@@ -181,6 +188,244 @@ class Test_Datapath(unittest.TestCase):
             self.assertEqual(kwargs, {})
         self.assertEqual(expected_json, output_json)
 
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_send_loop_coalesce(self, app_manager_mock):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.max_send_batch_size = 6
+
+        dp.send(b'\x01\x02')
+        dp.send(b'\x03\x04')
+        dp.send(b'\x05\x06')
+        dp.send(b'\x07\x08', close_socket=True)
+
+        dp._send_loop()
+
+        eq_([mock.call(b'\x01\x02\x03\x04\x05\x06'),
+             mock.call(b'\x07\x08')],
+            sock_mock.sendall.call_args_list)
+        eq_(8, dp.sent_bytes)
+        eq_(4, dp.sent_msgs)
+        eq_(2, dp.send_flushes)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_send_priority_lane(self, app_manager_mock):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.max_send_batch_size = 1
+
+        flow_mod = ofproto_v1_3_parser.OFPFlowMod(dp)
+        echo_reply = ofproto_v1_3_parser.OFPEchoReply(dp, data=b'')
+        dp.send_msg(flow_mod)
+        dp.send_msg(echo_reply)
+        dp.send(b'\x00', close_socket=True)
+        eq_(3, dp.send_q_len)
+        eq_(3, dp.send_q_high_water)
+        eq_(0, dp.send_q_wait_count)
+
+        dp._send_loop()
+
+        eq_([mock.call(echo_reply.buf),
+             mock.call(flow_mod.buf),
+             mock.call(b'\x00')],
+            sock_mock.sendall.call_args_list)
+        eq_(0, dp.send_q_len)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_send_msgs(self, app_manager_mock):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.xid = 10
+
+        msgs = [ofproto_v1_3_parser.OFPFlowMod(dp) for _ in range(3)]
+        ok_(dp.send_msgs(msgs))
+        eq_(1, dp.send_q_len)
+        dp.send(b'\x00', close_socket=True)
+
+        dp._send_loop()
+
+        eq_([11, 12, 13], [msg.xid for msg in msgs])
+        eq_([mock.call(b''.join(bytes(msg.buf) for msg in msgs) + b'\x00')],
+            sock_mock.sendall.call_args_list)
+        eq_(2, dp.sent_msgs)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_batch(self, app_manager_mock):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        barrier = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+        dp.max_send_batch_size = 2 * ofproto_v1_3.OFP_HEADER_SIZE
+
+        with dp.batch() as batch:
+            for _ in range(5):
+                batch.send_msg(ofproto_v1_3_parser.OFPBarrierRequest(dp))
+        # flushed each time two messages are serialized, then on exit
+        eq_(3, dp.send_q_len)
+
+        try:
+            with dp.batch() as batch:
+                batch.send_msg(barrier)
+                raise ValueError()
+        except ValueError:
+            pass
+        eq_(3, dp.send_q_len)
+
+        # the messages flushed by the size limit are sent
+        try:
+            with dp.batch() as batch:
+                for _ in range(3):
+                    batch.send_msg(ofproto_v1_3_parser.OFPBarrierRequest(dp))
+                raise ValueError()
+        except ValueError:
+            pass
+        eq_(4, dp.send_q_len)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_batch_send_buf(self, app_manager_mock):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.xid = 10
+        barrier = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+        barrier.set_xid(0)
+        barrier.serialize()
+        buf = bytes(barrier.buf)
+
+        with dp.batch() as batch:
+            eq_([11, 12], [batch.send_buf(buf), batch.send_buf(buf)])
+        dp.send(b'\x00', close_socket=True)
+
+        dp._send_loop()
+
+        expected = bytearray()
+        for xid in [11, 12]:
+            barrier = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+            barrier.set_xid(xid)
+            barrier.serialize()
+            expected += barrier.buf
+        eq_([mock.call(expected + b'\x00')],
+            sock_mock.sendall.call_args_list)
+
+    def _request_dp(self):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        with mock.patch("ryu.base.app_manager", spec=app_manager):
+            dp = controller.Datapath(sock_mock, addr_mock)
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        return dp
+
+    @staticmethod
+    def _reply(msg, xid):
+        # Set the header fields as the parser does.
+        msg.msg_type = msg.cls_msg_type
+        msg.xid = xid
+        return msg
+
+    def test_request_multipart(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPPortDescStatsRequest(dp)
+        future = dp.request(req)
+        ok_(not future.done())
+
+        rep1 = self._reply(ofproto_v1_3_parser.OFPPortDescStatsReply(
+            dp, body=[], flags=ofproto_v1_3.OFPMPF_REPLY_MORE), req.xid)
+        rep2 = self._reply(ofproto_v1_3_parser.OFPPortDescStatsReply(
+            dp, body=[], flags=0), req.xid)
+        other = self._reply(ofproto_v1_3_parser.OFPPortDescStatsReply(
+            dp, body=[], flags=0), req.xid + 1)
+
+        dp._handle_reply(rep1)
+        ok_(not future.done())
+        dp._handle_reply(other)
+        dp._handle_reply(rep2)
+        ok_(future.done())
+        eq_([rep1, rep2], future.result())
+        eq_(0, len(dp._requests))
+
+    def test_request_stream(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPPortDescStatsRequest(dp)
+        future = dp.request(req)
+        stream = future.stream()
+
+        rep1 = self._reply(ofproto_v1_3_parser.OFPPortDescStatsReply(
+            dp, body=[], flags=ofproto_v1_3.OFPMPF_REPLY_MORE), req.xid)
+        rep2 = self._reply(ofproto_v1_3_parser.OFPPortDescStatsReply(
+            dp, body=[], flags=0), req.xid)
+
+        dp._handle_reply(rep1)
+        eq_(rep1, next(stream))
+        eq_([], future.msgs)
+        dp._handle_reply(rep2)
+        eq_([rep2], list(stream))
+
+    def test_request_cancel(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPFlowMod(dp)
+        future = dp.request(req)
+        ok_(future.cancel())
+        ok_(future.done())
+        eq_([], future.result())
+        eq_(0, len(dp._requests))
+        ok_(not future.cancel())
+
+    def test_request_error(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+        future = dp.request(req)
+
+        err = self._reply(ofproto_v1_3_parser.OFPErrorMsg(
+            dp, type_=1, code=1), req.xid)
+        dp._handle_reply(err)
+        ok_(isinstance(future.exception(), exception.OFPRequestError))
+        eq_(err, future.exception().error_msg)
+
+    def test_request_timeout(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+        future = dp.request(req, timeout=0.1)
+        ok_(future.wait())
+        ok_(isinstance(future.exception(), exception.OFPRequestTimeout))
+        eq_(0, len(dp._requests))
+
+    @mock.patch('ryu.controller.controller.time')
+    def test_request_expired(self, time_):
+        time_.time.return_value = 100
+        dp = self._request_dp()
+        futures = [dp.request(ofproto_v1_3_parser.OFPBarrierRequest(dp),
+                              timeout=timeout)
+                   for timeout in [1, 10, None]]
+
+        # expired when another request is sent
+        time_.time.return_value = 102
+        future = dp.request(ofproto_v1_3_parser.OFPBarrierRequest(dp))
+        ok_(futures[0].done())
+        ok_(isinstance(futures[0].exception(), exception.OFPRequestTimeout))
+        ok_(not futures[1].done())
+        ok_(not futures[2].done())
+        eq_(sorted(f.xid for f in futures[1:] + [future]),
+            sorted(dp._requests))
+
+    def test_request_dropped(self):
+        dp = self._request_dp()
+        dp.request(ofproto_v1_3_parser.OFPBarrierRequest(dp))
+        eq_(0, len(dp._requests))
+
+    def test_request_aborted(self):
+        dp = self._request_dp()
+        req = ofproto_v1_3_parser.OFPBarrierRequest(dp)
+        future = dp.request(req)
+        dp._abort_requests()
+        self.assertRaises(exception.OFPRequestAborted, future.result)
+
 
 class TestOpenFlowController(unittest.TestCase):
     """
@@ -194,6 +439,7 @@ class TestOpenFlowController(unittest.TestCase):
         conf_mock.ciphers = None
         conf_mock.ctl_cert = os.path.join(this_dir, 'cert.crt')
         conf_mock.ctl_privkey = os.path.join(this_dir, 'cert.key')
+        conf_mock.ofp_lazy_decoding = False
         c = controller.OpenFlowController()
         c()
 
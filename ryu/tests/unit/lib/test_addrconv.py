@@ -16,6 +16,9 @@
 
 import unittest
 from nose.tools import eq_
+from nose.tools import raises
+
+import netaddr
 
 from ryu.lib import addrconv
 
@@ -54,3 +57,28 @@ class Test_addrconv(unittest.TestCase):
     def test_mac(self):
         self._test_conv(addrconv.mac, 'f2:0b:a4:01:0a:23',
                         b'\xf2\x0b\xa4\x01\x0a\x23')
+
+    def test_ipv4_cidr(self):
+        eq_(addrconv.ipv4.text_to_bin('192.0.2.0/24'),
+            (b'\xc0\x00\x02\x00', b'\xff\xff\xff\x00'))
+
+    def test_ipv6_cidr(self):
+        eq_(addrconv.ipv6.text_to_bin('2001:db8::/32'),
+            (b'\x20\x01\x0d\xb8' + b'\x00' * 12,
+             b'\xff\xff\xff\xff' + b'\x00' * 12))
+
+    def test_ipv4_bytearray(self):
+        eq_(addrconv.ipv4.bin_to_text(bytearray(b'\x7f\x00\x00\x01')),
+            '127.0.0.1')
+
+    def test_mac_other_forms(self):
+        bin_value = b'\xf2\x0b\xa4\x01\x0a\x23'
+        eq_(addrconv.mac.text_to_bin('F2:0B:A4:01:0A:23'), bin_value)
+        eq_(addrconv.mac.text_to_bin('f2-0b-a4-01-0a-23'), bin_value)
+        eq_(addrconv.mac.text_to_bin('f2:b:a4:1:a:23'), bin_value)
+        eq_(addrconv.mac.bin_to_text(bytearray(bin_value)),
+            'f2:0b:a4:01:0a:23')
+
+    @raises(netaddr.AddrFormatError)
+    def test_mac_invalid(self):
+        addrconv.mac.text_to_bin('f2:0b:a4:01:0a:zz')
@@ -0,0 +1,98 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nose.tools import eq_, ok_
+
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller import handler
+from ryu.lib import handler_stats
+
+
+class _Event(event.EventBase):
+    pass
+
+
+class Test_handler_stats(unittest.TestCase):
+    """ Test case for ryu.lib.handler_stats
+    """
+
+    def setUp(self):
+        # Defined here as other tests may reload app_manager.
+        class _App(app_manager.RyuApp):
+            @handler.set_ev_cls(_Event)
+            def good_handler(self, ev):
+                pass
+
+            @handler.set_ev_cls(_Event)
+            def bad_handler(self, ev):
+                raise ValueError()
+
+        self.app = _App()
+        handler.register_instance(self.app)
+        self.app.is_active = False
+
+    def tearDown(self):
+        handler_stats.disable()
+
+    def _run(self, count):
+        for _ in range(count):
+            self.app._send_event(_Event(), None)
+        self.app._event_loop()
+
+    def test_disabled(self):
+        self._run(3)
+        eq_({}, self.app.handler_stats)
+        eq_(3, self.app.events.high_water)
+
+    def test_enabled(self):
+        handler_stats.enable()
+        self._run(3)
+
+        good = self.app.handler_stats[('good_handler', '_Event')]
+        bad = self.app.handler_stats[('bad_handler', '_Event')]
+        eq_(3, good.calls)
+        eq_(0, good.errors)
+        eq_(3, bad.calls)
+        eq_(3, bad.errors)
+        eq_(3, sum(good.buckets))
+
+        stats = handler_stats.get_stats([self.app])
+        ok_(stats['enabled'])
+        app_stats = stats['apps']['_App']
+        eq_(3, app_stats['event_queue']['high_water'])
+        eq_(2, len(app_stats['handlers']))
+
+    def test_prometheus(self):
+        handler_stats.enable()
+        self._run(2)
+
+        text = handler_stats.to_prometheus([self.app])
+        lines = text.splitlines()
+        ok_('# TYPE ryu_handler_latency_seconds histogram' in lines)
+        ok_('ryu_app_event_queue_high_water{app="_App"} 2' in lines)
+        ok_('ryu_handler_errors_total'
+            '{app="_App",event="_Event",handler="bad_handler"} 2' in lines)
+        ok_('ryu_handler_latency_seconds_bucket'
+            '{app="_App",event="_Event",handler="good_handler",le="+Inf"} 2'
+            in lines)
+        ok_('ryu_handler_latency_seconds_count'
+            '{app="_App",event="_Event",handler="good_handler"} 2' in lines)
+
+    def test_prometheus_escape(self):
+        self.app.name = 'a\\b"c\nd'
+        text = handler_stats.to_prometheus([self.app])
+        ok_('ryu_app_event_queue_length{app="a\\\\b\\"c\\nd"} 0'
+            in text.splitlines())
@@ -16,17 +16,27 @@
 import functools
 import json
 import logging
+from nose.tools import assert_raises
 from nose.tools import eq_
+from nose.tools import ok_
 import os
 import sys
 import unittest
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
 
+from ryu.exception import OFPRequestTimeout
 from ryu.lib import ofctl_v1_0
 from ryu.lib import ofctl_v1_2
 from ryu.lib import ofctl_v1_3
 from ryu.lib import ofctl_v1_4
 from ryu.lib import ofctl_v1_5
 from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_4
+from ryu.ofproto import ofproto_v1_5
 from ryu.ofproto.ofproto_protocol import ProtocolDesc
 from ryu.tests import test_lib
 
@@ -113,6 +123,74 @@ class Test_ofctl(unittest.TestCase):
             raise e
 
 
+class Test_ofctl_flow_stats_stream(unittest.TestCase):
+
+    def _reply(self, dp, name):
+        this_dir = os.path.dirname(sys.modules[__name__].__file__)
+        ofp_ver = {
+            ofproto_v1_3.OFP_VERSION: 'of13',
+            ofproto_v1_4.OFP_VERSION: 'of14',
+            ofproto_v1_5.OFP_VERSION: 'of15',
+        }[dp.ofproto.OFP_VERSION]
+        path = os.path.join(this_dir, '../ofproto/json', ofp_ver, name)
+        return ofproto_parser.ofp_msg_from_jsondict(
+            dp, json.load(open(path)))
+
+    def _flows(self, ofctl, dp, reply, flow):
+        # the result of get_flow_stats() for the same reply
+        waiters = {}
+        dp.set_reply(reply, waiters)
+        return ofctl.get_flow_stats(dp, waiters, flow)[str(dp.id)]
+
+    def _test(self, ofctl, version, name):
+        dp = DummyDatapath(version)
+        reply = self._reply(dp, name)
+        flows = self._flows(ofctl, dp, reply, {})
+
+        # a multipart reply of two segments
+        with mock.patch('ryu.lib.ofctl_utils.send_stats_request_stream',
+                        return_value=iter([reply, reply])) as send:
+            entries = ofctl.get_flow_stats_stream(dp)
+            eq_(1, send.call_count)
+            eq_(flows + flows, list(entries))
+        eq_('OFPFlowStatsRequest', send.call_args[0][1].__class__.__name__)
+
+        # filtered by priority
+        priority = reply.body[0].priority
+        filtered = [f for f in flows if f['priority'] == priority]
+        ok_(filtered)
+        flow = {'priority': priority}
+        with mock.patch('ryu.lib.ofctl_utils.send_stats_request_stream',
+                        return_value=iter([reply, reply])):
+            eq_(filtered + filtered,
+                list(ofctl.get_flow_stats_stream(dp, flow)))
+
+        # the entries received before an error are yielded
+        def _segments():
+            yield reply
+            raise OFPRequestTimeout(xid=0, timeout=1)
+
+        entries = []
+        with mock.patch('ryu.lib.ofctl_utils.send_stats_request_stream',
+                        return_value=_segments()):
+            with assert_raises(OFPRequestTimeout):
+                for entry in ofctl.get_flow_stats_stream(dp):
+                    entries.append(entry)
+        eq_(flows, entries)
+
+    def test_of13(self):
+        self._test(ofctl_v1_3, ofproto_v1_3.OFP_VERSION,
+                   '4-12-ofp_flow_stats_reply.packet.json')
+
+    def test_of14(self):
+        self._test(ofctl_v1_4, ofproto_v1_4.OFP_VERSION,
+                   '5-12-ofp_flow_stats_reply.packet.json')
+
+    def test_of15(self):
+        self._test(ofctl_v1_5, ofproto_v1_5.OFP_VERSION,
+                   'libofproto-OFP15-flow_stats_reply.packet.json')
+
+
 def _add_tests():
     _ofp_vers = {
         'of10': 0x01,
@@ -15,9 +15,18 @@
 
 import logging
 import unittest
-
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+from ryu.base import app_manager  # To suppress cyclic import
+from ryu import exception
+from ryu.controller import controller
+from ryu.lib import hub
 from ryu.lib import ofctl_utils
 from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
 
 
 LOG = logging.getLogger(__name__)
@@ -140,3 +149,71 @@ class Test_ofctl_utils(unittest.TestCase):
             'ALL',
             self.util.ofp_queue_to_user(ofproto_v1_3.OFPQ_ALL)
         )
+
+    def test_send_bulk(self):
+        with mock.patch("ryu.base.app_manager", spec=app_manager):
+            dp = controller.Datapath(mock.MagicMock(), mock.MagicMock())
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.id = 1
+        parser = ofproto_v1_3_parser
+        msgs = [parser.OFPFlowMod(dp) for _ in range(3)]
+
+        thr = hub.spawn(ofctl_utils.send_bulk, dp, msgs, 2, raise_error=True)
+        # Wait for 3 flow mods and 2 barrier requests to be sent
+        with hub.Timeout(1):
+            while len(dp._requests) < 5:
+                hub.sleep(0.01)
+        barrier_xids = set(dp._requests) - set(msg.xid for msg in msgs)
+
+        error = parser.OFPErrorMsg(dp, type_=1, code=1)
+        error.msg_type = error.cls_msg_type
+        error.xid = msgs[1].xid
+        dp._handle_reply(error)
+        for xid in sorted(barrier_xids):
+            reply = parser.OFPBarrierReply(dp)
+            reply.msg_type = reply.cls_msg_type
+            reply.xid = xid
+            dp._handle_reply(reply)
+
+        results = thr.wait()
+        self.assertEqual(None, results[0])
+        self.assertTrue(isinstance(results[1], exception.OFPRequestError))
+        self.assertEqual(error, results[1].error_msg)
+        self.assertEqual(None, results[2])
+        self.assertEqual({}, dp._requests)
+
+    def test_send_stats_request_stream(self):
+        with mock.patch("ryu.base.app_manager", spec=app_manager):
+            dp = controller.Datapath(mock.MagicMock(), mock.MagicMock())
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.id = 1
+        parser = ofproto_v1_3_parser
+
+        def _reply(msg, xid):
+            msg.msg_type = msg.cls_msg_type
+            msg.xid = xid
+            return msg
+
+        for error in [False, True]:
+            stats = parser.OFPFlowStatsRequest(dp)
+            msgs = ofctl_utils.send_stats_request_stream(dp, stats)
+            # The request is sent before the replies are consumed
+            self.assertTrue(stats.xid in dp._requests)
+
+            replies = [_reply(parser.OFPFlowStatsReply(
+                dp, body=[], flags=ofproto_v1_3.OFPMPF_REPLY_MORE),
+                stats.xid) for _ in range(2)]
+            for reply in replies:
+                dp._handle_reply(reply)
+            self.assertEqual(replies[0], next(msgs))
+            if error:
+                dp._handle_reply(_reply(parser.OFPErrorMsg(
+                    dp, type_=1, code=1), stats.xid))
+                self.assertEqual(replies[1], next(msgs))
+                self.assertRaises(exception.OFPRequestError, next, msgs)
+            else:
+                last = _reply(parser.OFPFlowStatsReply(
+                    dp, body=[], flags=0), stats.xid)
+                dp._handle_reply(last)
+                self.assertEqual([replies[1], last], list(msgs))
+            self.assertEqual(0, len(dp._requests))
@@ -32,6 +32,16 @@ class C1(stringify.StringifyMixin):
         self.c = c
 
 
+class C2(stringify.StringifyMixin):
+    __slots__ = ('a', 'b', '_c')
+
+    def __init__(self, a, b=None):
+        self.a = a
+        if b is not None:
+            self.b = b
+        self._c = 'C'
+
+
 class Test_stringify(unittest.TestCase):
     """ Test case for ryu.lib.stringify
     """
@@ -73,3 +83,16 @@ class Test_stringify(unittest.TestCase):
         eq_(c.__class__, c2.__class__)
         eq_(c.__dict__, c2.__dict__)
         eq_(j, c.to_jsondict(encode_string=my_encode))
+
+    def test_slots(self):
+        c = C2(a=1, b=2)
+        eq_(False, hasattr(c, '__dict__'))
+        eq_({'C2': {'a': 1, 'b': 2}}, c.to_jsondict())
+        eq_('C2(a=1,b=2)', str(c))
+        c2 = C2.from_jsondict({'a': 1, 'b': 2})
+        eq_((1, 2), (c2.a, c2.b))
+
+    def test_slots_unset(self):
+        c = C2(a=1)
+        eq_({'C2': {'a': 1}}, c.to_jsondict())
+        eq_('C2(a=1)', str(c))
@@ -18,13 +18,17 @@
 import six
 
 import binascii
+import os
+import sys
 import unittest
 from nose.tools import *
 import struct
 from ryu import exception
 
 from ryu.ofproto import ofproto_common, ofproto_parser
+from ryu.ofproto import ofproto_protocol
 from ryu.ofproto import ofproto_v1_0, ofproto_v1_0_parser
+from ryu.ofproto import ofproto_v1_3
 
 import logging
 LOG = logging.getLogger(__name__)
@@ -242,3 +246,62 @@ class TestMsgStrAttr(unittest.TestCase):
         str_ = str_.rsplit()
         eq_('check', str_[0])
         eq_('msg_str_attr_test', str_[1])
+
+
+class TestLazyDecoding(unittest.TestCase):
+    """ Test case for lazy decoding of messages
+    """
+
+    def tearDown(self):
+        ofproto_parser.disable_lazy_decoding()
+
+    def _read(self, name):
+        this_dir = os.path.dirname(sys.modules[__name__].__file__)
+        return open(os.path.join(this_dir, '../../packet_data/of13', name),
+                    'rb').read()
+
+    def _parse(self, name):
+        return self._parse_buf(self._read(name))
+
+    def _parse_buf(self, buf):
+        dp = ofproto_protocol.ProtocolDesc(version=ofproto_v1_3.OFP_VERSION)
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+        return ofproto_parser.msg(dp, version, msg_type, msg_len, xid, buf)
+
+    def test_packet_in(self):
+        msg = self._parse('4-4-ofp_packet_in.packet')
+        ofproto_parser.enable_lazy_decoding()
+        lazy_msg = self._parse('4-4-ofp_packet_in.packet')
+
+        ok_('match' not in lazy_msg.__dict__)
+        eq_(msg.data, lazy_msg.data)
+        ok_('match' not in lazy_msg.__dict__)
+        eq_(str(msg.match), str(lazy_msg.match))
+        ok_('match' in lazy_msg.__dict__)
+        eq_(msg.to_jsondict(), lazy_msg.to_jsondict())
+
+    def test_flow_stats_reply(self):
+        msg = self._parse('4-12-ofp_flow_stats_reply.packet')
+        ofproto_parser.enable_lazy_decoding()
+        lazy_msg = self._parse('4-12-ofp_flow_stats_reply.packet')
+
+        eq_(msg.flags, lazy_msg.flags)
+        ok_('body' not in lazy_msg.__dict__)
+        stats = lazy_msg.body[0]
+        ok_('instructions' not in stats.__dict__)
+        eq_(msg.body[0].cookie, stats.cookie)
+        eq_(str(msg.body[0].instructions), str(stats.instructions))
+        eq_(msg.to_jsondict(), lazy_msg.to_jsondict())
+
+    def test_malformed_body(self):
+        buf = bytearray(self._read('4-12-ofp_flow_stats_reply.packet'))
+        # the length of the first flow stats entry exceeds the message
+        struct.pack_into('!H', buf, ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE,
+                         0x200)
+        ofproto_parser.enable_lazy_decoding()
+        lazy_msg = self._parse_buf(bytes(buf))
+
+        # the parse error is raised on every access
+        for _ in range(2):
+            assert_raises(struct.error, getattr, lazy_msg, 'body')
+        assert_raises(struct.error, str, lazy_msg)
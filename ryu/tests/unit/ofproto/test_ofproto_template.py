@@ -0,0 +1,129 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_5
+from ryu.ofproto.ofproto_template import MsgTemplate
+
+
+class TestMsgTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.dp = ofproto_protocol.ProtocolDesc(ofproto_v1_3.OFP_VERSION)
+
+    def _flow_mod(self, dp, xid, in_port, eth_dst, out_port,
+                  metadata=(0x10, 0xf0), priority=1, buffer_id=0xffffffff):
+        ofp = dp.ofproto
+        parser = dp.ofproto_parser
+        match = parser.OFPMatch(in_port=in_port, eth_dst=eth_dst,
+                                metadata=metadata)
+        inst = [parser.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [parser.OFPActionOutput(out_port)])]
+        msg = parser.OFPFlowMod(dp, priority=priority, buffer_id=buffer_id,
+                                match=match, instructions=inst)
+        msg.set_xid(xid)
+        msg.serialize()
+        return msg
+
+    def _packet_out(self, dp, xid, in_port, out_port, data):
+        parser = dp.ofproto_parser
+        actions = [parser.OFPActionOutput(out_port)]
+        if dp.ofproto.OFP_VERSION >= ofproto_v1_5.OFP_VERSION:
+            msg = parser.OFPPacketOut(dp, match=parser.OFPMatch(
+                in_port=in_port), actions=actions, data=data)
+        else:
+            msg = parser.OFPPacketOut(dp, buffer_id=0xffffffff,
+                                      in_port=in_port, actions=actions,
+                                      data=data)
+        msg.set_xid(xid)
+        msg.serialize()
+        return msg
+
+    def test_flow_mod(self):
+        tmpl = MsgTemplate(
+            self._flow_mod(self.dp, 1, 1, '00:00:00:00:00:01', 1))
+        ok_(set(['in_port', 'eth_dst', 'metadata', 'output', 'priority',
+                 'buffer_id']) <= set(tmpl.fields))
+
+        buf = tmpl.render(xid=100, in_port=2, eth_dst='0a:0b:0c:0d:0e:0f',
+                          output=3, priority=10, buffer_id=5,
+                          metadata=(0x20, 0xf0))
+        msg = self._flow_mod(self.dp, 100, 2, '0a:0b:0c:0d:0e:0f', 3,
+                             metadata=(0x20, 0xf0), priority=10,
+                             buffer_id=5)
+        eq_(bytes(msg.buf), bytes(buf))
+
+        # the template itself is not modified
+        eq_(bytes(self._flow_mod(self.dp, 0, 1, '00:00:00:00:00:01', 1).buf),
+            bytes(tmpl.render()))
+
+    def _test_packet_out(self, dp):
+        tmpl = MsgTemplate(self._packet_out(dp, 1, 1, 2, b'\x00' * 60))
+        eq_(bytes(self._packet_out(dp, 7, 3, 4, b'\x01' * 42).buf),
+            bytes(tmpl.render(7, b'\x01' * 42, in_port=3, output=4)))
+        eq_(bytes(self._packet_out(dp, 7, 1, 2, b'\x00' * 60).buf),
+            bytes(tmpl.render(7)))
+
+    def test_packet_out(self):
+        self._test_packet_out(self.dp)
+
+    def test_packet_out_v1_5(self):
+        self._test_packet_out(
+            ofproto_protocol.ProtocolDesc(ofproto_v1_5.OFP_VERSION))
+
+    def test_send(self):
+        tmpl = MsgTemplate(self._packet_out(self.dp, 1, 1, 2, b''))
+        dp = mock.Mock()
+        dp.next_xid.return_value = 10
+        eq_(10, tmpl.send(dp, output=3))
+        dp.send.assert_called_once_with(tmpl.render(10, output=3))
+
+    @raises(ValueError)
+    def test_unknown_field(self):
+        tmpl = MsgTemplate(
+            self._flow_mod(self.dp, 1, 1, '00:00:00:00:00:01', 1))
+        tmpl.render(ipv4_src='192.0.2.1')
+
+    @raises(ValueError)
+    def test_mask_mismatch(self):
+        tmpl = MsgTemplate(
+            self._flow_mod(self.dp, 1, 1, '00:00:00:00:00:01', 1))
+        tmpl.render(metadata=0x20)
+
+    def test_multiple_outputs(self):
+        parser = self.dp.ofproto_parser
+        msg = parser.OFPPacketOut(
+            self.dp, buffer_id=1, in_port=1,
+            actions=[parser.OFPActionOutput(1), parser.OFPActionOutput(2)])
+        ok_('output' not in MsgTemplate(msg).fields)
+
+    @raises(ValueError)
+    def test_unsupported_version(self):
+        dp = ofproto_protocol.ProtocolDesc(ofproto_v1_0.OFP_VERSION)
+        MsgTemplate(dp.ofproto_parser.OFPPacketOut(
+            dp, 0xffffffff, 1, [dp.ofproto_parser.OFPActionOutput(1)]))
+
+    @raises(ValueError)
+    def test_unsupported_msg(self):
+        MsgTemplate(self.dp.ofproto_parser.OFPBarrierRequest(self.dp))
@@ -26,12 +26,19 @@ class Test_OXM(unittest.TestCase):
         buf = bytearray()
         ofp.oxm_serialize(n, v, m, buf, 0)
         self.assertEqual(on_wire, buf)
+        buf = bytearray()
+        l = ofp.oxm_serialize_user(f, uv, buf, 0)
+        self.assertEqual(on_wire, buf)
+        self.assertEqual(len(on_wire), l)
 
     def _test_decode(self, user, on_wire):
         (n, v, m, l) = ofp.oxm_parse(on_wire, 0)
         self.assertEqual(len(on_wire), l)
         (f, uv) = ofp.oxm_to_user(n, v, m)
         self.assertEqual(user, (f, uv))
+        (f, uv, l) = ofp.oxm_parse_user(on_wire, 0)
+        self.assertEqual(user, (f, uv))
+        self.assertEqual(len(on_wire), l)
 
     def _test_encode_header(self, user, on_wire):
         f = user
@@ -186,3 +193,56 @@ class Test_OXM(unittest.TestCase):
             b'fugafuga'
         )
         self._test(user, on_wire, 4)
+
+    def test_basic_int_nomask(self):
+        user = ('tcp_dst', 80)
+        on_wire = (
+            b'\x80\x00\x1c\x02'
+            b'\x00\x50'
+        )
+        self._test(user, on_wire, 4)
+
+    def test_basic_int_mask(self):
+        user = ('metadata', (0x1234, 0xff00))
+        on_wire = (
+            b'\x80\x00\x05\x10'
+            b'\x00\x00\x00\x00\x00\x00\x12\x34'
+            b'\x00\x00\x00\x00\x00\x00\xff\x00'
+        )
+        self._test(user, on_wire, 4)
+
+    def test_basic_mac_mask(self):
+        user = ('eth_dst', ('01:00:5e:00:00:00', 'ff:ff:ff:80:00:00'))
+        on_wire = (
+            b'\x80\x00\x07\x0c'
+            b'\x01\x00\x5e\x00\x00\x00'
+            b'\xff\xff\xff\x80\x00\x00'
+        )
+        self._test(user, on_wire, 4)
+
+    def _test_encode_generic(self, user):
+        # compare the table driven encoder with the generic one
+        # for user values which do not round trip.
+        (f, uv) = user
+        (n, v, m) = ofp.oxm_from_user(f, uv)
+        expected = bytearray()
+        ofp.oxm_serialize(n, v, m, expected, 0)
+        buf = bytearray()
+        ofp.oxm_serialize_user(f, uv, buf, 0)
+        self.assertEqual(expected, buf)
+
+    def test_encode_int_out_of_range(self):
+        self._test_encode_generic(('eth_type', 0x10800))
+        self._test_encode_generic(('vlan_vid', -1))
+        self._test_encode_generic(('in_port', (True, 0xffffffff)))
+
+    def test_encode_cidr(self):
+        self._test_encode_generic(('ipv4_src', '192.0.2.0/24'))
+        self._test_encode_generic(('ipv6_dst', '2001:db8::/32'))
+        self._test_encode_generic(('ipv4_dst', ['192.0.2.1', '255.0.0.0']))
+
+    def test_encode_offset(self):
+        buf = bytearray(b'\xaa' * 8)
+        l = ofp.oxm_serialize_user('in_port', 1, buf, 2)
+        self.assertEqual(8, l)
+        self.assertEqual(b'\xaa\xaa\x80\x00\x00\x04\x00\x00\x00\x01', buf)
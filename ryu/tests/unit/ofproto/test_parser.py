@@ -303,6 +303,23 @@ def _add_tests():
             test_lib.add_method(Test_Parser, method_name, f)
             cases.add(method_name)
             n_added += 1
+
+            # The same with lazy decoding, which only OpenFlow 1.3 or
+            # later parsers support.
+            if truncated or ver in ('of10', 'of12'):
+                continue
+
+            def _run_lazy(self, name, wire_msg, json_str):
+                ofproto_parser.enable_lazy_decoding()
+                try:
+                    _run(self, name, wire_msg, json_str)
+                finally:
+                    ofproto_parser.disable_lazy_decoding()
+            method_name += '_lazy'
+            f = functools.partial(_run_lazy, name=method_name,
+                                  wire_msg=wire_msg, json_str=json_str)
+            test_lib.add_method(Test_Parser, method_name, f)
+            cases.add(method_name)
         assert n_added > 0
     assert (cases ==
             set(unittest.defaultTestLoader.getTestCaseNames(Test_Parser)))
@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+from nose.tools import eq_
+
+from ryu.lib import addrconv
+from ryu.lib import pcaplib
+from ryu.lib.packet import arp
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import flow_key
+from ryu.lib.packet import icmp
+from ryu.lib.packet import icmpv6
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import packet
+from ryu.lib.packet import sctp
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+
+
+PCAP_PACKET_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), '../../packet_data/pcap/')
+
+
+def _key_from_packet(pkt):
+    # the same key by the header objects of the outermost headers
+    protocols = list(pkt) + [None, None]
+    eth = protocols.pop(0)
+    tags = []
+    while isinstance(protocols[0], vlan._vlan):
+        tags.append(protocols.pop(0))
+    key = flow_key.FlowKey(
+        eth.dst, eth.src, tags[0].vid if tags else None,
+        tags[-1].ethertype if tags else eth.ethertype,
+        None, None, None, None, None)
+    l3, l4 = protocols[:2]
+    if isinstance(l3, ipv4.ipv4):
+        key = key._replace(ip_src=l3.src, ip_dst=l3.dst, ip_proto=l3.proto)
+    elif isinstance(l3, ipv6.ipv6):
+        proto = l3.ext_hdrs[-1].nxt if l3.ext_hdrs else l3.nxt
+        key = key._replace(ip_src=l3.src, ip_dst=l3.dst, ip_proto=proto)
+    elif isinstance(l3, arp.arp):
+        key = key._replace(ip_src=l3.src_ip, ip_dst=l3.dst_ip,
+                           ip_proto=l3.opcode)
+    if isinstance(l4, (tcp.tcp, udp.udp, sctp.sctp)):
+        key = key._replace(src_port=l4.src_port, dst_port=l4.dst_port)
+    elif isinstance(l4, icmp.icmp):
+        key = key._replace(src_port=l4.type, dst_port=l4.code)
+    elif isinstance(l4, icmpv6.icmpv6):
+        key = key._replace(src_port=l4.type_, dst_port=l4.code)
+    return key
+
+
+class Test_flow_key(unittest.TestCase):
+
+    src_mac = '00:00:00:00:00:01'
+    dst_mac = '00:00:00:00:00:02'
+
+    def _test(self, *protocols):
+        pkt = packet.Packet()
+        for p in protocols:
+            pkt.add_protocol(p)
+        pkt.serialize()
+        data = bytes(pkt.data)
+
+        expected = _key_from_packet(packet.Packet(data))
+        eq_(expected, flow_key.extract(data, text=True))
+        key = flow_key.extract(data)
+        eq_(addrconv.mac.text_to_bin(expected.eth_src), key.eth_src)
+        eq_(expected[2:4], key[2:4])
+        eq_(expected[6:], key[6:])
+        return key
+
+    def test_ipv4_tcp(self):
+        key = self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_IP),
+            ipv4.ipv4(src='192.0.2.1', dst='192.0.2.2',
+                      proto=in_proto.IPPROTO_TCP),
+            tcp.tcp(src_port=1000, dst_port=80), b'payload')
+        eq_(b'\xc0\x00\x02\x01', key.ip_src)
+        eq_((1000, 80), (key.src_port, key.dst_port))
+
+    def test_vlan_ipv4_udp(self):
+        self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_8021Q),
+            vlan.vlan(vid=10, ethertype=ether_types.ETH_TYPE_IP),
+            ipv4.ipv4(proto=in_proto.IPPROTO_UDP),
+            udp.udp(src_port=68, dst_port=67))
+
+    def test_qinq_ipv4_icmp(self):
+        key = self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_8021AD),
+            vlan.svlan(vid=20, ethertype=ether_types.ETH_TYPE_8021Q),
+            vlan.vlan(vid=10, ethertype=ether_types.ETH_TYPE_IP),
+            ipv4.ipv4(proto=in_proto.IPPROTO_ICMP),
+            icmp.icmp(type_=icmp.ICMP_ECHO_REQUEST, data=icmp.echo()))
+        eq_(20, key.vlan_vid)
+
+    def test_ipv6_ext_sctp(self):
+        self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_IPV6),
+            ipv6.ipv6(src='2001:db8::1', dst='2001:db8::2',
+                      nxt=in_proto.IPPROTO_HOPOPTS,
+                      ext_hdrs=[ipv6.hop_opts(nxt=in_proto.IPPROTO_SCTP)]),
+            sctp.sctp(src_port=1, dst_port=2))
+
+    def test_ipv6_icmpv6(self):
+        self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_IPV6),
+            ipv6.ipv6(nxt=in_proto.IPPROTO_ICMPV6),
+            icmpv6.icmpv6(type_=icmpv6.ICMPV6_ECHO_REQUEST,
+                          data=icmpv6.echo()))
+
+    def test_arp(self):
+        key = self._test(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether_types.ETH_TYPE_ARP),
+            arp.arp(src_mac=self.src_mac, src_ip='192.0.2.1',
+                    dst_ip='192.0.2.2'))
+        eq_(arp.ARP_REQUEST, key.ip_proto)
+
+    def test_ipv4_fragment(self):
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet(self.dst_mac, self.src_mac,
+                                           ether_types.ETH_TYPE_IP))
+        pkt.add_protocol(ipv4.ipv4(proto=in_proto.IPPROTO_UDP, offset=100))
+        pkt.add_protocol(b'\x00\x01\x00\x02\x00\x00\x00\x00')
+        pkt.serialize()
+        key = flow_key.extract(pkt.data)
+        eq_(in_proto.IPPROTO_UDP, key.ip_proto)
+        eq_((None, None), (key.src_port, key.dst_port))
+
+    def test_truncated(self):
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet(self.dst_mac, self.src_mac,
+                                           ether_types.ETH_TYPE_IP))
+        pkt.add_protocol(ipv4.ipv4(proto=in_proto.IPPROTO_TCP))
+        pkt.add_protocol(tcp.tcp())
+        pkt.serialize()
+        eq_(None, flow_key.extract(pkt.data[:13]))
+        key = flow_key.extract(pkt.data[:20], text=True)
+        eq_((self.dst_mac, ether_types.ETH_TYPE_IP, None),
+            (key.eth_dst, key.eth_type, key.ip_src))
+        key = flow_key.extract(pkt.data[:36])
+        eq_((in_proto.IPPROTO_TCP, None), (key.ip_proto, key.src_port))
+
+    def test_pcap(self):
+        for name in os.listdir(PCAP_PACKET_DATA_DIR):
+            with open(os.path.join(PCAP_PACKET_DATA_DIR, name), 'rb') as f:
+                for _, buf in pcaplib.Reader(f):
+                    pkt = packet.Packet(buf)
+                    if not pkt.get_protocol(ethernet.ethernet):
+                        # test data of pcaplib
+                        continue
+                    eq_(_key_from_packet(pkt),
+                        flow_key.extract(buf, text=True))
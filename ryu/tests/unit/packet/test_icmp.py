@@ -22,6 +22,9 @@ import unittest
 
 from nose.tools import eq_
 from ryu.lib.packet import icmp
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
 from ryu.lib.packet import packet_utils
 
 
@@ -193,6 +196,17 @@ class Test_icmp(unittest.TestCase):
         te = icmp.TimeExceeded.parser(six.binary_type(buf), icmp.icmp._MIN_LEN)
         eq_(repr(self.data), repr(te))
 
+    def test_serialize_unregistered_type(self):
+        for data in [b'', b'\xc0\x00\x02\x01' + b'\x00' * 28]:
+            pkt = packet.Packet()
+            pkt.add_protocol(ipv4.ipv4(proto=in_proto.IPPROTO_ICMP))
+            pkt.add_protocol(icmp.icmp(type_=icmp.ICMP_REDIRECT, data=data))
+            pkt.serialize()
+
+            ic = icmp.icmp(type_=icmp.ICMP_REDIRECT, data=data)
+            eq_(six.binary_type(ic.serialize(bytearray(), None)),
+                six.binary_type(pkt.data[ipv4.ipv4._MIN_LEN:]))
+
     def test_to_string(self):
         icmp_values = {'type': repr(self.type_),
                        'code': repr(self.code),
@@ -16,9 +16,16 @@
 # vim: tabstop=4 shiftwidth=4 softtabstop=4
 
 import unittest
+import copy
 import logging
+import os
+import re
 import struct
 import inspect
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
 from nose.tools import ok_, eq_
 import six
 from ryu.ofproto import ether, inet
@@ -28,15 +35,25 @@ from ryu.lib.packet import ethernet
 from ryu.lib.packet import icmp, icmpv6
 from ryu.lib.packet import ipv4, ipv6
 from ryu.lib.packet import llc
-from ryu.lib.packet import packet, packet_utils
+from ryu.lib.packet import lldp
+from ryu.lib.packet import packet, packet_base, packet_utils
 from ryu.lib.packet import sctp
 from ryu.lib.packet import tcp, udp
 from ryu.lib.packet import vlan
 from ryu.lib import addrconv
+from ryu.lib import pcaplib
 
 
 LOG = logging.getLogger('test_packet')
 
+PCAP_PACKET_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), '../../packet_data/pcap/')
+
+
+def _repr(protocols):
+    # ignores addresses of objects, e.g. datapath of openflow messages
+    return re.sub(' at 0x[0-9a-f]+', '', repr(protocols))
+
 
 class TestPacket(unittest.TestCase):
     """ Test case for packet
@@ -1551,3 +1568,94 @@ class TestPacket(unittest.TestCase):
         ok_(isinstance(pkt.protocols[0], ethernet.ethernet))
         ok_(isinstance(pkt.protocols[1], ipv4.ipv4))
         ok_(isinstance(pkt.protocols[2], udp.udp))
+
+    def test_lazy(self):
+        e = ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_IP)
+        i = ipv4.ipv4(proto=inet.IPPROTO_UDP)
+        u = udp.udp(self.src_port, self.dst_port)
+        pkt = e / i / u / self.payload
+        pkt.serialize()
+
+        pkt = packet.Packet(pkt.data, lazy=True)
+        ok_(isinstance(pkt.get_protocol(ethernet.ethernet),
+                       ethernet.ethernet))
+        eq_(1, len(pkt._protocols))
+        eq_(None, pkt.get_protocol(tcp.tcp))
+        eq_(4, len(pkt._protocols))
+
+        pkt = packet.Packet(pkt.data, lazy=True)
+        ok_(ipv4.ipv4 in pkt)
+        eq_(2, len(pkt._protocols))
+        eq_(['ethernet', 'ipv4', 'udp'],
+            [p.protocol_name for p in pkt.get_protocols(
+                packet_base.PacketBase)])
+        eq_(self.payload, pkt.protocols[-1])
+
+    def test_lazy_pcap(self):
+        for name in os.listdir(PCAP_PACKET_DATA_DIR):
+            with open(os.path.join(PCAP_PACKET_DATA_DIR, name), 'rb') as f:
+                for _, buf in pcaplib.Reader(f):
+                    eager = packet.Packet(buf)
+                    lazy = packet.Packet(buf, lazy=True)
+                    eq_(_repr(eager.protocols), _repr(list(lazy)))
+                    lazy = packet.Packet(buf, lazy=True)
+                    eq_(_repr(eager.protocols), _repr(lazy.protocols))
+
+    def _test_serialize_into(self, *protocols):
+        # the same bytes as encoding by serialize() of each header
+        pkt = packet.Packet()
+        pkt_by_layer = packet.Packet()
+        for p in protocols:
+            pkt.add_protocol(copy.deepcopy(p))
+            pkt_by_layer.add_protocol(copy.deepcopy(p))
+        pkt.serialize()
+        with mock.patch.object(pkt_by_layer, '_serialize_into',
+                               return_value=False):
+            pkt_by_layer.serialize()
+        eq_(pkt_by_layer.data, pkt.data)
+        eq_(repr(pkt_by_layer.protocols), repr(pkt.protocols))
+        # buf is not exported any more
+        pkt.data.extend(b'\x00')
+
+    def test_serialize_into(self):
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_IP),
+            ipv4.ipv4(proto=inet.IPPROTO_TCP, src=self.src_ip,
+                      dst=self.dst_ip),
+            tcp.tcp(self.src_port, self.dst_port), self.payload)
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether.ETH_TYPE_8021Q),
+            vlan.vlan(ethertype=ether.ETH_TYPE_IP),
+            ipv4.ipv4(proto=inet.IPPROTO_UDP, header_length=6,
+                      option=b'\x01\x01\x01\x00'),
+            udp.udp(self.src_port, self.dst_port), b'\x01')
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether.ETH_TYPE_ARP),
+            arp.arp_ip(arp.ARP_REQUEST, self.src_mac, self.src_ip,
+                       self.dst_mac, self.dst_ip))
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_IP),
+            ipv4.ipv4(proto=inet.IPPROTO_ICMP), icmp.icmp())
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether.ETH_TYPE_IPV6),
+            ipv6.ipv6(nxt=inet.IPPROTO_UDP),
+            udp.udp(self.src_port, self.dst_port), self.payload * 50)
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac,
+                              ether.ETH_TYPE_LLDP),
+            lldp.lldp([lldp.ChassisID(
+                subtype=lldp.ChassisID.SUB_LOCALLY_ASSIGNED,
+                chassis_id=b'dpid:1'),
+                lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                            port_id=b'\x00\x01'),
+                lldp.TTL(ttl=120), lldp.End()]))
+
+    def test_serialize_into_fallback(self):
+        # tcp options are not supported by serialize_into()
+        self._test_serialize_into(
+            ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_IP),
+            ipv4.ipv4(proto=inet.IPPROTO_TCP),
+            tcp.tcp(option=[tcp.TCPOptionMaximumSegmentSize(1460)]))
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import struct
+import unittest
+
+from nose.tools import eq_
+
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet_utils
+
+
+def _checksum(data):
+    # RFC1071 by the book
+    if len(data) % 2:
+        data += b'\x00'
+    s = 0
+    for i in range(0, len(data), 2):
+        s += data[i] << 8 | data[i + 1]
+        s = (s & 0xffff) + (s >> 16)
+    return ~s & 0xffff
+
+
+class Test_checksum(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(0)
+
+    def _data(self, length):
+        return bytes(bytearray(self.random.getrandbits(8)
+                               for _ in range(length)))
+
+    def test_checksum(self):
+        for length in [0, 1, 2, 3, 20, 21, 64, 1500]:
+            data = self._data(length)
+            eq_(_checksum(data), packet_utils.checksum(data))
+            eq_(_checksum(data), packet_utils.checksum(bytearray(data)))
+            eq_(_checksum(data), packet_utils.checksum(memoryview(data)))
+
+    def test_checksum_zero_sum(self):
+        for data in [b'', b'\x00' * 4, b'\xff\xff', b'\xff\xff\x00\x00',
+                     b'\x12\x34\xed\xcb', b'\xff']:
+            eq_(_checksum(data), packet_utils.checksum(data))
+
+    def test_checksum_verify(self):
+        data = bytearray(self._data(20))
+        data[10:12] = b'\x00\x00'
+        struct.pack_into('!H', data, 10, packet_utils.checksum(data))
+        eq_(0, packet_utils.checksum(data))
+
+    def test_checksum_batch(self):
+        buffers = [self._data(length) for length in range(40)]
+        eq_([_checksum(buf) for buf in buffers],
+            packet_utils.checksum_batch(buffers))
+        eq_([], packet_utils.checksum_batch([]))
+
+    def test_checksum_update(self):
+        ip = ipv4.ipv4(ttl=64, proto=in_proto.IPPROTO_UDP,
+                       src='192.0.2.1', dst='192.0.2.2')
+        ip.serialize(b'', None)
+        csum = ip.csum
+
+        ip.csum = packet_utils.checksum_update(
+            csum, ip.ttl << 8 | ip.proto, (ip.ttl - 1) << 8 | ip.proto)
+        expected = ipv4.ipv4(ttl=63, proto=in_proto.IPPROTO_UDP,
+                             src='192.0.2.1', dst='192.0.2.2')
+        expected.serialize(b'', None)
+        eq_(expected.csum, ip.csum)
+
+        eq_(csum, packet_utils.checksum_update(
+            ip.csum, b'\x3f\x11', b'\x40\x11'))
+
+    def test_checksum_update_random(self):
+        for _ in range(1000):
+            data = bytearray(self._data(20))
+            csum = packet_utils.checksum(data)
+            offset = self.random.randrange(0, 20, 2)
+            length = self.random.choice([2, 4])
+            old = bytes(data[offset:offset + length])
+            new = self.random.choice(
+                [self._data(length), b'\x00' * length, b'\xff' * length])
+            data[offset:offset + length] = new
+            eq_(packet_utils.checksum(data),
+                packet_utils.checksum_update(csum, old, new))
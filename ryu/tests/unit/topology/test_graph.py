@@ -0,0 +1,117 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import graph
+from ryu.topology import switches
+
+
+def _link(src_dpid, src_port_no, dst_dpid, dst_port_no):
+    ports = []
+    for dpid, port_no in [(src_dpid, src_port_no), (dst_dpid, dst_port_no)]:
+        ofpport = ofproto_v1_3_parser.OFPPort(
+            port_no, '00:00:00:00:00:01', b'port', 0, 0, 0, 0, 0, 0, 0, 0)
+        ports.append(switches.Port(dpid, ofproto_v1_3, ofpport))
+    return switches.Link(*ports)
+
+
+class Test_TopologyGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = graph.TopologyGraph()
+
+    def _csr_links(self):
+        # the links read back from to_csr()
+        indptr, indices, src_ports, dst_ports = self.graph.to_csr()
+        dpids = self.graph.dpids
+        links = set()
+        for i in range(len(indptr) - 1):
+            for k in range(indptr[i], indptr[i + 1]):
+                links.add((dpids[i], src_ports[k],
+                           dpids[indices[k]], dst_ports[k]))
+        return links
+
+    def test_link(self):
+        self.graph.add_link(_link(1, 1, 2, 1))
+        self.graph.add_link(_link(2, 1, 1, 1))
+        self.graph.add_link(_link(1, 2, 3, 1))
+        self.graph.add_link(_link(1, 2, 3, 1))
+        eq_(3, len(self.graph))
+        ok_(3 in self.graph)
+        eq_(sorted([(2, 1, 1), (3, 2, 1)]), sorted(self.graph.neighbors(1)))
+        eq_(set([(1, 1, 2, 1), (2, 1, 1, 1), (1, 2, 3, 1)]),
+            self._csr_links())
+
+        self.graph.delete_link(_link(1, 1, 2, 1))
+        self.graph.delete_link(_link(1, 1, 2, 1))
+        self.graph.delete_link(_link(4, 1, 1, 1))
+        eq_([(3, 2, 1)], self.graph.neighbors(1))
+        eq_(set([(2, 1, 1, 1), (1, 2, 3, 1)]), self._csr_links())
+        eq_([], self.graph.neighbors(4))
+
+    def test_remove_switch(self):
+        for dpid in [1, 2, 3]:
+            self.graph.add_switch(dpid)
+        self.graph.add_link(_link(1, 1, 2, 1))
+        self.graph.add_link(_link(2, 1, 1, 1))
+        self.graph.add_link(_link(2, 2, 3, 1))
+        self.graph.add_link(_link(3, 1, 2, 2))
+        index = self.graph.index[2]
+
+        self.graph.remove_switch(2)
+        self.graph.remove_switch(2)
+        ok_(2 not in self.graph)
+        eq_([], self.graph.neighbors(1))
+        eq_([], self.graph.neighbors(3))
+        eq_(set(), self._csr_links())
+
+        # the index is reused
+        eq_(index, self.graph.add_switch(4))
+        self.graph.add_link(_link(4, 1, 1, 2))
+        eq_(set([(4, 1, 1, 2)]), self._csr_links())
+
+    def test_csr_cached(self):
+        self.graph.add_link(_link(1, 1, 2, 1))
+        csr = self.graph.to_csr()
+        ok_(csr is self.graph.to_csr())
+        self.graph.add_link(_link(2, 1, 1, 1))
+        ok_(csr is not self.graph.to_csr())
+
+    def test_to_networkx(self):
+        try:
+            import networkx
+        except ImportError:
+            raise unittest.SkipTest('networkx is not installed')
+
+        self.graph.add_link(_link(1, 1, 2, 1))
+        g = self.graph.to_networkx()
+        ok_(isinstance(g, networkx.MultiDiGraph))
+        eq_([(1, 2, (1, 1))], list(g.edges(keys=True)))
+
+        # updated in place
+        self.graph.add_link(_link(2, 1, 1, 1))
+        self.graph.add_link(_link(2, 2, 3, 1))
+        ok_(g is self.graph.to_networkx())
+        eq_({'src_port': 2, 'dst_port': 1}, g.edges[2, 3, (2, 1)])
+        eq_([1, 2, 3], networkx.shortest_path(g, 1, 3))
+
+        self.graph.delete_link(_link(2, 1, 1, 1))
+        self.graph.remove_switch(3)
+        eq_([1, 2], sorted(g.nodes))
+        eq_([(1, 2, (1, 1))], list(g.edges(keys=True)))
@@ -0,0 +1,462 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import unittest
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.base import app_manager
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import lldp
+from ryu.lib.packet import packet
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_0_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import event
+from ryu.topology import switches
+
+
+def _port(dpid, port_no, ofproto=ofproto_v1_3, state=0):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no, '00:00:00:00:00:%02x' % port_no, b'port', 0, state,
+        0, 0, 0, 0, 0, 0)
+    return switches.Port(dpid, ofproto, ofpport)
+
+
+class Test_PortDataState(unittest.TestCase):
+
+    def setUp(self):
+        self.ports = switches.PortDataState(slots=4)
+
+    def test_spread(self):
+        ports = [_port(1, i) for i in range(1, 11)]
+        for port in ports:
+            self.ports.add_port(port, b'lldp')
+        eq_(4, self.ports.slots)
+
+        # new ports are pending
+        eq_(ports, self.ports.ports_to_send([]))
+        for port in ports:
+            self.ports.lldp_sent(port)
+        eq_([], self.ports.ports_to_send([]))
+
+        sizes = [len(self.ports.ports_to_send([i])) for i in range(4)]
+        eq_([3, 3, 2, 2], sizes)
+        eq_(sorted(ports, key=lambda p: p.port_no),
+            sorted(self.ports.ports_to_send(range(4)),
+                   key=lambda p: p.port_no))
+
+    def test_pending(self):
+        port1 = _port(1, 1)
+        port2 = _port(1, 2)
+        self.ports.add_port(port1, b'lldp')
+        self.ports.add_port(port2, b'lldp')
+        self.ports.lldp_sent(port1)
+        self.ports.lldp_sent(port2)
+
+        self.ports.move_front(port2)
+        eq_(None, self.ports.get_port(port2).timestamp)
+        # a pending port is not repeated for its slot
+        eq_([port2, port1], self.ports.ports_to_send(range(4)))
+
+        self.ports.lldp_sent(port2)
+        self.ports.set_down(_port(1, 1, state=ofproto_v1_3.OFPPS_LINK_DOWN))
+        eq_([], self.ports.ports_to_send([]))
+        self.ports.set_down(port1)
+        eq_([port1], self.ports.ports_to_send([]))
+
+    def test_del_port(self):
+        port1 = _port(1, 1)
+        port2 = _port(1, 2)
+        self.ports.add_port(port1, b'lldp')
+        self.ports.add_port(port2, b'lldp')
+        self.ports.del_port(port1)
+        ok_(port1 not in self.ports)
+        eq_([port2], self.ports.ports_to_send(range(4)))
+
+        # the slot of the deleted port is reused
+        port3 = _port(1, 3)
+        self.ports.add_port(port3, b'lldp')
+        self.ports.lldp_sent(port2)
+        self.ports.lldp_sent(port3)
+        eq_([1, 1, 0, 0],
+            [len(self.ports.ports_to_send([i])) for i in range(4)])
+
+
+class Test_HostState(unittest.TestCase):
+
+    def setUp(self):
+        self.hosts = switches.HostState()
+
+    def test_index(self):
+        port1 = _port(1, 1)
+        port2 = _port(1, 2)
+        host1 = switches.Host('00:00:00:00:00:01', port1)
+        host2 = switches.Host('00:00:00:00:00:02', port1)
+        host3 = switches.Host('00:00:00:00:00:03', port2)
+        host4 = switches.Host('00:00:00:00:00:04', _port(2, 1))
+        for host in [host1, host2, host3, host4]:
+            self.hosts.add(host)
+
+        eq_([host1, host2], self.hosts.get_by_port(1, 1))
+        eq_([host3], self.hosts.get_by_port(1, 2))
+        eq_([], self.hosts.get_by_port(1, 3))
+        eq_([host1, host2, host3], self.hosts.get_by_dpid(1))
+        eq_([host4], self.hosts.get_by_dpid(2))
+        eq_([], self.hosts.get_by_dpid(3))
+
+        # add() does not replace the host
+        self.hosts.add(switches.Host(host1.mac, port2))
+        eq_([host1, host2], self.hosts.get_by_port(1, 1))
+
+        # moved
+        moved = switches.Host(host1.mac, port2)
+        self.hosts[host1.mac] = moved
+        eq_([host2], self.hosts.get_by_port(1, 1))
+        eq_([host3, moved], self.hosts.get_by_port(1, 2))
+
+        del self.hosts[host2.mac]
+        del self.hosts[host3.mac]
+        del self.hosts[moved.mac]
+        eq_([], self.hosts.get_by_dpid(1))
+        eq_({}, self.hosts._ports.get(1, {}))
+
+    def test_ip(self):
+        host1 = switches.Host('00:00:00:00:00:01', _port(1, 1))
+        host2 = switches.Host('00:00:00:00:00:02', _port(1, 2))
+        self.hosts.add(host1)
+        self.hosts.add(host2)
+        ok_(self.hosts.update_ip(host1, ip_v4='192.0.2.1'))
+        ok_(self.hosts.update_ip(host1, ip_v6='2001:db8::1'))
+        ok_(not self.hosts.update_ip(host1, ip_v4='192.0.2.1'))
+        eq_(host1, self.hosts.get_by_ip('192.0.2.1'))
+        eq_(host1, self.hosts.get_by_ip('2001:db8::1'))
+        eq_(None, self.hosts.get_by_ip('192.0.2.2'))
+
+        # taken over by host2
+        self.hosts.update_ip(host2, ip_v4='192.0.2.1')
+        eq_(host2, self.hosts.get_by_ip('192.0.2.1'))
+        del self.hosts[host1.mac]
+        eq_(host2, self.hosts.get_by_ip('192.0.2.1'))
+        eq_(None, self.hosts.get_by_ip('2001:db8::1'))
+
+    def test_dict_methods(self):
+        host1 = switches.Host('00:00:00:00:00:01', _port(1, 1))
+        host2 = switches.Host('00:00:00:00:00:02', _port(1, 2))
+        host1.ipv4.append('192.0.2.1')
+
+        self.hosts.update({host1.mac: host1}, **{host2.mac: host2})
+        eq_(host1, self.hosts.get_by_ip('192.0.2.1'))
+        eq_([host2], self.hosts.get_by_port(1, 2))
+        eq_(host1, self.hosts.setdefault(host1.mac, host2))
+
+        eq_(host1, self.hosts.pop(host1.mac))
+        eq_(None, self.hosts.pop(host1.mac, None))
+        eq_(None, self.hosts.get_by_ip('192.0.2.1'))
+        eq_((host2.mac, host2), self.hosts.popitem())
+        eq_([], self.hosts.get_by_dpid(1))
+
+        self.hosts.setdefault(host1.mac, host1)
+        eq_([host1], self.hosts.get_by_port(1, 1))
+        self.hosts.clear()
+        eq_([], self.hosts.get_by_dpid(1))
+        eq_(None, self.hosts.get_by_ip('192.0.2.1'))
+
+
+class Test_TopologyChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.changes = switches.TopologyChanges(3)
+
+    def test_since(self):
+        eq_([], self.changes.since(0))
+        for i in range(1, 5):
+            self.changes.add('event_port_add', _port(1, i))
+        eq_(4, self.changes.version)
+
+        # the change of version 1 is discarded
+        eq_(None, self.changes.since(0))
+        eq_([2, 3, 4], [change.version for change in self.changes.since(1)])
+        eq_([_port(1, 4).to_dict()],
+            [change.data for change in self.changes.since(3)])
+        eq_([], self.changes.since(4))
+        eq_(None, self.changes.since(5))
+
+    def test_switch_leave(self):
+        # the journal keeps no Datapath class
+        dp = mock.Mock(id=1)
+        self.changes.add('event_switch_leave', switches.Switch(dp))
+        eq_({'dpid': '0000000000000001', 'ports': []},
+            self.changes.since(0)[0].data)
+
+
+@mock.patch('ryu.topology.switches.time')
+class Test_LinkState(unittest.TestCase):
+
+    def setUp(self):
+        self.links = switches.LinkState()
+        self.port1 = _port(1, 1)
+        self.port2 = _port(2, 1)
+
+    def test_expired(self, time_):
+        time_.time.return_value = 100
+        self.links.update_link(self.port1, self.port2)
+        time_.time.return_value = 105
+        self.links.update_link(self.port2, self.port1)
+        eq_(100, self.links.oldest_timestamp())
+
+        eq_([], self.links.expired(100))
+        eq_([switches.Link(self.port1, self.port2)],
+            self.links.expired(101))
+        eq_([], self.links.expired(101))
+        eq_(105, self.links.oldest_timestamp())
+
+    def test_expired_updated(self, time_):
+        link = switches.Link(self.port1, self.port2)
+        time_.time.return_value = 100
+        self.links.update_link(self.port1, self.port2)
+        time_.time.return_value = 110
+        self.links.update_link(self.port1, self.port2)
+
+        eq_([], self.links.expired(105))
+        eq_(110, self.links.oldest_timestamp())
+
+        self.links.rev_link_set_timestamp(link, 90)
+        eq_([link], self.links.expired(95))
+        eq_([], self.links.expired(120))
+
+    def test_link_down(self, time_):
+        time_.time.return_value = 100
+        self.links.update_link(self.port1, self.port2)
+        self.links.update_link(self.port2, self.port1)
+        self.links.link_down(switches.Link(self.port1, self.port2))
+        eq_([switches.Link(self.port2, self.port1)],
+            self.links.expired(101))
+
+        self.links.update_link(self.port1, self.port2)
+        self.links.port_deleted(self.port1)
+        eq_([], self.links.expired(101))
+        eq_(None, self.links.oldest_timestamp())
+
+
+class Test_LLDPPacket(unittest.TestCase):
+
+    def _parse_packet(self, data):
+        # the same as LLDPPacket.lldp_parse with packet.Packet
+        tlvs = packet.Packet(data).get_protocol(lldp.lldp).tlvs
+        return (int(tlvs[0].chassis_id[len('dpid:'):], 16),
+                struct.unpack('!I', tlvs[1].port_id)[0])
+
+    def test_lldp_parse(self):
+        for dpid, port_no in [(0, 0), (1, 1), (0x1234567890abcdef, 0xfffe),
+                              (0xffffffffffffffff, 0xffffffff)]:
+            data = switches.LLDPPacket.lldp_packet(
+                dpid, port_no, '00:00:00:00:00:01', 120)
+            eq_((dpid, port_no), switches.LLDPPacket.lldp_parse(data))
+            eq_((dpid, port_no), self._parse_packet(data))
+
+    def test_lldp_parse_other_tlvs(self):
+        # not the fixed format
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet(
+            lldp.LLDP_MAC_NEAREST_BRIDGE, '00:00:00:00:00:01',
+            ether_types.ETH_TYPE_LLDP))
+        pkt.add_protocol(lldp.lldp([
+            lldp.ChassisID(subtype=lldp.ChassisID.SUB_MAC_ADDRESS,
+                           chassis_id=b'\x00\x00\x00\x00\x00\x01'),
+            lldp.PortID(subtype=lldp.PortID.SUB_INTERFACE_NAME,
+                        port_id=b'eth0'),
+            lldp.TTL(ttl=120), lldp.End()]))
+        pkt.serialize()
+        with self.assertRaises(switches.LLDPPacket.LLDPUnknownFormat):
+            switches.LLDPPacket.lldp_parse(pkt.data)
+
+    def test_lldp_parse_not_lldp(self):
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet(
+            lldp.LLDP_MAC_NEAREST_BRIDGE, '00:00:00:00:00:01',
+            ether_types.ETH_TYPE_IP))
+        pkt.add_protocol(b'\x00' * 46)
+        pkt.serialize()
+        for data in [pkt.data, pkt.data[:14], pkt.data[:13]]:
+            with self.assertRaises(switches.LLDPPacket.LLDPUnknownFormat):
+                switches.LLDPPacket.lldp_parse(data)
+
+
+class Test_Switches(unittest.TestCase):
+
+    def setUp(self):
+        cls = switches.Switches
+        if not issubclass(cls, app_manager.RyuApp):
+            # cmd/test_manager reloads app_manager, so the RyuApp of
+            # Switches is stale and its __init__ refers to the new one.
+            cls = type('Switches', (cls, app_manager.RyuApp), {})
+        self.switches = cls()
+
+    def _dp(self, dpid, ofproto, ofproto_parser):
+        dp = mock.MagicMock()
+        dp.id = dpid
+        dp.ofproto = ofproto
+        dp.ofproto_parser = ofproto_parser
+        self.switches.dps[dpid] = dp
+        return dp
+
+    @staticmethod
+    def _sent(dp):
+        # the wire bytes given to the batches of dp
+        batch = dp.batch.return_value.__enter__.return_value
+        return [args[0] for args, _kwargs in batch.send_buf.call_args_list]
+
+    def _packet_out(self, dp, port_no, data):
+        parser = dp.ofproto_parser
+        if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
+            msg = parser.OFPPacketOut(
+                dp, 0xffffffff, dp.ofproto.OFPP_NONE,
+                [parser.OFPActionOutput(port_no)], data)
+        else:
+            msg = parser.OFPPacketOut(
+                dp, dp.ofproto.OFP_NO_BUFFER, dp.ofproto.OFPP_CONTROLLER,
+                [parser.OFPActionOutput(port_no)], data)
+        msg.set_xid(0)
+        msg.serialize()
+        return bytes(msg.buf)
+
+    def test_send_lldp_packets(self):
+        dp1 = self._dp(1, ofproto_v1_3, ofproto_v1_3_parser)
+        dp2 = self._dp(2, ofproto_v1_0, ofproto_v1_0_parser)
+        ports = [_port(1, 1), _port(2, 1, ofproto=ofproto_v1_0),
+                 _port(1, 2), _port(3, 1),
+                 _port(1, 3, state=ofproto_v1_3.OFPPS_LINK_DOWN)]
+        for port in ports:
+            self.switches.ports.add_port(port, b'lldp%d' % port.port_no)
+
+        self.switches.send_lldp_packets(ports)
+
+        eq_(1, dp1.batch.call_count)
+        eq_([self._packet_out(dp1, 1, b'lldp1'),
+             self._packet_out(dp1, 2, b'lldp2')], self._sent(dp1))
+        eq_(1, dp2.batch.call_count)
+        eq_([self._packet_out(dp2, 1, b'lldp1')], self._sent(dp2))
+
+        for port in ports:
+            ok_(self.switches.ports.get_port(port).timestamp is not None)
+        eq_([], self.switches.ports.ports_to_send([]))
+
+    def test_send_lldp_packet_cached(self):
+        dp = self._dp(1, ofproto_v1_3, ofproto_v1_3_parser)
+        port = _port(1, 1)
+        self.switches.ports.add_port(port, b'lldp')
+        self.switches.send_lldp_packet(port)
+        buf = self._sent(dp)[0]
+
+        with mock.patch.object(ofproto_v1_3_parser.OFPPacketOut,
+                               'serialize') as serialize:
+            self.switches.send_lldp_packet(port)
+            eq_(0, serialize.call_count)
+        ok_(self._sent(dp)[1] is buf)
+
+        # rebuilt on changes of the LLDP packet
+        self.switches.ports.add_port(port, b'new lldp')
+        self.switches.send_lldp_packet(port)
+        eq_(self._packet_out(dp, 1, b'new lldp'), self._sent(dp)[2])
+
+        # and of the datapath
+        dp = self._dp(1, ofproto_v1_0, ofproto_v1_0_parser)
+        self.switches.send_lldp_packet(port)
+        eq_([self._packet_out(dp, 1, b'new lldp')], self._sent(dp))
+
+    @mock.patch('ryu.topology.switches.time')
+    def test_link_loop_reverse_link(self, time_):
+        port1 = _port(1, 1)
+        port2 = _port(2, 1)
+        time_.time.return_value = 100
+        self.switches.links.update_link(port1, port2)
+        time_.time.return_value = 108
+        self.switches.links.update_link(port2, port1)
+
+        def wait(timeout):
+            self.switches.is_active = False
+        self.switches.link_event = mock.Mock()
+        self.switches.link_event.wait.side_effect = wait
+        self.switches.lldp_event = mock.Mock()
+        time_.time.return_value = 111
+        self.switches.link_loop()
+
+        # the reverse link is alive for a check period
+        rev_link = switches.Link(port2, port1)
+        eq_([rev_link], list(self.switches.links))
+        period = self.switches.TIMEOUT_CHECK_PERIOD
+        self.switches.link_event.wait.assert_called_once_with(timeout=period)
+        timeout = self.switches.LINK_TIMEOUT
+        eq_([], self.switches.links.expired(111 + period - 0.1 - timeout))
+        eq_([rev_link],
+            self.switches.links.expired(111 + period + 0.1 - timeout))
+
+    @mock.patch('ryu.topology.switches.time')
+    def test_link_add_hosts(self, time_):
+        time_.time.side_effect = [100, 101]
+        self.switches.link_discovery = True
+        self.switches.explicit_drop = False
+        self.switches.lldp_event = mock.Mock()
+        for dpid in [1, 2]:
+            dp = self._dp(dpid, ofproto_v1_3, ofproto_v1_3_parser)
+            dp.ports = dict((port_no, ofproto_v1_3_parser.OFPPort(
+                port_no, '00:00:00:00:00:01', b'port', 0, 0,
+                0, 0, 0, 0, 0, 0)) for port_no in [1, 2])
+            self.switches._register(dp)
+        src = _port(1, 1)
+        self.switches.ports.add_port(src, b'lldp')
+        self.switches.ports.lldp_sent(src)
+
+        hosts = [switches.Host('00:00:00:00:01:01', src),
+                 switches.Host('00:00:00:00:02:01', _port(2, 1)),
+                 switches.Host('00:00:00:00:02:02', _port(2, 2))]
+        for host in hosts:
+            self.switches.hosts.add(host)
+
+        ev = mock.Mock()
+        ev.msg.data = switches.LLDPPacket.lldp_packet(
+            1, 1, '00:00:00:00:00:01', 120)
+        ev.msg.datapath = self.switches.dps[2]
+        ev.msg.match = {'in_port': 1}
+        with mock.patch.object(self.switches,
+                               'send_event_to_observers') as send:
+            self.switches.lldp_packet_in_handler(ev)
+
+        eq_([switches.Link(src, _port(2, 1))], list(self.switches.links))
+        eq_([hosts[2]], list(self.switches.hosts.values()))
+        eq_([event.EventLinkAdd, event.EventHostDelete, event.EventHostDelete],
+            [type(args[0]) for args, _kwargs in send.call_args_list])
+
+        changes = self.switches.changes.since(0)
+        eq_(['event_link_add', 'event_host_delete', 'event_host_delete'],
+            [change.event for change in changes])
+        eq_([1, 2, 3], [change.version for change in changes])
+
+        topology = self.switches._get_topology()
+        eq_(3, topology.version)
+        eq_([1, 2], sorted(switch.dp.id for switch in topology.switches))
+        eq_((switches.Link(src, _port(2, 1)),), topology.links)
+        eq_((hosts[2],), topology.hosts)
+        ok_(topology is self.switches._get_topology())
+
+        self.switches.hosts.update_ip(hosts[2], ip_v4='192.0.2.1')
+        eq_([], topology.hosts[0].ipv4)
+        eq_([(2, 1, 1)], self.switches.graph.neighbors(1))
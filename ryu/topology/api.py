@@ -44,4 +44,37 @@ def get_all_host(app):
     return get_host(app)
 
 
+def get_topology(app):
+    """
+    Returns the TopologySnapshot of the current topology.
+
+    The snapshot is shared until the topology is changed and must not be
+    modified.
+    """
+    rep = app.send_request(event.EventTopologyRequest())
+    return rep.snapshot
+
+
+def get_topology_changes(app, version):
+    """
+    Returns the list of TopologyChange after *version*.
+
+    Returns None if the changes are no longer available, in which case
+    the caller should start over with get_topology().
+    """
+    rep = app.send_request(event.EventTopologyRequest(version))
+    return rep.changes
+
+
+def get_graph(app):
+    """
+    Returns the TopologyGraph of the switches and the links.
+
+    The graph is updated in place by the switches app as the topology
+    changes, so the caller can keep it instead of calling this again.
+    """
+    rep = app.send_request(event.EventGraphRequest())
+    return rep.graph
+
+
 app_manager.require_app('ryu.topology.switches', api_style=True)
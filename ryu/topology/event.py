@@ -157,6 +157,52 @@ class EventHostReply(event.EventReplyBase):
             (self.dst, self.dpid, len(self.hosts))
 
 
+class EventTopologyRequest(event.EventRequestBase):
+    # If version is None, reply the snapshot of the topology.
+    # Otherwise reply the changes after the version.
+    def __init__(self, version=None):
+        super(EventTopologyRequest, self).__init__()
+        self.dst = 'switches'
+        self.version = version
+
+    def __str__(self):
+        return 'EventTopologyRequest<src=%s, version=%s>' % \
+            (self.src, self.version)
+
+
+class EventTopologyReply(event.EventReplyBase):
+    # changes is None if the changes after the requested version are
+    # no longer available.
+    def __init__(self, dst, version, snapshot, changes):
+        super(EventTopologyReply, self).__init__(dst)
+        self.version = version
+        self.snapshot = snapshot
+        self.changes = changes
+
+    def __str__(self):
+        return 'EventTopologyReply<dst=%s, version=%s>' % \
+            (self.dst, self.version)
+
+
+class EventGraphRequest(event.EventRequestBase):
+    def __init__(self):
+        super(EventGraphRequest, self).__init__()
+        self.dst = 'switches'
+
+    def __str__(self):
+        return 'EventGraphRequest<src=%s>' % self.src
+
+
+class EventGraphReply(event.EventReplyBase):
+    def __init__(self, dst, graph):
+        super(EventGraphReply, self).__init__(dst)
+        self.graph = graph
+
+    def __str__(self):
+        return 'EventGraphReply<dst=%s, %s switches>' % \
+            (self.dst, len(self.graph))
+
+
 class EventHostBase(event.EventBase):
     def __init__(self, host):
         super(EventHostBase, self).__init__()
@@ -171,14 +217,20 @@ class EventHostAdd(EventHostBase):
         super(EventHostAdd, self).__init__(host)
 
 
-# Note: Currently, EventHostDelete will never be raised, because we have no
-# appropriate way to detect the disconnection of hosts. Just defined for
-# future use.
+# Note: Currently, EventHostDelete is raised only when the port of a host
+# is found to be a switch-to-switch port, because we have no appropriate
+# way to detect the disconnection of hosts.
 class EventHostDelete(EventHostBase):
     def __init__(self, host):
         super(EventHostDelete, self).__init__(host)
 
 
+# Raised when a new IP address of a host is learned.
+class EventHostUpdate(EventHostBase):
+    def __init__(self, host):
+        super(EventHostUpdate, self).__init__(host)
+
+
 class EventHostMove(event.EventBase):
     def __init__(self, src, dst):
         super(EventHostMove, self).__init__()
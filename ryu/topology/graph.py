@@ -0,0 +1,228 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Graph of the discovered topology.
+
+The switches app updates a TopologyGraph in place as switches and links
+come and go, so routing applications do not need to rebuild a graph
+from get_link() on every change::
+
+    graph = api.get_graph(self)
+    for dpid, src_port_no, dst_port_no in graph.neighbors(dpid):
+        ...
+"""
+
+import array
+
+
+class TopologyGraph(object):
+    """
+    Directed multigraph of the switches and the links between them.
+
+    Each switch is given a small integer index, which is reused after the
+    switch leaves.  The links from a switch are kept in adjacency arrays
+    of the index:
+
+    ============== ========================================================
+    Attribute      Description
+    ============== ========================================================
+    dpids          List of the datapath ids by index.  None for the
+                   indexes not in use.
+    index          Dictionary of the indexes by datapath id.
+    nbrs           List of the arrays of the destination indexes of the
+                   links by source index.
+    src_ports      List of the arrays of the source port numbers of the
+                   links, in the same order as nbrs.
+    dst_ports      List of the arrays of the destination port numbers of
+                   the links, in the same order as nbrs.
+    ============== ========================================================
+
+    The attributes are updated in place and must not be modified by the
+    users.
+    """
+
+    def __init__(self):
+        super(TopologyGraph, self).__init__()
+        self.dpids = []
+        self.index = {}
+        self.nbrs = []
+        self.src_ports = []
+        self.dst_ports = []
+        self._free = []   # indexes not in use
+        self._csr = None  # cache of to_csr()
+        self._nx = None   # networkx graph updated in place if exported
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, dpid):
+        return dpid in self.index
+
+    def add_switch(self, dpid):
+        """
+        Adds the switch *dpid* if not added yet and returns its index.
+        """
+        i = self.index.get(dpid)
+        if i is not None:
+            return i
+        if self._free:
+            i = self._free.pop()
+            self.dpids[i] = dpid
+        else:
+            i = len(self.dpids)
+            self.dpids.append(dpid)
+            self.nbrs.append(array.array('l'))
+            self.src_ports.append(array.array('L'))
+            self.dst_ports.append(array.array('L'))
+        self.index[dpid] = i
+        self._csr = None
+        if self._nx is not None:
+            self._nx.add_node(dpid)
+        return i
+
+    def remove_switch(self, dpid):
+        """
+        Removes the switch *dpid* and the links from and to it.
+        """
+        i = self.index.pop(dpid, None)
+        if i is None:
+            return
+        for j, nbrs in enumerate(self.nbrs):
+            # the links to the switch
+            while j != i and i in nbrs:
+                self._remove_edge(j, nbrs.index(i))
+        del self.nbrs[i][:]
+        del self.src_ports[i][:]
+        del self.dst_ports[i][:]
+        self.dpids[i] = None
+        self._free.append(i)
+        self._csr = None
+        if self._nx is not None:
+            self._nx.remove_node(dpid)
+
+    def _find_edge(self, i, j, src_port_no, dst_port_no):
+        nbrs = self.nbrs[i]
+        src_ports = self.src_ports[i]
+        dst_ports = self.dst_ports[i]
+        for k in range(len(nbrs)):
+            if (nbrs[k] == j and src_ports[k] == src_port_no and
+                    dst_ports[k] == dst_port_no):
+                return k
+        return None
+
+    def _remove_edge(self, i, k):
+        # moves the last link to k instead of shifting the arrays
+        for a in (self.nbrs[i], self.src_ports[i], self.dst_ports[i]):
+            last = a.pop()
+            if k < len(a):
+                a[k] = last
+
+    def add_link(self, link):
+        """
+        Adds the link *link*, a :py:class:`ryu.topology.switches.Link`.
+        The switches of the link are added if needed.
+        """
+        src, dst = link.src, link.dst
+        i = self.add_switch(src.dpid)
+        j = self.add_switch(dst.dpid)
+        if self._find_edge(i, j, src.port_no, dst.port_no) is not None:
+            return
+        self.nbrs[i].append(j)
+        self.src_ports[i].append(src.port_no)
+        self.dst_ports[i].append(dst.port_no)
+        self._csr = None
+        if self._nx is not None:
+            self._nx.add_edge(src.dpid, dst.dpid,
+                              key=(src.port_no, dst.port_no),
+                              src_port=src.port_no, dst_port=dst.port_no)
+
+    def delete_link(self, link):
+        """
+        Deletes the link *link*.  Does nothing if it is not in the graph.
+        """
+        src, dst = link.src, link.dst
+        i = self.index.get(src.dpid)
+        j = self.index.get(dst.dpid)
+        if i is None or j is None:
+            return
+        k = self._find_edge(i, j, src.port_no, dst.port_no)
+        if k is None:
+            return
+        self._remove_edge(i, k)
+        self._csr = None
+        if self._nx is not None:
+            self._nx.remove_edge(src.dpid, dst.dpid,
+                                 key=(src.port_no, dst.port_no))
+
+    def neighbors(self, dpid):
+        """
+        Returns the list of (destination dpid, source port number,
+        destination port number) of the links from the switch *dpid*.
+        """
+        i = self.index.get(dpid)
+        if i is None:
+            return []
+        dpids = self.dpids
+        return [(dpids[j], src_port_no, dst_port_no)
+                for j, src_port_no, dst_port_no
+                in zip(self.nbrs[i], self.src_ports[i], self.dst_ports[i])]
+
+    def to_csr(self):
+        """
+        Returns the links in the compressed sparse row form.
+
+        The result is a tuple of the arrays (indptr, indices, src_ports,
+        dst_ports).  The links from the switch of index i are
+        indices[indptr[i]:indptr[i + 1]] together with the port numbers
+        in the same range.  The arrays are cached until the graph is
+        changed and must not be modified.
+        """
+        if self._csr is None:
+            indptr = array.array('l', [0])
+            indices = array.array('l')
+            src_ports = array.array('L')
+            dst_ports = array.array('L')
+            for i in range(len(self.dpids)):
+                indices.extend(self.nbrs[i])
+                src_ports.extend(self.src_ports[i])
+                dst_ports.extend(self.dst_ports[i])
+                indptr.append(len(indices))
+            self._csr = (indptr, indices, src_ports, dst_ports)
+        return self._csr
+
+    def to_networkx(self):
+        """
+        Returns the graph as a networkx.MultiDiGraph.
+
+        The nodes are the datapath ids.  The edges are keyed by the
+        tuples of the source and destination port numbers, which are also
+        the src_port and dst_port attributes.
+        The networkx graph is built at the first call and then updated in
+        place together with this graph, so later calls return the same
+        object without copying.  It must not be modified by the users.
+        Raises ImportError if networkx is not installed.
+        """
+        if self._nx is None:
+            import networkx
+
+            g = networkx.MultiDiGraph()
+            g.add_nodes_from(self.index)
+            for dpid, i in self.index.items():
+                for j, src_port_no, dst_port_no in zip(
+                        self.nbrs[i], self.src_ports[i], self.dst_ports[i]):
+                    g.add_edge(dpid, self.dpids[j],
+                               key=(src_port_no, dst_port_no),
+                               src_port=src_port_no, dst_port=dst_port_no)
+            self._nx = g
+        return self._nx
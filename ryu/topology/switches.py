@@ -13,14 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
+import itertools
 import logging
 import six
 import struct
 import time
 from ryu import cfg
 
-from collections import defaultdict
+from collections import defaultdict, deque, namedtuple, OrderedDict
 from ryu.topology import event
+from ryu.topology.graph import TopologyGraph
 from ryu.base import app_manager
 from ryu.controller import ofp_event
 from ryu.controller.handler import set_ev_cls
@@ -53,7 +56,10 @@ CONF.register_cli_opts([
                 help='link discovery: explicitly install flow entry '
                      'to send lldp packet to controller'),
     cfg.BoolOpt('explicit-drop', default=True,
-                help='link discovery: explicitly drop lldp packet in')
+                help='link discovery: explicitly drop lldp packet in'),
+    cfg.FloatOpt('lldp-send-period', default=.9,
+                 help='link discovery: interval in seconds to send lldp '
+                      'packet from each port')
 ])
 
 
@@ -188,43 +194,126 @@ class Host(object):
         return msg
 
 
+def _copy_host(host):
+    # Host is updated in place by HostState.update_ip()
+    copied = Host(host.mac, host.port)
+    copied.ipv4 = list(host.ipv4)
+    copied.ipv6 = list(host.ipv6)
+    return copied
+
+
 class HostState(dict):
     # mac address -> Host class
+    # The hosts are also indexed by dpid and port_no of their ports and
+    # by their IP addresses.  The indexes are updated by add(),
+    # update_ip(), hosts[mac] = host and del hosts[mac].
     def __init__(self):
         super(HostState, self).__init__()
+        self._ports = {}  # dpid -> port_no -> mac address -> Host class
+        self._ips = {}    # IP address -> mac address
+
+    def _index(self, host):
+        port = host.port
+        ports = self._ports.setdefault(port.dpid, {})
+        ports.setdefault(port.port_no, {})[host.mac] = host
+        for ip in host.ipv4 + host.ipv6:
+            self._ips[ip] = host.mac
+
+    def _unindex(self, host):
+        port = host.port
+        ports = self._ports[port.dpid]
+        hosts = ports[port.port_no]
+        del hosts[host.mac]
+        if not hosts:
+            del ports[port.port_no]
+            if not ports:
+                del self._ports[port.dpid]
+        for ip in host.ipv4 + host.ipv6:
+            # the address may be taken over by another host
+            if self._ips.get(ip) == host.mac:
+                del self._ips[ip]
+
+    def __setitem__(self, mac, host):
+        if mac in self:
+            self._unindex(self[mac])
+        super(HostState, self).__setitem__(mac, host)
+        self._index(host)
+
+    def __delitem__(self, mac):
+        self._unindex(self[mac])
+        super(HostState, self).__delitem__(mac)
+
+    # the other methods changing the dict go through the indexes too
+    def pop(self, mac, *default):
+        if mac not in self:
+            return super(HostState, self).pop(mac, *default)
+        host = self[mac]
+        del self[mac]
+        return host
+
+    def popitem(self):
+        mac, host = super(HostState, self).popitem()
+        self._unindex(host)
+        return mac, host
+
+    def clear(self):
+        super(HostState, self).clear()
+        self._ports.clear()
+        self._ips.clear()
+
+    def update(self, *args, **kwargs):
+        for mac, host in dict(*args, **kwargs).items():
+            self[mac] = host
+
+    def setdefault(self, mac, host):
+        if mac not in self:
+            self[mac] = host
+        return self[mac]
 
     def add(self, host):
         mac = host.mac
-        self.setdefault(mac, host)
+        if mac not in self:
+            self[mac] = host
 
     def update_ip(self, host, ip_v4=None, ip_v6=None):
+        # returns True if a new address is added to the host
         mac = host.mac
         host = None
         if mac in self:
             host = self[mac]
 
         if not host:
-            return
+            return False
 
+        added = False
         if ip_v4 is not None:
             if ip_v4 in host.ipv4:
                 host.ipv4.remove(ip_v4)
+            else:
+                added = True
             host.ipv4.append(ip_v4)
+            self._ips[ip_v4] = mac
 
         if ip_v6 is not None:
             if ip_v6 in host.ipv6:
                 host.ipv6.remove(ip_v6)
+            else:
+                added = True
             host.ipv6.append(ip_v6)
+            self._ips[ip_v6] = mac
+
+        return added
 
     def get_by_dpid(self, dpid):
-        result = []
+        return [host for hosts in self._ports.get(dpid, {}).values()
+                for host in hosts.values()]
 
-        for mac in self:
-            host = self[mac]
-            if host.port.dpid == dpid:
-                result.append(host)
+    def get_by_port(self, dpid, port_no):
+        return list(self._ports.get(dpid, {}).get(port_no, {}).values())
 
-        return result
+    def get_by_ip(self, ip):
+        # the host which sent a packet from ip last
+        return self.get(self._ips.get(ip))
 
 
 class PortState(dict):
@@ -248,6 +337,8 @@ class PortData(object):
         super(PortData, self).__init__()
         self.is_down = is_down
         self.lldp_data = lldp_data
+        # (OpenFlow version, wire bytes of PacketOut of lldp_data)
+        self.packet_out = None
         self.timestamp = None
         self.sent = 0
 
@@ -274,53 +365,39 @@ class PortData(object):
 
 class PortDataState(dict):
     # dict: Port class -> PortData class
-    # slimed down version of OrderedDict as python 2.6 doesn't support it.
-    _PREV = 0
-    _NEXT = 1
-    _KEY = 2
+    # The ports are spread evenly over the slots of a timer wheel.
+    # Switches.lldp_loop sends LLDP from the ports of a slot at a time
+    # and from the pending ports, e.g. new ports, as soon as possible.
 
-    def __init__(self):
+    def __init__(self, slots=1):
         super(PortDataState, self).__init__()
-        self._root = root = []  # sentinel node
-        root[:] = [root, root, None]  # [_PREV, _NEXT, _KEY] doubly linked list
-        self._map = {}
-
-    def _remove_key(self, key):
-        link_prev, link_next, key = self._map.pop(key)
-        link_prev[self._NEXT] = link_next
-        link_next[self._PREV] = link_prev
-
-    def _append_key(self, key):
-        root = self._root
-        last = root[self._PREV]
-        last[self._NEXT] = root[self._PREV] = self._map[key] = [last, root,
-                                                                key]
-
-    def _prepend_key(self, key):
-        root = self._root
-        first = root[self._NEXT]
-        first[self._PREV] = root[self._NEXT] = self._map[key] = [root, first,
-                                                                 key]
-
-    def _move_last_key(self, key):
-        self._remove_key(key)
-        self._append_key(key)
-
-    def _move_front_key(self, key):
-        self._remove_key(key)
-        self._prepend_key(key)
+        self._wheel = [OrderedDict() for _ in range(slots)]
+        self._slot = {}               # Port class -> slot index
+        self._pending = OrderedDict()
+
+    @property
+    def slots(self):
+        return len(self._wheel)
 
     def add_port(self, port, lldp_data):
         if port not in self:
-            self._prepend_key(port)
             self[port] = PortData(port.is_down(), lldp_data)
+            slot = min(range(len(self._wheel)),
+                       key=lambda i: len(self._wheel[i]))
+            self._wheel[slot][port] = None
+            self._slot[port] = slot
+            self._pending[port] = None
         else:
-            self[port].is_down = port.is_down()
+            port_data = self[port]
+            port_data.is_down = port.is_down()
+            if port_data.lldp_data != lldp_data:
+                port_data.lldp_data = lldp_data
+                port_data.packet_out = None
 
     def lldp_sent(self, port):
         port_data = self[port]
         port_data.lldp_sent()
-        self._move_last_key(port)
+        self._pending.pop(port, None)
         return port_data
 
     def lldp_received(self, port):
@@ -330,7 +407,7 @@ class PortDataState(dict):
         port_data = self.get(port, None)
         if port_data is not None:
             port_data.clear_timestamp()
-            self._move_front_key(port)
+            self._pending[port] = None
 
     def set_down(self, port):
         is_down = port.is_down()
@@ -338,7 +415,7 @@ class PortDataState(dict):
         port_data.set_down(is_down)
         port_data.clear_timestamp()
         if not is_down:
-            self._move_front_key(port)
+            self._pending[port] = None
         return is_down
 
     def get_port(self, port):
@@ -346,38 +423,41 @@ class PortDataState(dict):
 
     def del_port(self, port):
         del self[port]
-        self._remove_key(port)
+        del self._wheel[self._slot.pop(port)][port]
+        self._pending.pop(port, None)
 
-    def __iter__(self):
-        root = self._root
-        curr = root[self._NEXT]
-        while curr is not root:
-            yield curr[self._KEY]
-            curr = curr[self._NEXT]
+    def ports_to_send(self, slots):
+        # the pending ports and the ports in the given slots
+        ports = list(self._pending)
+        for slot in slots:
+            ports.extend(port for port in self._wheel[slot]
+                         if port not in self._pending)
+        return ports
 
     def clear(self):
-        for node in self._map.values():
-            del node[:]
-        root = self._root
-        root[:] = [root, root, None]
-        self._map.clear()
+        for slot in self._wheel:
+            slot.clear()
+        self._slot.clear()
+        self._pending.clear()
         dict.clear(self)
 
-    def items(self):
-        'od.items() -> list of (key, value) pairs in od'
-        return [(key, self[key]) for key in self]
-
-    def iteritems(self):
-        'od.iteritems -> an iterator over the (key, value) pairs in od'
-        for k in self:
-            yield (k, self[k])
-
 
 class LinkState(dict):
     # dict: Link class -> timestamp
     def __init__(self):
         super(LinkState, self).__init__()
         self._map = defaultdict(lambda: defaultdict(lambda: None))
+        # heap of (timestamp, seq, link) to find the timed out links
+        # without scanning all the links.  An entry is updated lazily
+        # when it is popped and valid only if its seq is in self._seqs.
+        self._timestamps = []
+        self._seqs = {}  # Link class -> seq
+        self._seq = itertools.count()
+
+    def _push(self, link, timestamp):
+        seq = next(self._seq)
+        self._seqs[link] = seq
+        heapq.heappush(self._timestamps, (timestamp, seq, link))
 
     def get_peers(self, src):
         return self._map[src].keys()
@@ -387,6 +467,8 @@ class LinkState(dict):
 
         self[link] = time.time()
         self._map[src][dst] = link
+        if link not in self._seqs:
+            self._push(link, self[link])
 
         # return if the reverse link is also up or not
         rev_link = Link(dst, src)
@@ -395,11 +477,13 @@ class LinkState(dict):
     def link_down(self, link):
         del self[link]
         del self._map[link.src][link.dst]
+        self._seqs.pop(link, None)
 
     def rev_link_set_timestamp(self, rev_link, timestamp):
         # rev_link may or may not in LinkSet
         if rev_link in self:
             self[rev_link] = timestamp
+            self._push(rev_link, timestamp)
 
     def port_deleted(self, src):
         dsts = self.get_peers(src)
@@ -409,7 +493,9 @@ class LinkState(dict):
             link = Link(src, dst)
             rev_link = Link(dst, src)
             del self[link]
+            self._seqs.pop(link, None)
             self.pop(rev_link, None)
+            self._seqs.pop(rev_link, None)
             if src in self._map[dst]:
                 del self._map[dst][src]
                 rev_link_dsts.append(dst)
@@ -417,6 +503,85 @@ class LinkState(dict):
         del self._map[src]
         return dsts, rev_link_dsts
 
+    def expired(self, expire):
+        # returns the links whose timestamps are older than expire
+        links = []
+        timestamps = self._timestamps
+        while timestamps and timestamps[0][0] < expire:
+            _timestamp, seq, link = heapq.heappop(timestamps)
+            if self._seqs.get(link) != seq:
+                continue
+            timestamp = self[link]
+            if timestamp < expire:
+                del self._seqs[link]
+                links.append(link)
+            else:
+                self._push(link, timestamp)
+        return links
+
+    def oldest_timestamp(self):
+        # returns the oldest timestamp of the links or None.  This can
+        # be older than the actual one.
+        if self._timestamps:
+            return self._timestamps[0][0]
+        return None
+
+
+class TopologySnapshot(namedtuple('TopologySnapshot', [
+        'version', 'switches', 'links', 'hosts'])):
+    # This is data class returned by api.get_topology().
+    # switches, links and hosts are tuples of Switch, Link and Host
+    # classes at the version.  They are shared by the callers and must
+    # not be modified.
+    __slots__ = ()
+
+    def to_dict(self):
+        return {'version': self.version,
+                'switches': [switch.to_dict() for switch in self.switches],
+                'links': [link.to_dict() for link in self.links],
+                'hosts': [host.to_dict() for host in self.hosts]}
+
+
+class TopologyChange(namedtuple('TopologyChange', [
+        'version', 'event', 'data'])):
+    # This is data class returned by api.get_topology_changes().
+    # event is the name of the change, e.g. 'event_link_add', and data
+    # is the dict of the Switch, Port, Link or Host class the change is
+    # about, as returned by its to_dict().
+    __slots__ = ()
+
+    def to_dict(self):
+        return {'version': self.version,
+                'event': self.event,
+                'data': self.data}
+
+
+class TopologyChanges(object):
+    # The journal of the last maxlen changes of the topology.
+    # version is incremented for each change.
+    def __init__(self, maxlen):
+        super(TopologyChanges, self).__init__()
+        self.version = 0
+        self._changes = deque(maxlen=maxlen)
+
+    def add(self, event, data):
+        # data is kept as a dict, so that the journal does not keep
+        # Datapath classes of the disconnected switches alive.
+        self.version += 1
+        self._changes.append(TopologyChange(self.version, event,
+                                            data.to_dict()))
+
+    def since(self, version):
+        # returns the list of the changes after version, or None if
+        # some of them are already discarded or version is unknown.
+        if not 0 <= version <= self.version:
+            return None
+        first = self.version - len(self._changes) + 1
+        if version + 1 < first:
+            return None
+        return list(itertools.islice(self._changes, version + 1 - first,
+                                     None))
+
 
 class LLDPPacket(object):
     # make a LLDP packet for link discovery.
@@ -428,6 +593,23 @@ class LLDPPacket(object):
     PORT_ID_STR = '!I'      # uint32_t
     PORT_ID_SIZE = 4
 
+    # The packets made by lldp_packet() start with ethernet header,
+    # Chassis ID TLV and Port ID TLV of fixed lengths.  lldp_parse()
+    # reads ethertype, typelen, subtype and chassis id of Chassis ID
+    # TLV, and typelen, subtype and port id of Port ID TLV of them at
+    # the fixed offsets.
+    DPID_STR_LEN = len(dpid_to_str(0))
+    _FIXED_PACK_STR = '!12xHHB%ds%dsHB%s' % (
+        CHASSIS_ID_PREFIX_LEN, DPID_STR_LEN, PORT_ID_STR[1:])
+    _FIXED_SIZE = struct.calcsize(_FIXED_PACK_STR)
+    _CHASSIS_ID_TYPELEN = (
+        lldp.LLDP_TLV_CHASSIS_ID << lldp.LLDP_TLV_TYPE_SHIFT |
+        (1 + CHASSIS_ID_PREFIX_LEN + DPID_STR_LEN))
+    _PORT_ID_TYPELEN = (lldp.LLDP_TLV_PORT_ID << lldp.LLDP_TLV_TYPE_SHIFT |
+                        (1 + PORT_ID_SIZE))
+    _CHASSIS_ID_PREFIX_BIN = CHASSIS_ID_PREFIX.encode('ascii')
+    _ETHERTYPE_OFFSET = 12
+
     class LLDPUnknownFormat(RyuException):
         message = '%(msg)s'
 
@@ -463,6 +645,29 @@ class LLDPPacket(object):
 
     @staticmethod
     def lldp_parse(data):
+        if len(data) >= LLDPPacket._FIXED_SIZE:
+            (ethertype, chassis_id_typelen, chassis_id_subtype,
+             chassis_id_prefix, dpid_str, port_id_typelen, port_id_subtype,
+             src_port_no) = struct.unpack_from(LLDPPacket._FIXED_PACK_STR,
+                                               data)
+            if (ethertype == ETH_TYPE_LLDP and
+                    chassis_id_typelen == LLDPPacket._CHASSIS_ID_TYPELEN and
+                    chassis_id_subtype ==
+                    lldp.ChassisID.SUB_LOCALLY_ASSIGNED and
+                    chassis_id_prefix == LLDPPacket._CHASSIS_ID_PREFIX_BIN and
+                    port_id_typelen == LLDPPacket._PORT_ID_TYPELEN and
+                    port_id_subtype == lldp.PortID.SUB_PORT_COMPONENT):
+                return str_to_dpid(dpid_str.decode('utf-8')), src_port_no
+        elif len(data) < LLDPPacket._ETHERTYPE_OFFSET + 2:
+            raise LLDPPacket.LLDPUnknownFormat(
+                msg='too short packet %d' % len(data))
+
+        (ethertype, ) = struct.unpack_from(
+            '!H', data, LLDPPacket._ETHERTYPE_OFFSET)
+        if ethertype != ETH_TYPE_LLDP:
+            raise LLDPPacket.LLDPUnknownFormat(
+                msg='unknown ethertype 0x%04x' % ethertype)
+
         pkt = packet.Packet(data)
         i = iter(pkt)
         eth_pkt = six.next(i)
@@ -503,27 +708,38 @@ class Switches(app_manager.RyuApp):
                event.EventPortAdd, event.EventPortDelete,
                event.EventPortModify,
                event.EventLinkAdd, event.EventLinkDelete,
-               event.EventHostAdd]
+               event.EventHostAdd, event.EventHostDelete,
+               event.EventHostUpdate]
 
     DEFAULT_TTL = 120  # unused. ignored.
     LLDP_PACKET_LEN = len(LLDPPacket.lldp_packet(0, 0, DONTCARE_STR, 0))
 
+    # LLDP packets are sent every LLDP_SEND_GUARD seconds from the ports
+    # in a slot of the timer wheel, so that each port sends once in
+    # CONF.lldp_send_period seconds.
     LLDP_SEND_GUARD = .05
-    LLDP_SEND_PERIOD_PER_PORT = .9
     TIMEOUT_CHECK_PERIOD = 5.
     LINK_TIMEOUT = TIMEOUT_CHECK_PERIOD * 2
 
+    # number of the topology changes kept for api.get_topology_changes()
+    TOPOLOGY_CHANGES_LEN = 10000
+
     def __init__(self, *args, **kwargs):
         super(Switches, self).__init__(*args, **kwargs)
 
         self.name = 'switches'
         self.dps = {}                 # datapath_id => Datapath class
         self.port_state = {}          # datapath_id => ports
-        self.ports = PortDataState()  # Port class -> PortData class
+        slots = max(1, int(round(self.CONF.lldp_send_period /
+                                 self.LLDP_SEND_GUARD)))
+        self.ports = PortDataState(slots)  # Port class -> PortData class
         self.links = LinkState()      # Link class -> timestamp
         self.hosts = HostState()      # mac address -> Host class list
         self.is_active = True
         self.link_delay = {}  # Link class -> seconds
+        self.changes = TopologyChanges(self.TOPOLOGY_CHANGES_LEN)
+        self.graph = TopologyGraph()
+        self._topology = None  # TopologySnapshot of changes.version
 
         self.link_discovery = self.CONF.observe_links
         if self.link_discovery:
@@ -585,13 +801,21 @@ class Switches(app_manager.RyuApp):
             #           port, self.links.get_peer(port))
             return
         for dst in dsts:
-            link = Link(port, dst)
-            self.send_event_to_observers(event.EventLinkDelete(link))
+            self._link_deleted(Link(port, dst))
         for rev_link_dst in rev_link_dsts:
-            rev_link = Link(rev_link_dst, port)
-            self.send_event_to_observers(event.EventLinkDelete(rev_link))
+            self._link_deleted(Link(rev_link_dst, port))
             self.ports.move_front(rev_link_dst)
 
+    def _link_added(self, link):
+        self.changes.add('event_link_add', link)
+        self.graph.add_link(link)
+        self.send_event_to_observers(event.EventLinkAdd(link))
+
+    def _link_deleted(self, link):
+        self.changes.add('event_link_delete', link)
+        self.graph.delete_link(link)
+        self.send_event_to_observers(event.EventLinkDelete(link))
+
     def _is_edge_port(self, port):
         for link in self.links:
             if port == link.src or port == link.dst:
@@ -618,6 +842,8 @@ class Switches(app_manager.RyuApp):
             LOG.debug('register %s', switch)
 
             if not dp_multiple_conns:
+                self.changes.add('event_switch_enter', switch)
+                self.graph.add_switch(dp.id)
                 self.send_event_to_observers(event.EventSwitchEnter(switch))
             else:
                 evt = event.EventSwitchReconnected(switch)
@@ -681,6 +907,8 @@ class Switches(app_manager.RyuApp):
                 if switch.dp is dp:
                     self._unregister(dp)
                     LOG.debug('unregister %s', switch)
+                    self.changes.add('event_switch_leave', switch)
+                    self.graph.remove_switch(dp.id)
                     evt = event.EventSwitchLeave(switch)
                     self.send_event_to_observers(evt)
 
@@ -705,8 +933,9 @@ class Switches(app_manager.RyuApp):
             #           '(datapath id = %s, port number = %s)',
             #           dp.id, ofpport.port_no)
             self.port_state[dp.id].add(ofpport.port_no, ofpport)
-            self.send_event_to_observers(
-                event.EventPortAdd(Port(dp.id, dp.ofproto, ofpport)))
+            port = Port(dp.id, dp.ofproto, ofpport)
+            self.changes.add('event_port_add', port)
+            self.send_event_to_observers(event.EventPortAdd(port))
 
             if not self.link_discovery:
                 return
@@ -720,8 +949,9 @@ class Switches(app_manager.RyuApp):
             # LOG.debug('A port was deleted.' +
             #           '(datapath id = %s, port number = %s)',
             #           dp.id, ofpport.port_no)
-            self.send_event_to_observers(
-                event.EventPortDelete(Port(dp.id, dp.ofproto, ofpport)))
+            port = Port(dp.id, dp.ofproto, ofpport)
+            self.changes.add('event_port_delete', port)
+            self.send_event_to_observers(event.EventPortDelete(port))
 
             if not self.link_discovery:
                 return
@@ -740,14 +970,17 @@ class Switches(app_manager.RyuApp):
             #           '(datapath id = %s, port number = %s)',
             #           dp.id, ofpport.port_no)
             self.port_state[dp.id].modify(ofpport.port_no, ofpport)
-            self.send_event_to_observers(
-                event.EventPortModify(Port(dp.id, dp.ofproto, ofpport)))
+            port = Port(dp.id, dp.ofproto, ofpport)
+            self.changes.add('event_port_modify', port)
+            self.send_event_to_observers(event.EventPortModify(port))
 
             if not self.link_discovery:
                 return
 
             port = self._get_port(dp.id, ofpport.port_no)
             if port and not port.is_reserved():
+                # the LLDP packet is rebuilt if hw_addr is changed
+                self._port_added(port)
                 if self.ports.set_down(port):
                     self._link_down(port)
                 self.lldp_event.set()
@@ -812,16 +1045,15 @@ class Switches(app_manager.RyuApp):
 
         link = Link(src, dst)
         if link not in self.links:
-            self.send_event_to_observers(event.EventLinkAdd(link))
+            self._link_added(link)
 
-            # remove hosts if it's not attached to edge port
-            host_to_del = []
-            for host in self.hosts.values():
-                if not self._is_edge_port(host.port):
-                    host_to_del.append(host.mac)
-
-            for host_mac in host_to_del:
-                del self.hosts[host_mac]
+            # remove hosts attached to the ports, which are no longer
+            # edge ports
+            for port in (src, dst):
+                for host in self.hosts.get_by_port(port.dpid, port.port_no):
+                    del self.hosts[host.mac]
+                    self.changes.add('event_host_delete', host)
+                    self.send_event_to_observers(event.EventHostDelete(host))
 
         if not self.links.update_link(src, dst):
             # reverse link is not detected yet.
@@ -868,90 +1100,122 @@ class Switches(app_manager.RyuApp):
 
         if host_mac not in self.hosts:
             self.hosts.add(host)
+            self.changes.add('event_host_add', _copy_host(host))
             ev = event.EventHostAdd(host)
             self.send_event_to_observers(ev)
         elif self.hosts[host_mac].port != port:
             # assumes the host is moved to another port
             ev = event.EventHostMove(src=self.hosts[host_mac], dst=host)
             self.hosts[host_mac] = host
+            self.changes.add('event_host_move', _copy_host(host))
             self.send_event_to_observers(ev)
 
+        updated = False
         # arp packet, update ip address
         if eth.ethertype == ether_types.ETH_TYPE_ARP:
             arp_pkt, _, _ = pkt_type.parser(pkt_data)
-            self.hosts.update_ip(host, ip_v4=arp_pkt.src_ip)
+            updated = self.hosts.update_ip(host, ip_v4=arp_pkt.src_ip)
 
         # ipv4 packet, update ipv4 address
         elif eth.ethertype == ether_types.ETH_TYPE_IP:
             ipv4_pkt, _, _ = pkt_type.parser(pkt_data)
-            self.hosts.update_ip(host, ip_v4=ipv4_pkt.src)
+            updated = self.hosts.update_ip(host, ip_v4=ipv4_pkt.src)
 
         # ipv6 packet, update ipv6 address
         elif eth.ethertype == ether_types.ETH_TYPE_IPV6:
             # TODO: need to handle NDP
             ipv6_pkt, _, _ = pkt_type.parser(pkt_data)
-            self.hosts.update_ip(host, ip_v6=ipv6_pkt.src)
-
-    def send_lldp_packet(self, port):
-        try:
-            port_data = self.ports.lldp_sent(port)
-        except KeyError:
-            # ports can be modified during our sleep in self.lldp_loop()
-            # LOG.debug('send_lld error', exc_info=True)
-            return
-        if port_data.is_down:
-            return
+            updated = self.hosts.update_ip(host, ip_v6=ipv6_pkt.src)
 
-        dp = self.dps.get(port.dpid, None)
-        if dp is None:
-            # datapath was already deleted
-            return
+        if updated:
+            host = self.hosts[host_mac]
+            self.changes.add('event_host_update', _copy_host(host))
+            self.send_event_to_observers(event.EventHostUpdate(host))
 
-        # LOG.debug('lldp sent dpid=%s, port_no=%d', dp.id, port.port_no)
+    @staticmethod
+    def _lldp_packet_out(dp, port, port_data):
         # TODO:XXX
         if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
             actions = [dp.ofproto_parser.OFPActionOutput(port.port_no)]
-            dp.send_packet_out(actions=actions, data=port_data.lldp_data)
+            out = dp.ofproto_parser.OFPPacketOut(
+                datapath=dp, buffer_id=0xffffffff,
+                in_port=dp.ofproto.OFPP_NONE, actions=actions,
+                data=port_data.lldp_data)
         elif dp.ofproto.OFP_VERSION >= ofproto_v1_2.OFP_VERSION:
             actions = [dp.ofproto_parser.OFPActionOutput(port.port_no)]
             out = dp.ofproto_parser.OFPPacketOut(
                 datapath=dp, in_port=dp.ofproto.OFPP_CONTROLLER,
                 buffer_id=dp.ofproto.OFP_NO_BUFFER, actions=actions,
                 data=port_data.lldp_data)
-            dp.send_msg(out)
         else:
             LOG.error('cannot send lldp packet. unsupported version. %x',
                       dp.ofproto.OFP_VERSION)
+            return None
+        # xid is replaced on each send.
+        out.set_xid(0)
+        out.serialize()
+        return bytes(out.buf)
 
-    def lldp_loop(self):
-        while self.is_active:
-            self.lldp_event.clear()
-
-            now = time.time()
-            timeout = None
-            ports_now = []
-            ports = []
-            for (key, data) in self.ports.items():
-                if data.timestamp is None:
-                    ports_now.append(key)
-                    continue
-
-                expire = data.timestamp + self.LLDP_SEND_PERIOD_PER_PORT
-                if expire <= now:
-                    ports.append(key)
+    def send_lldp_packet(self, port):
+        self.send_lldp_packets([port])
+
+    def send_lldp_packets(self, ports):
+        # The PacketOut of each port is serialized only once and cached
+        # in PortData.  The packets to the same datapath are sent
+        # together.
+        bufs = OrderedDict()  # datapath_id => (Datapath, wire bytes)
+        for port in ports:
+            try:
+                port_data = self.ports.lldp_sent(port)
+            except KeyError:
+                # ports can be modified during our sleep in self.lldp_loop()
+                # LOG.debug('send_lld error', exc_info=True)
+                continue
+            if port_data.is_down:
+                continue
+
+            dp = self.dps.get(port.dpid, None)
+            if dp is None:
+                # datapath was already deleted
+                continue
+
+            # LOG.debug('lldp sent dpid=%s, port_no=%d', dp.id, port.port_no)
+            version = dp.ofproto.OFP_VERSION
+            if port_data.packet_out is None or \
+                    port_data.packet_out[0] != version:
+                buf = self._lldp_packet_out(dp, port, port_data)
+                if buf is None:
                     continue
+                port_data.packet_out = (version, buf)
+            bufs.setdefault(dp.id, (dp, []))[1].append(
+                port_data.packet_out[1])
 
-                timeout = expire - now
-                break
+        for dp, dp_bufs in bufs.values():
+            with dp.batch() as batch:
+                for buf in dp_bufs:
+                    batch.send_buf(buf)
 
-            for port in ports_now:
-                self.send_lldp_packet(port)
-            for port in ports:
-                self.send_lldp_packet(port)
-                hub.sleep(self.LLDP_SEND_GUARD)      # don't burst
+    def lldp_loop(self):
+        slots = self.ports.slots
+        last_tick = None
+        while self.is_active:
+            self.lldp_event.clear()
 
-            if timeout is not None and ports:
-                timeout = 0     # We have already slept
+            tick = int(time.time() / self.LLDP_SEND_GUARD)
+            if last_tick is None:
+                last_tick = tick - 1
+            # the slots of the ticks since the last one.  The ticks
+            # more than one round ago are skipped.
+            ticks = range(max(last_tick + 1, tick - slots + 1), tick + 1)
+            last_tick = tick
+            self.send_lldp_packets(
+                self.ports.ports_to_send([t % slots for t in ticks]))
+
+            if self.ports:
+                timeout = max(
+                    (tick + 1) * self.LLDP_SEND_GUARD - time.time(), 0)
+            else:
+                timeout = None
             # LOG.debug('lldp sleep %s', timeout)
             self.lldp_event.wait(timeout=timeout)
 
@@ -960,29 +1224,33 @@ class Switches(app_manager.RyuApp):
             self.link_event.clear()
 
             now = time.time()
-            deleted = []
-            for (link, timestamp) in self.links.items():
-                # LOG.debug('%s timestamp %d (now %d)', link, timestamp, now)
-                if timestamp + self.LINK_TIMEOUT < now:
-                    deleted.append(link)
+            deleted = self.links.expired(now - self.LINK_TIMEOUT)
 
             for link in deleted:
                 self.links.link_down(link)
                 # LOG.debug('delete %s', link)
-                self.send_event_to_observers(event.EventLinkDelete(link))
+                self._link_deleted(link)
 
                 dst = link.dst
                 rev_link = Link(dst, link.src)
                 if rev_link not in deleted:
                     # It is very likely that the reverse link is also
-                    # disconnected. Check it early.
-                    expire = now - self.LINK_TIMEOUT
+                    # disconnected. Check it early, but give LLDP of the
+                    # moved front port a check period to refresh it.
+                    expire = (now - self.LINK_TIMEOUT +
+                              self.TIMEOUT_CHECK_PERIOD)
                     self.links.rev_link_set_timestamp(rev_link, expire)
                     if dst in self.ports:
                         self.ports.move_front(dst)
                         self.lldp_event.set()
 
-            self.link_event.wait(timeout=self.TIMEOUT_CHECK_PERIOD)
+            # wake up when the oldest link times out
+            timeout = self.TIMEOUT_CHECK_PERIOD
+            oldest = self.links.oldest_timestamp()
+            if oldest is not None:
+                timeout = min(timeout,
+                              max(oldest + self.LINK_TIMEOUT - now, 0))
+            self.link_event.wait(timeout=timeout)
 
     @set_ev_cls(event.EventSwitchRequest)
     def switch_request_handler(self, req):
@@ -1015,12 +1283,36 @@ class Switches(app_manager.RyuApp):
     @set_ev_cls(event.EventHostRequest)
     def host_request_handler(self, req):
         dpid = req.dpid
-        hosts = []
         if dpid is None:
-            for mac in self.hosts:
-                hosts.append(self.hosts[mac])
+            hosts = list(self.hosts.values())
         else:
             hosts = self.hosts.get_by_dpid(dpid)
 
         rep = event.EventHostReply(req.src, dpid, hosts)
         self.reply_to_request(req, rep)
+
+    def _get_topology(self):
+        # the snapshot is built once for each version
+        version = self.changes.version
+        if self._topology is None or self._topology.version != version:
+            switches = tuple(self._get_switch(dpid) for dpid in self.dps)
+            hosts = tuple(_copy_host(host) for host in self.hosts.values())
+            self._topology = TopologySnapshot(
+                version, switches, tuple(self.links), hosts)
+        return self._topology
+
+    @set_ev_cls(event.EventGraphRequest)
+    def graph_request_handler(self, req):
+        rep = event.EventGraphReply(req.src, self.graph)
+        self.reply_to_request(req, rep)
+
+    @set_ev_cls(event.EventTopologyRequest)
+    def topology_request_handler(self, req):
+        if req.version is None:
+            rep = event.EventTopologyReply(
+                req.src, self.changes.version, self._get_topology(), None)
+        else:
+            rep = event.EventTopologyReply(
+                req.src, self.changes.version, None,
+                self.changes.since(req.version))
+        self.reply_to_request(req, rep)